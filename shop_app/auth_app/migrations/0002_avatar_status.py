@@ -0,0 +1,28 @@
+# Generated by Django 5.1.15 on 2026-10-18 02:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="avatar_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "pending"),
+                    ("ready", "ready"),
+                    ("failed", "failed"),
+                ],
+                default="ready",
+                editable=False,
+                max_length=16,
+                verbose_name="avatar status",
+            ),
+        ),
+    ]
@@ -5,6 +5,8 @@ from django.contrib.auth.models import User
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from shop_app.thumbnails import ImageStatus
+
 
 def avatar_directory_path(instance: "Profile", filename: str) -> str:
     """
@@ -26,7 +28,8 @@ class Profile(models.Model):
     **patronymic** - Отчество. \n
     **phone** - Телефон пользователя. \n
     **email** - Почта пользователя. \n
-    **avatar** - Аватарка пользователя.
+    **avatar** - Аватарка пользователя. \n
+    **avatar_status** - Статус обработки аватарки (производные изображения).
     """
 
     unique_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
@@ -53,6 +56,13 @@ class Profile(models.Model):
         upload_to=avatar_directory_path,
         default=None,
     )
+    avatar_status = models.CharField(
+        _("avatar status"),
+        max_length=16,
+        choices=ImageStatus.choices,
+        default=ImageStatus.READY,
+        editable=False,
+    )
 
     @property
     def full_name(self) -> str:
@@ -4,6 +4,8 @@ from auth_app.models.profile import Profile
 from django.db.models.fields.files import ImageFieldFile
 from rest_framework import serializers
 
+from shop_app.thumbnails import get_file_sizes, get_file_srcset
+
 
 class OutAvatarSerializer(serializers.Serializer[Profile]):
     """
@@ -12,6 +14,9 @@ class OutAvatarSerializer(serializers.Serializer[Profile]):
 
     src = serializers.SerializerMethodField()
     alt = serializers.CharField(default="No Image")
+    srcset = serializers.SerializerMethodField()
+    srcsetWebp = serializers.SerializerMethodField(method_name="get_srcset_webp")
+    sizes = serializers.SerializerMethodField()
 
     @staticmethod
     def get_src(avatar: Optional[ImageFieldFile]) -> Optional[str]:
@@ -25,6 +30,36 @@ class OutAvatarSerializer(serializers.Serializer[Profile]):
             return avatar.url
         return None
 
+    @staticmethod
+    def get_srcset(avatar: Optional[ImageFieldFile]) -> Optional[str]:
+        """
+        Функция вернёт srcset уменьшенных копий avatar в JPEG, иначе None.
+
+        :param avatar: Optional[ImageFieldFile].
+        :return: srcset или None.
+        """
+        return get_file_srcset(avatar, "jpg")
+
+    @staticmethod
+    def get_srcset_webp(avatar: Optional[ImageFieldFile]) -> Optional[str]:
+        """
+        Функция вернёт srcset уменьшенных копий avatar в WebP, иначе None.
+
+        :param avatar: Optional[ImageFieldFile].
+        :return: srcset или None.
+        """
+        return get_file_srcset(avatar, "webp")
+
+    @staticmethod
+    def get_sizes(avatar: Optional[ImageFieldFile]) -> Optional[str]:
+        """
+        Функция вернёт sizes для srcset, если avatar существует, иначе None.
+
+        :param avatar: Optional[ImageFieldFile].
+        :return: sizes или None.
+        """
+        return get_file_sizes(avatar)
+
 
 class InAvatarSerializer(serializers.ModelSerializer[Profile]):
     """
@@ -1,35 +1,72 @@
-from typing import Any
+from typing import Any, FrozenSet, Optional
 
-from django.db.models.signals import pre_delete, pre_save
+from django.db.models.signals import post_init, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from utils import delete_file
+
+from shop_app.image_processing import (
+    delete_image_on_commit,
+    enqueue_image_processing,
+    mark_image_changes,
+    remember_loaded_image,
+)
 
 from .models import Profile
 
 
+@receiver(post_init, sender=Profile)
+def remember_avatar_file_with_init_profile(instance: Profile, **kwargs: Any) -> None:
+    """
+    Запоминаем имя загруженного файла аватарки, чтобы при сохранении профиля
+    сравнивать его без запроса к БД.
+
+    :param instance: Профиль пользователя.
+    :param kwargs: Any.
+    :return: None.
+    """
+    remember_loaded_image(instance, "avatar")
+
+
 @receiver(pre_delete, sender=Profile)
 def delete_avatar_file_with_profile_delete(instance: Profile, **kwargs: Any) -> None:
     """
-    Удаляем файл аватарки, при удалении профиля.
+    Удаляем файл аватарки и его производные при удалении профиля
+    (после фиксации транзакции, пачкой).
 
     :param instance: Профиль пользователя.
     :param kwargs: Any.
     :return: None.
     """
-    if instance.avatar:
-        delete_file(instance.avatar.path)
+    delete_image_on_commit(instance.avatar)
 
 
 @receiver(pre_save, sender=Profile)
-def delete_avatar_file_with_save_profile(instance: Profile, **kwargs: Any) -> None:
+def delete_avatar_file_with_save_profile(
+    instance: Profile,
+    update_fields: Optional[FrozenSet[str]] = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Если аватарка была изменена, отмечаем её замену:
+    старый файл удалит фоновая задача обработки изображения.
+
+    :param instance: Профиль пользователя.
+    :param update_fields: Сохраняемые поля (None - все).
+    :param kwargs: Any.
+    :return: None.
+    """
+    mark_image_changes(instance, "avatar", update_fields)
+
+
+@receiver(post_save, sender=Profile)
+def enqueue_avatar_processing_with_save_profile(
+    instance: Profile, **kwargs: Any
+) -> None:
     """
-    Удаляем файл аватарки, при сохранении профиля, если аватарка была изменена.
+    Ставим в очередь обработку новой аватарки (проверка, удаление EXIF,
+    производные изображения, удаление заменённого файла).
 
     :param instance: Профиль пользователя.
     :param kwargs: Any.
     :return: None.
     """
-    if instance.pk:
-        old_instance = Profile.objects.get(pk=instance.pk)
-        if old_instance.avatar and old_instance.avatar != instance.avatar:
-            delete_file(old_instance.avatar.path)
+    enqueue_image_processing(instance, "avatar")
@@ -5,6 +5,7 @@ from auth_app.tests.utils import count_files_in_directory, get_user_with_profile
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from jobs_app.tests.utils import run_jobs
 
 from shop_app import settings
 
@@ -54,6 +55,7 @@ class OneProfileOneAvatarImageFileTests(TestCase):
         """
         self.user.profile.avatar = self.image_file
         self.user.profile.save()
+        run_jobs()
         self.assertEqual(count_files_in_directory(self.image_file_root), 1)
 
     def test_delete_avatar(self) -> None:
@@ -67,6 +69,7 @@ class OneProfileOneAvatarImageFileTests(TestCase):
 
         self.user.profile.avatar = None
         self.user.profile.save()
+        run_jobs()
 
         self.assertEqual(count_files_in_directory(self.image_file_root), 0)
 
@@ -79,7 +82,8 @@ class OneProfileOneAvatarImageFileTests(TestCase):
         # Убедимся, что файл аватарки уже есть.
         self.assertEqual(count_files_in_directory(self.image_file_root), 1)
 
-        self.user.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
 
         self.assertEqual(count_files_in_directory(self.image_file_root), 0)
 
@@ -100,13 +104,15 @@ class OneProfileOneAvatarImageFileTests(TestCase):
         for user in users:
             user.profile.avatar = self.image_file
             user.profile.save()
+            run_jobs()
 
         # Убедимся, что файлы есть:
         for image_file_root in image_file_roots:
             self.assertEqual(count_files_in_directory(image_file_root), 1)
         # Получаем из БД всех пользователей и удаляем.
         users_in_db = User.objects.all()
-        users_in_db.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            users_in_db.delete()
 
         # Убедимся, что файлы удалены.
         for image_file_root in image_file_roots:
@@ -119,7 +125,8 @@ class OneProfileOneAvatarImageFileTests(TestCase):
         :return:
         """
         if self.user.pk:
-            self.user.delete()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.delete()
 
     @classmethod
     def tearDownClass(cls) -> None:
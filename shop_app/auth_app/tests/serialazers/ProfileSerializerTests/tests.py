@@ -142,8 +142,11 @@ class ProfileSerializerTests(TestCase):
         self.assertEqual(
             {"fullName", "email", "phone", "avatar"}, set(serializer.data.keys())
         )
-        # А у avatar должны быть ключи src и alt
-        self.assertEqual({"src", "alt"}, set(serializer.data["avatar"].keys()))
+        # А у avatar должны быть ключи src, alt и производные изображения
+        self.assertEqual(
+            {"src", "alt", "srcset", "srcsetWebp", "sizes"},
+            set(serializer.data["avatar"].keys()),
+        )
 
     @classmethod
     def tearDownClass(cls) -> None:
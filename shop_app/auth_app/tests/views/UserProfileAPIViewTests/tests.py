@@ -79,7 +79,10 @@ class UserProfileAPIViewTests(APITestCase):
         self.assertEqual(
             {"fullName", "email", "phone", "avatar"}, set(response.data.keys())
         )
-        self.assertEqual({"src", "alt"}, set(response.data["avatar"].keys()))
+        self.assertEqual(
+            {"src", "alt", "srcset", "srcsetWebp", "sizes"},
+            set(response.data["avatar"].keys()),
+        )
         self.assertEqual(
             response.data["fullName"],
             " ".join(
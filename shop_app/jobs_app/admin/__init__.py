@@ -0,0 +1,3 @@
+from .job import JobAdmin
+
+__all__ = ["JobAdmin"]
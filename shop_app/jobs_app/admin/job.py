@@ -0,0 +1,56 @@
+from typing import TYPE_CHECKING
+
+from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from jobs_app.models import Job
+
+if TYPE_CHECKING:
+
+    ModelAdmin = admin.ModelAdmin[Job]
+
+else:
+
+    ModelAdmin = admin.ModelAdmin
+
+
+@admin.register(Job)
+class JobAdmin(ModelAdmin):
+    """
+    Класс админка для фоновых задач.
+    """
+
+    list_display = ("pk", "task", "status", "attempts", "run_after", "created_at")
+    list_display_links = ("pk", "task")
+    list_filter = ("status", "task")
+    readonly_fields = (
+        "task",
+        "payload",
+        "status",
+        "attempts",
+        "max_attempts",
+        "run_after",
+        "started_at",
+        "finished_at",
+        "error",
+        "created_at",
+    )
+    actions = ("requeue",)
+
+    @admin.action(description=_("Requeue selected jobs"))
+    def requeue(self, request: HttpRequest, queryset: QuerySet[Job]) -> None:
+        """
+        Вернёт выбранные задачи в очередь (с новым набором попыток).
+
+        :param request: HttpRequest.
+        :param queryset: Выбранные задачи.
+        :return: None.
+        """
+        queryset.exclude(status=Job.Status.RUNNING).update(
+            status=Job.Status.PENDING,
+            attempts=0,
+            run_after=timezone.now(),
+            error="",
+        )
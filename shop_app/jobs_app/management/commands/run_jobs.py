@@ -0,0 +1,141 @@
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import django
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections, connections
+from jobs_app.models import Job
+from jobs_app.models.job import execute_task
+
+
+def execute_task_in_worker(task: str, payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Функция выполнит задачу в потоке или процессе пула.
+    После задачи закрываются неисправные и устаревшие соединения с БД потока.
+
+    :param task: Путь к функции.
+    :param payload: Именованные аргументы функции.
+    :return: None при успехе, иначе traceback ошибки.
+    """
+    try:
+        return execute_task(task, payload)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    """
+    Воркер очереди фоновых задач (Job).
+    Забирает готовые задачи пачками и выполняет их в пуле потоков
+    (по умолчанию: обработка изображений в Pillow отпускает GIL) или процессов.
+    Несколько воркеров могут работать одновременно: задачи забираются
+    с блокировкой строк (SKIP LOCKED). Задачи, оставшиеся в RUNNING
+    после остановки воркера, возвращаются в очередь через --stale-timeout секунд.
+    """
+
+    help = "Выполнение фоновых задач из очереди."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Размер пула (0 - выполнять задачи в основном потоке).",
+        )
+        parser.add_argument(
+            "--pool",
+            choices=("thread", "process"),
+            default="thread",
+            help="Пул потоков или процессов.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Количество задач, забираемых за раз (по умолчанию - 2 * workers).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Пауза (секунд), если очередь пуста.",
+        )
+        parser.add_argument(
+            "--stale-timeout",
+            type=int,
+            default=600,
+            help="Через сколько секунд задача в RUNNING возвращается в очередь.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Выполнить готовые задачи и завершиться.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Цикл воркера.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        workers: int = options["workers"]
+        batch_size: int = options["batch_size"] or max(1, 2 * workers)
+        stale_timeout = timedelta(seconds=options["stale_timeout"])
+        executor: Optional[Executor] = None
+        use_processes = bool(workers) and options["pool"] == "process"
+        if use_processes:
+            executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=django.setup
+            )
+        elif workers:
+            executor = ThreadPoolExecutor(max_workers=workers)
+        done = failed = 0
+        try:
+            while True:
+                Job.requeue_stale(stale_timeout)
+                jobs = Job.claim(batch_size)
+                if not jobs:
+                    if options["once"]:
+                        break
+                    time.sleep(options["sleep"])
+                    continue
+                errors: List[Optional[str]]
+                if executor is None:
+                    errors = [job.run() for job in jobs]
+                else:
+                    if use_processes:
+                        # Процессы пула запускаются по мере надобности (fork)
+                        # и не должны наследовать соединение с БД.
+                        connections.close_all()
+                    errors = list(
+                        executor.map(
+                            execute_task_in_worker,
+                            [job.task for job in jobs],
+                            [job.payload for job in jobs],
+                        )
+                    )
+                for job, error in zip(jobs, errors):
+                    job.finish(error)
+                    if error is None:
+                        done += 1
+                    else:
+                        failed += 1
+                        self.stderr.write(f"{job!r}: {error}")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.stdout.write(
+            self.style.SUCCESS(f"Выполнено задач: {done}, ошибок: {failed}.")
+        )
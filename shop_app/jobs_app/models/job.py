@@ -0,0 +1,190 @@
+import traceback
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
+
+# Задержка перед повторной попыткой: RETRY_DELAY * 2^(попытка - 1).
+RETRY_DELAY = timedelta(seconds=30)
+
+
+class Job(models.Model):
+    """
+    Модель фоновой задачи (очередь задач в БД).
+    Задачи выполняет команда run_jobs, задача - вызов функции task(**payload).
+
+    **task** - Путь к функции (например, 'shop_app.image_processing.process_image'). \n
+    **payload** - Именованные аргументы функции (JSON). \n
+    **status** - Статус задачи. \n
+    **attempts** - Количество сделанных попыток. \n
+    **max_attempts** - Максимальное количество попыток. \n
+    **run_after** - Задача выполняется не раньше этого времени. \n
+    **started_at** - Дата и время начала последней попытки. \n
+    **finished_at** - Дата и время завершения. \n
+    **error** - Ошибка последней попытки. \n
+    **created_at** - Дата и время создания.
+    """
+
+    class Status(models.TextChoices):
+        """
+        Статусы задачи.
+        """
+
+        PENDING = "pending", _("pending")
+        RUNNING = "running", _("running")
+        DONE = "done", _("done")
+        FAILED = "failed", _("failed")
+
+    task = models.CharField(_("task"), max_length=255)
+    payload = models.JSONField(_("payload"), default=dict)
+    status = models.CharField(
+        _("status"), max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(_("attempts"), default=0)
+    max_attempts = models.PositiveSmallIntegerField(_("max attempts"), default=3)
+    run_after = models.DateTimeField(_("run after"), default=timezone.now)
+    started_at = models.DateTimeField(_("started at"), null=True, default=None)
+    finished_at = models.DateTimeField(_("finished at"), null=True, default=None)
+    error = models.TextField(_("error"), blank=True, default="")
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+
+    @classmethod
+    def enqueue(
+        cls, task: str, payload: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> "Job":
+        """
+        Поставит задачу в очередь. Задача создаётся в текущей транзакции,
+        поэтому воркер увидит её только после фиксации транзакции.
+
+        :param task: Путь к функции.
+        :param payload: Именованные аргументы функции.
+        :param kwargs: Остальные поля задачи (max_attempts, run_after).
+        :return: Job.
+        """
+        job: Job = cls.objects.create(task=task, payload=payload or {}, **kwargs)
+        return job
+
+    @classmethod
+    def claim(cls, limit: int) -> List["Job"]:
+        """
+        Заберёт до limit готовых к выполнению задач и переведёт их в RUNNING.
+        Строки, заблокированные другими воркерами, пропускаются (SKIP LOCKED),
+        поэтому несколько воркеров не получат одну задачу.
+
+        :param limit: Максимальное количество задач.
+        :return: Задачи.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            jobs = list(
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(status=cls.Status.PENDING, run_after__lte=now)
+                .order_by("run_after", "pk")[:limit]
+            )
+            if jobs:
+                cls.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                    status=cls.Status.RUNNING,
+                    attempts=models.F("attempts") + 1,
+                    started_at=now,
+                )
+        for job in jobs:
+            job.status = cls.Status.RUNNING
+            job.attempts += 1
+            job.started_at = now
+        return jobs
+
+    @classmethod
+    def requeue_stale(cls, timeout: timedelta) -> int:
+        """
+        Вернёт в очередь задачи, которые выполняются дольше timeout
+        (воркер был остановлен во время выполнения).
+
+        :param timeout: Максимальное время выполнения задачи.
+        :return: Количество возвращённых задач.
+        """
+        updated: int = cls.objects.filter(
+            status=cls.Status.RUNNING, started_at__lt=timezone.now() - timeout
+        ).update(status=cls.Status.PENDING)
+        return updated
+
+    def run(self) -> Optional[str]:
+        """
+        Выполнит задачу в текущем потоке (статус не меняется).
+
+        :return: None при успехе, иначе текст ошибки.
+        """
+        return execute_task(self.task, self.payload)
+
+    def finish(self, error: Optional[str]) -> None:
+        """
+        Сохранит результат попытки: DONE при успехе, иначе повтор с задержкой,
+        а после max_attempts попыток - FAILED.
+
+        :param error: Текст ошибки (None - успех).
+        :return: None.
+        """
+        now = timezone.now()
+        if error is None:
+            self.status = self.Status.DONE
+            self.finished_at = now
+            self.error = ""
+        elif self.attempts < self.max_attempts:
+            self.status = self.Status.PENDING
+            self.run_after = now + RETRY_DELAY * 2 ** (self.attempts - 1)
+            self.error = error
+        else:
+            self.status = self.Status.FAILED
+            self.finished_at = now
+            self.error = error
+        self.save(update_fields=["status", "run_after", "finished_at", "error"])
+
+    class Meta:
+        """
+        Метаданные.
+        """
+
+        verbose_name = _("job")
+        verbose_name_plural = _("jobs")
+        indexes = (
+            # Выборка готовых задач воркером (Job.claim).
+            models.Index(
+                fields=["run_after", "id"],
+                name="job_pending_idx",
+                condition=Q(status="pending"),
+            ),
+        )
+
+    def __str__(self) -> str:
+        """
+        Строковое представление.
+
+        :return: Функция и статус.
+        """
+        return f"{self.task} ({self.status})"
+
+    def __repr__(self) -> str:
+        """
+        Строковое представление для отладки.
+
+        :return: Job(Функция, статус).
+        """
+        return f"Job({self.task}, {self.status})"
+
+
+def execute_task(task: str, payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Функция выполнит функцию задачи (в том числе в потоке или процессе воркера).
+
+    :param task: Путь к функции.
+    :param payload: Именованные аргументы функции.
+    :return: None при успехе, иначе traceback ошибки.
+    """
+    try:
+        import_string(task)(**payload)
+    except Exception:
+        return traceback.format_exc()
+    return None
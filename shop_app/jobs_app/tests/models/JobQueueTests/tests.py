@@ -0,0 +1,127 @@
+from datetime import timedelta
+from io import StringIO
+from typing import List
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from jobs_app.models import Job
+from jobs_app.tests.utils import run_jobs
+
+CALLS: List[int] = []
+
+
+def record_call(value: int) -> None:
+    """
+    Задача для тестов: запоминает аргумент.
+
+    :param value: Аргумент.
+    :return: None.
+    """
+    CALLS.append(value)
+
+
+def raise_error() -> None:
+    """
+    Задача для тестов: всегда завершается ошибкой.
+
+    :return: None.
+    """
+    raise ValueError("job error")
+
+
+class JobQueueTests(TestCase):
+    """
+    Тест очереди фоновых задач (Job и команда run_jobs).
+    """
+
+    record_task = f"{__name__}.record_call"
+    error_task = f"{__name__}.raise_error"
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        CALLS.clear()
+
+    def test_run(self) -> None:
+        """
+        Проверяем: готовые задачи выполняются по порядку, отложенные - нет.
+
+        :return: None.
+        """
+        jobs = [Job.enqueue(self.record_task, {"value": i}) for i in range(3)]
+        delayed = Job.enqueue(
+            self.record_task,
+            {"value": 100},
+            run_after=timezone.now() + timedelta(hours=1),
+        )
+        run_jobs()
+        self.assertEqual(CALLS, [0, 1, 2])
+        for job in Job.objects.filter(pk__in=[job.pk for job in jobs]):
+            self.assertEqual(job.status, Job.Status.DONE)
+            self.assertEqual(job.attempts, 1)
+            self.assertIsNotNone(job.finished_at)
+        self.assertEqual(Job.objects.get(pk=delayed.pk).status, Job.Status.PENDING)
+
+    def test_claim_once(self) -> None:
+        """
+        Проверяем: забранная задача не выдаётся повторно.
+
+        :return: None.
+        """
+        Job.enqueue(self.record_task, {"value": 1})
+        self.assertEqual(len(Job.claim(10)), 1)
+        self.assertEqual(Job.claim(10), [])
+
+    def test_retry_and_fail(self) -> None:
+        """
+        Проверяем: ошибка ведёт к повтору с задержкой, после max_attempts - FAILED.
+
+        :return: None.
+        """
+        job = Job.enqueue(self.error_task, max_attempts=2)
+        call_command(
+            "run_jobs", once=True, workers=0, stdout=StringIO(), stderr=StringIO()
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("job error", job.error)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        call_command(
+            "run_jobs", once=True, workers=0, stdout=StringIO(), stderr=StringIO()
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_requeue_stale(self) -> None:
+        """
+        Проверяем: задача, зависшая в RUNNING, возвращается в очередь.
+
+        :return: None.
+        """
+        job = Job.enqueue(self.record_task, {"value": 5})
+        Job.claim(1)
+        Job.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(hours=1)
+        )
+        run_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(CALLS, [5])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Job.objects.all().delete()
+        super().tearDownClass()
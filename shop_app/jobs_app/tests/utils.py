@@ -0,0 +1,13 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+
+def run_jobs() -> None:
+    """
+    Функция выполнит все готовые фоновые задачи в текущем потоке
+    (в тестах задачи должны видеть данные незафиксированной транзакции теста).
+
+    :return: None.
+    """
+    call_command("run_jobs", once=True, workers=0, stdout=StringIO())
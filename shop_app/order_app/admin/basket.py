@@ -1,11 +1,12 @@
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any
 
 from django.contrib import admin, messages
 from django.db import transaction
 from django.db.models import QuerySet
 from django.http import HttpRequest
+from order_app.api_views.utils import get_basket_counts
 from order_app.models import Basket
-from product_app.models import Product
+from product_app.inventory import release_stock
 
 if TYPE_CHECKING:
 
@@ -83,9 +84,7 @@ class BasketAdmin(ModelAdmin):
             self.message_user(request, message, level=messages.ERROR)
         else:
             with transaction.atomic():
-                product = obj.product
-                product.count += obj.count
-                product.save()
+                release_stock({obj.product_id: obj.count})
                 obj.delete()
 
     def delete_queryset(self, request: HttpRequest, queryset: QuerySet[Basket]) -> None:
@@ -99,13 +98,7 @@ class BasketAdmin(ModelAdmin):
         """
         if all(basket.order is None for basket in queryset):
             with transaction.atomic():
-                products: Dict[str, Product] = dict()
-                for basket in queryset:
-                    product = products.setdefault(
-                        str(basket.product.pk), basket.product
-                    )
-                    product.count += basket.count
-                Product.objects.bulk_update(products.values(), ["count"])
+                release_stock(get_basket_counts(queryset))
                 queryset.delete()
         else:
             messages.set_level(request, messages.ERROR)
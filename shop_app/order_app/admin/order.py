@@ -1,13 +1,14 @@
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any
 
 from django.contrib import admin
 from django.db import transaction
 from django.db.models import QuerySet
 from django.http import HttpRequest
 from django.utils.translation import gettext_lazy as _
+from order_app.api_views.utils import get_basket_counts, get_order_baskets_prefetch
 from order_app.models import Basket
 from order_app.models.order import Order
-from product_app.models import Product
+from product_app.inventory import release_stock
 
 if TYPE_CHECKING:
 
@@ -56,6 +57,7 @@ class OrderAdmin(ModelAdmin):
         "city",
         "address",
         "paid_for",
+        "paid_at",
     )
 
     @staticmethod
@@ -82,16 +84,7 @@ class OrderAdmin(ModelAdmin):
             super()
             .get_queryset(*args, **kwargs)
             .select_related("user")
-            .prefetch_related(
-                "baskets",
-                "baskets__product",
-                "baskets__product__category",
-                "baskets__user",
-                "baskets__product__tags",
-                "baskets__product__images",
-                "baskets__product__reviews",
-                "baskets__product__sales",
-            )
+            .prefetch_related(*get_order_baskets_prefetch())
         )
 
     def delete_model(self, request: HttpRequest, obj: Order) -> None:
@@ -104,13 +97,7 @@ class OrderAdmin(ModelAdmin):
         """
         with transaction.atomic():
             if not obj.paid_for:
-                products: Dict[str, Product] = dict()
-                for basket in obj.baskets.all():
-                    product = products.setdefault(
-                        str(basket.product.pk), basket.product
-                    )
-                    product.count += basket.count
-                Product.objects.bulk_update(products.values(), ["count"])
+                release_stock(get_basket_counts(obj.baskets.all()))
             super().delete_model(request, obj)
 
     def delete_queryset(self, request: HttpRequest, queryset: QuerySet[Order]) -> None:
@@ -121,16 +108,11 @@ class OrderAdmin(ModelAdmin):
         :return: None
         """
         with transaction.atomic():
-            products: Dict[str, Product] = dict()
-            for order in queryset:
-                if not order.paid_for:
-                    for basket in order.baskets.all():
-                        product = products.setdefault(
-                            str(basket.product.pk), basket.product
-                        )
-                        product.count += basket.count
-            if products:
-                Product.objects.bulk_update(products.values(), ["count"])
+            release_stock(
+                get_basket_counts(
+                    Basket.objects.filter(order__in=queryset, order__paid_for=False)
+                )
+            )
             super().delete_queryset(request, queryset)
 
     @staticmethod
@@ -0,0 +1,63 @@
+from collections import defaultdict
+from typing import DefaultDict
+
+from django.db.models import Q
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from order_app.api_views.utils import apply_basket_deltas
+from order_app.models import Basket
+from order_app.serializers.basket import InBasketDeltaSerializer, OutBasketSerializer
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from utils import CustomAutoSchema, get_or_create_anonymous_user_id
+
+
+class BasketBatchAPIView(APIView):
+    """
+    Basket Batch APIView
+    """
+
+    schema = CustomAutoSchema()
+    basket_in_serializer = InBasketDeltaSerializer
+    basket_out_serializer = OutBasketSerializer
+    queryset = Basket.objects.select_related("product", "user").prefetch_related(
+        "product__tags", "product__images"
+    )
+
+    @extend_schema(
+        request=InBasketDeltaSerializer(many=True),
+        responses={
+            200: OutBasketSerializer(many=True),
+            400: OpenApiResponse(description="Неверный запрос."),
+        },
+        description="Изменение количества нескольких продуктов в корзине одним запросом. "
+        "Изменения применяются целиком или не применяются вовсе.",
+        tags=("Basket",),
+    )
+    def post(self, request: Request) -> Response:
+        """
+        Изменение количества нескольких продуктов в корзине одним запросом.
+
+        :param request: Request.
+        :return: Response.
+        """
+        user = request.user if request.user.is_authenticated else None
+        anonymous_user_id = get_or_create_anonymous_user_id(request)
+
+        serializer_in = self.basket_in_serializer(
+            data=request.data, many=True, allow_empty=False
+        )
+        if not serializer_in.is_valid():
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        deltas: DefaultDict[int, int] = defaultdict(int)
+        for item in serializer_in.validated_data:
+            deltas[item["id"]] += item["delta"]
+        if not apply_basket_deltas(deltas, user, anonymous_user_id):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        all_baskets = self.queryset.filter(
+            Q(user=user) & Q(session_id=anonymous_user_id) & Q(order=None)
+        )
+
+        return Response(self.basket_out_serializer(all_baskets, many=True).data)
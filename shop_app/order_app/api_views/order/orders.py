@@ -3,6 +3,7 @@ from typing import Optional
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.db.models import Q
 from drf_spectacular.utils import OpenApiResponse, extend_schema
+from order_app.api_views.utils import get_order_baskets_prefetch
 from order_app.models import Basket
 from order_app.models.order import Order
 from order_app.serializers.order import OutOrderSerializer
@@ -19,14 +20,7 @@ class OrderAPIView(APIView):
     """
 
     queryset = Order.objects.select_related("user").prefetch_related(
-        "baskets",
-        "baskets__product",
-        "baskets__product__category",
-        "baskets__user",
-        "baskets__product__tags",
-        "baskets__product__images",
-        "baskets__product__reviews",
-        "baskets__product__sales",
+        *get_order_baskets_prefetch()
     )
     order_out_serializer = OutOrderSerializer
 
@@ -58,7 +52,8 @@ class OrderAPIView(APIView):
             order.email = user.profile.email
             order.phone = user.profile.phone
         order.save()
-        order.baskets.add(*all_baskets)
+        # Резерв корзин заказа больше не истекает.
+        all_baskets.update(order=order, reserved_until=None)
         return Response({"orderId": order.pk})
 
     @extend_schema(
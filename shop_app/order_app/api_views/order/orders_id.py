@@ -1,6 +1,7 @@
 from typing import Optional
 
 from drf_spectacular.utils import OpenApiResponse, extend_schema
+from order_app.api_views.utils import get_order_baskets_prefetch
 from order_app.models.order import Order
 from order_app.serializers.order import (
     InOrderSerializer,
@@ -19,14 +20,7 @@ class OrderIdAPIView(APIView):
     """
 
     queryset = Order.objects.select_related("user").prefetch_related(
-        "baskets",
-        "baskets__product",
-        "baskets__product__category",
-        "baskets__user",
-        "baskets__product__tags",
-        "baskets__product__images",
-        "baskets__product__reviews",
-        "baskets__product__sales",
+        *get_order_baskets_prefetch()
     )
     order_out_serializer = OutOrderSerializer
     order_out_id_serializer = OutOrderIDSerializer
@@ -1,10 +1,17 @@
-from typing import Optional
+from collections import defaultdict
+from functools import partial
+from typing import DefaultDict, Optional
 
 from django.db import transaction
+from django.utils import timezone
 from drf_spectacular.utils import OpenApiResponse, extend_schema
+from order_app.api_views.utils import get_order_baskets_prefetch
 from order_app.models import Basket
 from order_app.models.order import Order
 from order_app.serializers.payment import InPaymentSerializer
+from product_app.api_views.catalog.cache import invalidate_catalog_for_products
+from product_app.models import Product
+from product_app.models.product import purchase_popularity
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -17,16 +24,7 @@ class PaymentAPIView(APIView):
     """
 
     payment_in_serializer = InPaymentSerializer
-    queryset = Order.objects.prefetch_related(
-        "baskets",
-        "baskets__product",
-        "baskets__product__category",
-        "baskets__user",
-        "baskets__product__tags",
-        "baskets__product__images",
-        "baskets__product__reviews",
-        "baskets__product__sales",
-    )
+    queryset = Order.objects.prefetch_related(*get_order_baskets_prefetch())
 
     @extend_schema(
         request=payment_in_serializer,
@@ -56,11 +54,21 @@ class PaymentAPIView(APIView):
             )
             if not order or order.paid_for:
                 return Response(status=status.HTTP_400_BAD_REQUEST)
+            order.paid_for = True
+            order.paid_at = timezone.now()
             baskets = order.baskets.all()
+            popularity: DefaultDict[int, float] = defaultdict(float)
             for basket in baskets:
                 basket.fixed_price = basket.product.get_actual_price()
+                popularity[basket.product_id] += purchase_popularity(
+                    basket.count, order.paid_at
+                )
             Basket.objects.bulk_update(baskets, ["fixed_price"])
-            order.paid_for = True
             order.save()
+            # Популярность обновляем сразу, полный пересчёт - rebuild_product_popularity.
+            Product.change_popularity(popularity)
+            transaction.on_commit(
+                partial(invalidate_catalog_for_products, list(popularity))
+            )
 
         return Response(status=status.HTTP_200_OK)
@@ -1,66 +1,240 @@
-from typing import List
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, Iterable, Mapping, Optional, Tuple, Union
 
 from django.contrib.auth.base_user import AbstractBaseUser
-from django.db.models import Q
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import F, Prefetch, Q
 from order_app.models import Basket
+from order_app.models.basket import get_reservation_deadline
 from order_app.models.order import Order
+from product_app.inventory import adjust_stock, release_stock, reserve_stock
+from product_app.models import Product
 from rest_framework.request import Request
 
 
+def get_order_baskets_prefetch() -> Tuple[Union[Prefetch, str], ...]:
+    """
+    Функция вернёт prefetch корзин заказа вместе с продуктами.
+    Продукты подтягиваются JOIN в запросе корзин, цены (действующая акция)
+    хранятся в самом продукте, поэтому количество запросов не зависит
+    от количества корзин в заказе.
+
+    :return: Аргументы для prefetch_related.
+    """
+    return (
+        Prefetch("baskets", queryset=Basket.objects.select_related("product")),
+        "baskets__product__tags",
+        "baskets__product__images",
+    )
+
+
+def get_basket_counts(baskets: Iterable[Basket]) -> Dict[int, int]:
+    """
+    Функция сложит количество единиц в корзинах по продуктам
+    (для возврата единиц продуктам через release_stock).
+
+    :param baskets: Корзины.
+    :return: Количество единиц по ID продуктов.
+    """
+    counts: DefaultDict[int, int] = defaultdict(int)
+    for basket in baskets:
+        counts[basket.product_id] += basket.count
+    return dict(counts)
+
+
+def extend_reservation(
+    user: Optional[AbstractBaseUser], session_id: Optional[str]
+) -> None:
+    """
+    Функция продлит резерв всех корзин пользователя без заказа одним UPDATE.
+
+    :param user: Пользователь (если прошёл аутентификацию).
+    :param session_id: ID анонимного пользователя.
+    :return: None.
+    """
+    Basket.objects.filter(
+        Q(user=user) & Q(session_id=session_id) & Q(order=None)
+    ).update(reserved_until=get_reservation_deadline())
+
+
+def add_to_basket(
+    product_id: int,
+    count: int,
+    user: Optional[AbstractBaseUser],
+    session_id: Optional[str],
+) -> bool:
+    """
+    Функция добавит единицы продукта в корзину (Basket.add_count - один
+    INSERT ... ON CONFLICT) и спишет их (reserve_stock). При нехватке единиц
+    изменения корзины откатываются. Резерв корзин продлевается.
+
+    :param product_id: ID продукта.
+    :param count: Количество.
+    :param user: Пользователь (если прошёл аутентификацию).
+    :param session_id: ID анонимного пользователя.
+    :return: False, если продукта нет или его не хватает.
+    """
+    with transaction.atomic():
+        Basket.add_count(product_id, count, user.pk if user else None, session_id)
+        extend_reservation(user, session_id)
+        # Списание - последним запросом: строка продукта заблокирована
+        # только до фиксации транзакции.
+        if not reserve_stock(product_id, count):
+            transaction.set_rollback(True)
+            return False
+    return True
+
+
+def remove_from_basket(
+    product_id: int,
+    count: int,
+    user: Optional[AbstractBaseUser],
+    session_id: Optional[str],
+) -> bool:
+    """
+    Функция уберёт единицы продукта из корзины и вернёт их продукту
+    (release_stock). Если в корзине остаётся 0 единиц, корзина удаляется.
+    Блокируется только строка корзины. Резерв остальных корзин продлевается.
+
+    :param product_id: ID продукта.
+    :param count: Количество.
+    :param user: Пользователь (если прошёл аутентификацию).
+    :param session_id: ID анонимного пользователя.
+    :return: False, если такой корзины нет.
+    """
+    with transaction.atomic():
+        basket: Optional[Basket] = (
+            Basket.objects.select_for_update()
+            .filter(
+                Q(product_id=product_id)
+                & Q(user=user)
+                & Q(session_id=session_id)
+                & Q(order=None)
+            )
+            .first()
+        )
+        if not basket:
+            return False
+        if count >= basket.count:
+            count = basket.count
+            basket.delete()
+        else:
+            Basket.objects.filter(pk=basket.pk).update(count=F("count") - count)
+        release_stock({product_id: count})
+        extend_reservation(user, session_id)
+    return True
+
+
+def apply_basket_deltas(
+    deltas: Mapping[int, int],
+    user: Optional[AbstractBaseUser],
+    session_id: Optional[str],
+) -> bool:
+    """
+    Функция изменит количество нескольких продуктов в корзине в одной
+    транзакции, фиксированным количеством запросов. Корзины и продукты
+    блокируются в порядке ID продуктов (одинаковый порядок у всех запросов -
+    без взаимных блокировок), затем изменения применяются пачкой:
+    Basket.add_counts, удаление опустевших корзин, adjust_stock.
+    Изменения применяются целиком или не применяются вовсе.
+    Уменьшение больше, чем есть в корзине, удаляет корзину.
+
+    :param deltas: Изменение количества по ID продуктов.
+    :param user: Пользователь (если прошёл аутентификацию).
+    :param session_id: ID анонимного пользователя.
+    :return: False, если продукта нет, его не хватает
+        или уменьшается отсутствующая корзина.
+    """
+    deltas = {pk: delta for pk, delta in deltas.items() if delta}
+    if not deltas:
+        return True
+    owner = Q(user=user) & Q(session_id=session_id) & Q(order=None)
+    with transaction.atomic():
+        in_baskets: Dict[int, int] = dict(
+            Basket.objects.select_for_update()
+            .filter(owner & Q(product_id__in=deltas))
+            .order_by("product_id")
+            .values_list("product_id", "count")
+        )
+        in_stock: Dict[int, int] = dict(
+            Product.objects.select_for_update()
+            .filter(pk__in=deltas)
+            .order_by("pk")
+            .values_list("pk", "count")
+        )
+        for product_id, delta in deltas.items():
+            if product_id not in in_stock:
+                return False
+            if delta > 0 and in_stock[product_id] < delta:
+                return False
+            if delta < 0:
+                if product_id not in in_baskets:
+                    return False
+                deltas[product_id] = max(delta, -in_baskets[product_id])
+        Basket.add_counts(deltas, user.pk if user else None, session_id)
+        emptied = [
+            product_id
+            for product_id, delta in deltas.items()
+            if in_baskets.get(product_id, 0) + delta == 0
+        ]
+        if emptied:
+            Basket.objects.filter(owner & Q(product_id__in=emptied)).delete()
+        adjust_stock({product_id: -delta for product_id, delta in deltas.items()})
+        extend_reservation(user, session_id)
+    return True
+
+
 def merge_baskets(user: AbstractBaseUser, request: Request) -> None:
     """
     Функция слияния корзин.
     Когда пользователь проходит аутентификацию,
-    выявит его анонимные корзины и объединит их с корзинами пользователя.
+    перенесёт его анонимные корзины в корзины пользователя одним запросом
+    (Basket.merge_session), количество запросов не зависит от размера корзины.
 
     :param user: Пользователь.
     :param request: Request.
     :return: None.
     """
-
     anonymous_user_id = request.session.get("anonymous_user_id", None)
     if not anonymous_user_id:
         return
-    all_baskets = (
-        Basket.objects.select_related("product")
-        .filter((Q(user=user) | Q(session_id=anonymous_user_id)) & Q(order=None))
-        .order_by("product__pk")
-    )
-    if not all_baskets.count():
-        return
-    baskets: List[Basket] = []
-    for basket in all_baskets:
-        if baskets and baskets[-1].product.pk == basket.product.pk:
-            baskets[-1].count += basket.count
-            baskets[-1].session_id = None
-            baskets[-1].user = user
-            basket.delete()
-        else:
-            basket.session_id = None
-            basket.user = user
-            baskets.append(basket)
-    Basket.objects.bulk_update(baskets, ["count", "session_id", "user"])
+    Basket.merge_session(anonymous_user_id, user.pk)
 
 
 def order_anonymous_to_user(user: AbstractBaseUser, request: Request) -> None:
     """
     Когда пользователь проходит аутентификацию,
-    выявит его анонимный заказ и присвоит ему пользователя.
+    присвоит его анонимным заказам пользователя и данные профиля одним UPDATE.
 
     :param user: Пользователь.
     :param request: Request.
     :return: None.
     """
     anonymous_user_id = request.session.get("anonymous_user_id", None)
-    orders = Order.objects.filter(session_id=anonymous_user_id)
-    if not orders.count():
+    if not anonymous_user_id:
         return
-    for order in orders:
-        order.user = user
-        order.session_id = None
-        order.full_name = user.profile.full_name
-        order.email = user.profile.email
-        order.phone = user.profile.phone
-    Order.objects.bulk_update(
-        orders, ["session_id", "user", "full_name", "email", "phone"]
-    )
+    fields: Dict[str, Any] = {"user": user, "session_id": None}
+    try:
+        profile = user.profile  # type: ignore[attr-defined]
+    except ObjectDoesNotExist:
+        pass
+    else:
+        fields.update(
+            full_name=profile.full_name, email=profile.email, phone=profile.phone
+        )
+    Order.objects.filter(session_id=anonymous_user_id).update(**fields)
+
+
+def adopt_anonymous_session(user: AbstractBaseUser, request: Request) -> None:
+    """
+    Когда пользователь проходит аутентификацию, перенесёт ему анонимные корзины
+    и заказы в одной транзакции (фиксированное количество запросов).
+
+    :param user: Пользователь.
+    :param request: Request.
+    :return: None.
+    """
+    with transaction.atomic():
+        merge_baskets(user, request)
+        order_anonymous_to_user(user, request)
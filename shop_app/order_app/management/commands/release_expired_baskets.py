@@ -0,0 +1,73 @@
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from django.core.management.base import BaseCommand, CommandParser
+from order_app.models import Basket
+from product_app.api_views.catalog.cache import invalidate_catalog_for_products
+
+
+class Command(BaseCommand):
+    """
+    Удаление корзин без заказа с истёкшим резервом (Basket.reserved_until)
+    и возврат их единиц продуктам. Корзины обрабатываются пачками, каждая пачка -
+    один запрос (и одна транзакция), поэтому строки продуктов блокируются
+    ненадолго. Без --once команда работает как воркер.
+    """
+
+    help = "Возврат продуктам единиц из корзин с истёкшим резервом."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Количество корзин в одной пачке.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=60.0,
+            help="Пауза (секунд), если просроченных корзин нет.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Обработать просроченные корзины и завершиться.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Цикл удаления просроченных корзин.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        baskets = 0
+        after: Optional[datetime] = None
+        try:
+            while True:
+                deleted, product_ids, last = Basket.release_expired(
+                    options["batch_size"], after
+                )
+                if product_ids:
+                    invalidate_catalog_for_products(product_ids)
+                baskets += deleted
+                after = last
+                if deleted < options["batch_size"]:
+                    if options["once"]:
+                        break
+                    # Следующий проход - с начала: корзины, пропущенные
+                    # из-за блокировок (SKIP LOCKED), будут обработаны.
+                    after = None
+                    time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Удалено корзин: {baskets}."))
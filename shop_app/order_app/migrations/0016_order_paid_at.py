@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order_app", "0015_remove_order_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="paid_at",
+            field=models.DateTimeField(default=None, null=True, verbose_name="paid at"),
+        ),
+    ]
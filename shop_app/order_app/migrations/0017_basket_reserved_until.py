@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-18 03:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order_app", "0016_order_paid_at"),
+        ("product_app", "0018_image_status"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="basket",
+            name="reserved_until",
+            field=models.DateTimeField(default=None, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="basket",
+            index=models.Index(
+                condition=models.Q(("order", None)),
+                fields=["reserved_until"],
+                name="basket_reservation_idx",
+            ),
+        ),
+        # Резерв уже существующих корзин без заказа отсчитываем от миграции.
+        migrations.RunSQL(
+            sql="""
+                UPDATE order_app_basket
+                SET reserved_until = now() + interval '1 day'
+                WHERE order_id IS NULL;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
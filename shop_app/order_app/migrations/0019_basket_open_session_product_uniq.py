@@ -0,0 +1,55 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order_app", "0018_basket_open_user_product_uniq"),
+        ("product_app", "0018_image_status"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Складываем повторяющиеся открытые корзины анонимного пользователя в одну.
+        migrations.RunSQL(
+            sql="""
+                WITH duplicates AS (
+                    SELECT session_id, product_id, MIN(id) AS keep_id, SUM(count) AS total
+                    FROM order_app_basket
+                    WHERE order_id IS NULL AND session_id IS NOT NULL
+                    GROUP BY session_id, product_id
+                    HAVING COUNT(*) > 1
+                ), kept AS (
+                    UPDATE order_app_basket AS b SET count = d.total
+                    FROM duplicates AS d
+                    WHERE b.id = d.keep_id
+                )
+                DELETE FROM order_app_basket AS b
+                USING duplicates AS d
+                WHERE b.session_id = d.session_id
+                    AND b.product_id = d.product_id
+                    AND b.order_id IS NULL
+                    AND b.id <> d.keep_id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="basket",
+            index=models.Index(
+                condition=models.Q(("order", None)),
+                fields=["user", "session_id"],
+                name="basket_open_owner_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="basket",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("order", None)),
+                fields=("session_id", "product"),
+                name="basket_open_session_product_uniq",
+            ),
+        ),
+    ]
@@ -1,12 +1,30 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
 from decimal import Decimal
+from typing import List, Mapping, Optional, Tuple
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import connection, models
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from order_app.models.order import Order
 from product_app.models import Product
 
+# Начало отсчёта для Basket.release_expired без after.
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def get_reservation_deadline() -> datetime:
+    """
+    Функция вернёт срок резерва единиц продукта для корзины без заказа.
+
+    :return: Дата и время окончания резерва.
+    """
+    return timezone.now() + timedelta(seconds=settings.BASKET_RESERVATION_TTL)
+
 
 class Basket(models.Model):
     """
@@ -20,7 +38,8 @@ class Basket(models.Model):
         если пользователь не прошёл аутентификацию. \n
     **created_at** Дата создания. \n
     **fixed_price** Зафиксированная цена, для сохранения информации после оплаты. \n
-    **order** Связанный заказ.
+    **order** Связанный заказ. \n
+    **reserved_until** Срок резерва единиц продукта (только для корзин без заказа).
     """
 
     product = models.ForeignKey(
@@ -49,3 +68,205 @@ class Basket(models.Model):
     order = models.ForeignKey(
         Order, on_delete=models.CASCADE, related_name="baskets", null=True, default=None
     )
+    reserved_until = models.DateTimeField(null=True, default=None)
+
+    @classmethod
+    def release_expired(
+        cls, limit: int, after: Optional[datetime] = None
+    ) -> Tuple[int, List[int], Optional[datetime]]:
+        """
+        Удалит до limit корзин без заказа с истёкшим резервом и вернёт их единицы
+        продуктам одним запросом: DELETE ... RETURNING, сумма по продуктам
+        и один UPDATE продуктов (строки продуктов блокируются в порядке id).
+        Корзины, заблокированные другими транзакциями, пропускаются (SKIP LOCKED).
+        Следующую пачку нужно запрашивать с after - сроком последней удалённой
+        корзины: индекс тогда не просматривается заново с начала (записи удалённых
+        строк остаются в индексе до VACUUM).
+
+        :param limit: Максимальное количество корзин.
+        :param after: Срок резерва, с которого продолжить (включительно).
+        :return: Количество удалённых корзин, ID продуктов с возвращёнными единицами,
+            наибольший срок резерва удалённых корзин.
+        """
+        basket_table = cls._meta.db_table
+        product_table = Product._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH deleted AS (
+                    DELETE FROM {basket_table}
+                    WHERE id = ANY(ARRAY(
+                        SELECT id FROM {basket_table}
+                        WHERE order_id IS NULL AND reserved_until < %s
+                            AND reserved_until >= %s
+                        ORDER BY reserved_until
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    ))
+                    RETURNING product_id, count, reserved_until
+                ), released AS (
+                    SELECT product_id, SUM(count) AS count
+                    FROM deleted
+                    GROUP BY product_id
+                ), locked AS (
+                    SELECT id FROM {product_table}
+                    WHERE id IN (SELECT product_id FROM released)
+                    ORDER BY id
+                    FOR UPDATE
+                ), updated AS (
+                    UPDATE {product_table} AS p SET count = p.count + r.count
+                    FROM released AS r
+                    WHERE p.id = r.product_id AND p.id IN (SELECT id FROM locked)
+                    RETURNING p.id
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM deleted),
+                    ARRAY(SELECT id FROM updated),
+                    (SELECT MAX(reserved_until) FROM deleted)
+                """,
+                [timezone.now(), after or EPOCH, limit],
+            )
+            deleted, product_ids, last = cursor.fetchone()
+        return deleted, product_ids, last
+
+    @classmethod
+    def add_count(
+        cls,
+        product_id: int,
+        count: int,
+        user_id: Optional[int],
+        session_id: Optional[str],
+    ) -> None:
+        """
+        Добавит единицы продукта в открытую корзину пользователя (add_counts).
+
+        :param product_id: ID продукта.
+        :param count: Количество.
+        :param user_id: ID пользователя (если прошёл аутентификацию).
+        :param session_id: ID анонимного пользователя.
+        :return: None.
+        """
+        cls.add_counts({product_id: count}, user_id, session_id)
+
+    @classmethod
+    def add_counts(
+        cls,
+        counts: Mapping[int, int],
+        user_id: Optional[int],
+        session_id: Optional[str],
+    ) -> None:
+        """
+        Изменит количество единиц продуктов в открытых корзинах пользователя
+        одним запросом INSERT ... ON CONFLICT DO UPDATE SET count = count + n
+        (по уникальности открытых корзин пользователя или анонимного
+        пользователя) и продлит их резерв. Строки вставляются и блокируются
+        в порядке ID продуктов. Для несуществующих продуктов ничего
+        не вставляется. Отрицательное количество допустимо только для
+        существующих корзин, корзины с 0 единиц удаляет вызывающий код.
+
+        :param counts: Изменение количества по ID продуктов.
+        :param user_id: ID пользователя (если прошёл аутентификацию).
+        :param session_id: ID анонимного пользователя.
+        :return: None.
+        """
+        if not counts:
+            return
+        table = cls._meta.db_table
+        owner = "user_id" if user_id is not None else "session_id"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (
+                    product_id, count, user_id, session_id, created_at,
+                    fixed_price, order_id, reserved_until
+                )
+                SELECT p.id, c.count, %s, %s, CURRENT_DATE, NULL, NULL, %s
+                FROM unnest(%s::bigint[], %s::int[]) AS c (product_id, count)
+                JOIN {Product._meta.db_table} AS p ON p.id = c.product_id
+                ORDER BY p.id
+                ON CONFLICT ({owner}, product_id) WHERE order_id IS NULL
+                DO UPDATE SET
+                    count = {table}.count + EXCLUDED.count,
+                    reserved_until = EXCLUDED.reserved_until
+                """,
+                [
+                    user_id,
+                    session_id,
+                    get_reservation_deadline(),
+                    list(counts),
+                    list(counts.values()),
+                ],
+            )
+
+    @classmethod
+    def merge_session(cls, session_id: str, user_id: int) -> None:
+        """
+        Перенесёт корзины без заказа анонимного пользователя в корзины
+        пользователя одним запросом: DELETE ... RETURNING, сумма по продуктам
+        и INSERT ... ON CONFLICT по уникальности (user, product) открытых корзин -
+        количество совпадающих продуктов складывается. Резерв перенесённых
+        корзин продлевается.
+
+        :param session_id: ID анонимного пользователя.
+        :param user_id: ID пользователя.
+        :return: None.
+        """
+        table = cls._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {table}
+                    WHERE session_id = %s AND user_id IS NULL AND order_id IS NULL
+                    RETURNING product_id, count
+                )
+                INSERT INTO {table} (
+                    product_id, count, user_id, session_id, created_at,
+                    fixed_price, order_id, reserved_until
+                )
+                SELECT product_id, SUM(count), %s, NULL, CURRENT_DATE, NULL, NULL, %s
+                FROM moved
+                GROUP BY product_id
+                ON CONFLICT (user_id, product_id) WHERE order_id IS NULL
+                DO UPDATE SET
+                    count = {table}.count + EXCLUDED.count,
+                    reserved_until = EXCLUDED.reserved_until
+                """,
+                [session_id, user_id, get_reservation_deadline()],
+            )
+
+    class Meta:
+        """
+        Метаданные.
+        """
+
+        constraints = (
+            # Одна открытая корзина продукта у пользователя и у анонимного
+            # пользователя (Basket.add_count и Basket.merge_session -
+            # INSERT ... ON CONFLICT).
+            models.UniqueConstraint(
+                fields=["user", "product"],
+                condition=Q(order=None),
+                name="basket_open_user_product_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=["session_id", "product"],
+                condition=Q(order=None),
+                name="basket_open_session_product_uniq",
+            ),
+        )
+
+        indexes = (
+            # Список корзин пользователя (после каждого изменения корзины).
+            models.Index(
+                fields=["user", "session_id"],
+                name="basket_open_owner_idx",
+                condition=Q(order=None),
+            ),
+            # Поиск корзин с истёкшим резервом (Basket.release_expired).
+            models.Index(
+                fields=["reserved_until"],
+                name="basket_reservation_idx",
+                condition=Q(order=None),
+            ),
+        )
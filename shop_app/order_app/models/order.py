@@ -19,6 +19,7 @@ class Order(models.Model):
     **city** Город доставки. \n
     **address** Адрес доставки. \n
     **paid_for** Оплачен ли заказ. \n
+    **paid_at** Дата и время оплаты. \n
     """
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -38,6 +39,7 @@ class Order(models.Model):
     city = models.CharField(_("city"), max_length=16, null=True, default=None)
     address = models.CharField(_("address"), max_length=255, null=True, default=None)
     paid_for = models.BooleanField(_("paid for"), default=False)
+    paid_at = models.DateTimeField(_("paid at"), null=True, default=None)
 
     @property
     def status(self) -> str:
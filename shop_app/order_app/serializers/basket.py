@@ -2,11 +2,13 @@ from decimal import Decimal
 from typing import Any, Dict
 
 from order_app.models import Basket
-from product_app.models import Product
 from product_app.serializers.product import OutProductImageSerializer
 from product_app.serializers.tag import OutTagSerializer
 from rest_framework import serializers
 
+# Наибольшее количество за один запрос: count в БД - integer.
+MAX_BASKET_COUNT = 2**31 - 1
+
 
 class InBasketSerializer(serializers.Serializer[Dict[str, Any]]):
     """
@@ -14,27 +16,9 @@ class InBasketSerializer(serializers.Serializer[Dict[str, Any]]):
     """
 
     id = serializers.IntegerField(min_value=1, required=True, write_only=True)
-    count = serializers.IntegerField(min_value=1, required=True, write_only=True)
-
-    def validate(self, data: Dict[str, Any]) -> tuple[Product, int]:
-        """
-        Дополнительная валидация. Проверим, есть ли товар с запрашиваемыми данными.
-        Возвращает кортеж: связанный продукт, необходимое количество.
-
-        :param data: Dict[str, Any].
-        :return: Связанный продукт, необходимое количество.
-        """
-        data = super().validate(data)
-        product = Product.objects.select_for_update().filter(pk=data["id"]).first()
-        if not product:
-            raise serializers.ValidationError(
-                f"Продукта с ID={data['id']} не существует."
-            )
-        elif product.count < data["count"]:
-            raise serializers.ValidationError(
-                f"Продуктов всего {product.count}, а запрашивается {data['count']}."
-            )
-        return product, data["count"]
+    count = serializers.IntegerField(
+        min_value=1, max_value=MAX_BASKET_COUNT, required=True, write_only=True
+    )
 
 
 class OutBasketSerializer(serializers.ModelSerializer[Basket]):
@@ -43,7 +27,7 @@ class OutBasketSerializer(serializers.ModelSerializer[Basket]):
     """
 
     id = serializers.IntegerField(read_only=True, source="product.pk")
-    category = serializers.IntegerField(read_only=True, source="product.category.pk")
+    category = serializers.IntegerField(read_only=True, source="product.category_id")
     price = serializers.SerializerMethodField(read_only=True)
     date = serializers.DateTimeField(read_only=True, source="product.created_at")
     title = serializers.CharField(read_only=True, source="product.title")
@@ -92,11 +76,11 @@ class OutBasketSerializer(serializers.ModelSerializer[Basket]):
     @staticmethod
     def get_reviews(obj: Basket) -> int:
         """
-        Определит количество отзывов.
+        Определит количество отзывов (хранимое значение).
 
         :return: Количество отзывов
         """
-        reviews_count: int = obj.product.reviews.count()
+        reviews_count: int = obj.product.reviews_count
         return reviews_count
 
     @staticmethod
@@ -117,4 +101,21 @@ class InDeleteBasketSerializer(serializers.Serializer[Dict[str, Any]]):
     """
 
     id = serializers.IntegerField(min_value=1, required=True, write_only=True)
-    count = serializers.IntegerField(min_value=1, required=True, write_only=True)
+    count = serializers.IntegerField(
+        min_value=1, max_value=MAX_BASKET_COUNT, required=True, write_only=True
+    )
+
+
+class InBasketDeltaSerializer(serializers.Serializer[Dict[str, Any]]):
+    """
+    Serializer Basket входящих данных (изменение количества, пакетный запрос).
+    Положительное delta добавляет единицы в корзину, отрицательное - убирает.
+    """
+
+    id = serializers.IntegerField(min_value=1, required=True, write_only=True)
+    delta = serializers.IntegerField(
+        min_value=-MAX_BASKET_COUNT,
+        max_value=MAX_BASKET_COUNT,
+        required=True,
+        write_only=True,
+    )
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from io import StringIO
+from typing import List
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from order_app.models import Basket, Order
+from product_app.models import Category, Product, SubCategory
+from product_app.tests.utils import get_category, get_simple_product, get_sub_category
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class BasketReservationTests(APITestCase):
+    """
+    Тест резерва единиц продукта в корзине: продление при изменении корзины
+    и возврат единиц из просроченных корзин (release_expired_baskets).
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.sub_category = get_sub_category(get_category())
+        cls.url = reverse("order_app:basket")
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту: два продукта по 100 единиц.
+
+        :return: None.
+        """
+        self.products = [get_simple_product(self.sub_category) for _ in range(2)]
+
+    def get_stocks(self) -> List[int]:
+        """
+        Вернёт количество единиц продуктов в БД.
+
+        :return: Количество единиц по порядку продуктов.
+        """
+        stocks = dict(
+            Product.objects.filter(pk__in=[p.pk for p in self.products]).values_list(
+                "pk", "count"
+            )
+        )
+        return [stocks[product.pk] for product in self.products]
+
+    def expire(self) -> None:
+        """
+        Сделает резерв всех корзин просроченным.
+
+        :return: None.
+        """
+        Basket.objects.update(reserved_until=timezone.now() - timedelta(seconds=1))
+
+    def expire_ordered_baskets(self) -> None:
+        """
+        Сделает резерв корзин заказа просроченным (не должен учитываться).
+
+        :return: None.
+        """
+        Basket.objects.filter(order__isnull=False).update(
+            reserved_until=timezone.now() - timedelta(days=1)
+        )
+
+    def test_extend_on_activity(self) -> None:
+        """
+        Проверяем: резерв ставится при добавлении и продлевается
+        для всех корзин пользователя при любом изменении корзины.
+
+        :return: None.
+        """
+        before = timezone.now()
+        self.client.post(self.url, {"id": self.products[0].pk, "count": 1})
+        basket = Basket.objects.get()
+        self.assertGreater(basket.reserved_until, before + timedelta(hours=23))
+
+        self.expire()
+        self.client.post(self.url, {"id": self.products[1].pk, "count": 1})
+        for basket in Basket.objects.all():
+            self.assertGreater(basket.reserved_until, timezone.now())
+
+        self.expire()
+        self.client.delete(self.url, {"id": self.products[1].pk, "count": 1})
+        self.assertGreater(Basket.objects.get().reserved_until, timezone.now())
+
+    def test_release_expired(self) -> None:
+        """
+        Проверяем: просроченные корзины удаляются пачками, единицы возвращаются
+        продуктам; корзины заказа и корзины с действующим резервом не затрагиваются.
+
+        :return: None.
+        """
+        self.client.post(self.url, {"id": self.products[0].pk, "count": 10})
+        self.client.post(self.url, {"id": self.products[1].pk, "count": 20})
+        self.client.post(reverse("order_app:order"))
+        self.assertIsNone(Basket.objects.filter(order__isnull=False)[0].reserved_until)
+        for session in ("a", "b", "c"):
+            Basket.objects.create(
+                product=self.products[0],
+                count=5,
+                session_id=session,
+                reserved_until=timezone.now() - timedelta(minutes=1),
+            )
+        Basket.objects.create(
+            product=self.products[1],
+            count=7,
+            session_id="d",
+            reserved_until=timezone.now() + timedelta(minutes=1),
+        )
+        Product.objects.filter(pk=self.products[0].pk).update(count=75)
+        Product.objects.filter(pk=self.products[1].pk).update(count=73)
+
+        self.expire_ordered_baskets()
+        call_command(
+            "release_expired_baskets", once=True, batch_size=2, stdout=StringIO()
+        )
+        self.assertEqual(self.get_stocks(), [90, 73])
+        self.assertEqual(Basket.objects.filter(order=None).count(), 1)
+        self.assertEqual(Basket.objects.filter(order__isnull=False).count(), 2)
+
+    def test_expired_basket_is_empty(self) -> None:
+        """
+        Проверяем: после удаления просроченной корзины список корзины пуст,
+        единицы возвращены.
+
+        :return: None.
+        """
+        self.client.post(self.url, {"id": self.products[0].pk, "count": 3})
+        self.expire()
+        call_command("release_expired_baskets", once=True, stdout=StringIO())
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+        self.assertEqual(self.get_stocks(), [100, 100])
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет заказы, корзины и продукты после каждого теста.
+
+        :return: None.
+        """
+        Order.objects.all().delete()
+        Basket.objects.all().delete()
+        Product.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -0,0 +1,159 @@
+from typing import Dict, List
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from order_app.models import Basket
+from product_app.models import Category, Product, SubCategory
+from product_app.tests.utils import get_category, get_simple_product, get_sub_category
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+
+class BasketBatchTests(APITestCase):
+    """
+    Тест пакетного изменения количества продуктов в корзине.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.sub_category = get_sub_category(get_category())
+        cls.url = reverse("order_app:basket_batch")
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту: 30 продуктов по 100 единиц.
+
+        :return: None.
+        """
+        self.products = [get_simple_product(self.sub_category) for _ in range(30)]
+
+    def post(self, operations: List[Dict[str, int]]) -> Response:
+        """
+        Отправит пакетный запрос.
+
+        :param operations: Список изменений {id, delta}.
+        :return: Response.
+        """
+        response: Response = self.client.post(self.url, operations, format="json")
+        return response
+
+    def get_stock(self) -> Dict[int, int]:
+        """
+        Вернёт количество единиц продуктов в БД.
+
+        :return: Количество по ID продуктов.
+        """
+        return dict(Product.objects.values_list("pk", "count"))
+
+    def get_basket_counts(self) -> Dict[int, int]:
+        """
+        Вернёт количество единиц в открытых корзинах по продуктам.
+
+        :return: Количество по ID продуктов.
+        """
+        return dict(
+            Basket.objects.filter(order=None).values_list("product_id", "count")
+        )
+
+    def test_apply(self) -> None:
+        """
+        Проверяем: добавление, уменьшение и удаление корзин одним запросом,
+        единицы списываются и возвращаются, повторяющиеся ID складываются.
+
+        :return: None.
+        """
+        first, second, third = (product.pk for product in self.products[:3])
+        response = self.post([{"id": first, "delta": 5}, {"id": second, "delta": 3}])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+        response = self.post(
+            [
+                {"id": third, "delta": 2},
+                {"id": first, "delta": -2},
+                {"id": second, "delta": -10},
+                {"id": third, "delta": 1},
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {item["id"]: item["count"] for item in response.data},
+            {first: 3, third: 3},
+        )
+        self.assertEqual(self.get_basket_counts(), {first: 3, third: 3})
+        stock = self.get_stock()
+        self.assertEqual((stock[first], stock[second], stock[third]), (97, 100, 97))
+
+    def test_all_or_nothing(self) -> None:
+        """
+        Проверяем: при нехватке единиц, отсутствии продукта или корзины
+        и неверных данных (в том числе вне диапазона integer) - 400 без изменений.
+
+        :return: None.
+        """
+        first, second = (product.pk for product in self.products[:2])
+        self.post([{"id": first, "delta": 1}])
+        for operations in (
+            [{"id": first, "delta": 1}, {"id": second, "delta": 101}],
+            [{"id": first, "delta": 1}, {"id": self.products[-1].pk + 1, "delta": 1}],
+            [{"id": first, "delta": 1}, {"id": second, "delta": -1}],
+            [],
+            [{"id": first}],
+            [{"id": second, "delta": 2**31}],
+            [{"id": second, "delta": -(2**31)}],
+            [{"id": second, "delta": 2**31 - 1}, {"id": second, "delta": 2**31 - 1}],
+        ):
+            response = self.post(operations)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_basket_counts(), {first: 1})
+        self.assertEqual(self.get_stock()[first], 99)
+        self.assertEqual(self.get_stock()[second], 100)
+
+    def test_query_count(self) -> None:
+        """
+        Проверяем: количество запросов не зависит от количества изменений.
+
+        :return: None.
+        """
+        counts = []
+        for lines in (1, 30):
+            Basket.objects.all().delete()
+            self.post([{"id": product.pk, "delta": 1} for product in self.products])
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post(
+                    [
+                        {"id": product.pk, "delta": 1 if index % 2 else -1}
+                        for index, product in enumerate(self.products[:lines])
+                    ]
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет корзины и продукты после каждого теста.
+
+        :return: None.
+        """
+        Basket.objects.all().delete()
+        Product.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -0,0 +1,159 @@
+from typing import Dict
+
+from auth_app.models import Profile
+from auth_app.tests.utils import get_user_data_from_frontend
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from order_app.models import Basket, Order
+from product_app.models import Category, Product, SubCategory
+from product_app.tests.utils import get_category, get_simple_product, get_sub_category
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+
+class BasketMergeTests(APITestCase):
+    """
+    Тест переноса анонимных корзин и заказов пользователю при входе.
+    """
+
+    credentials = {"username": "merge_user", "password": "merge_password"}
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам: пользователь с профилем и 30 продуктов.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.user = User.objects.create_user(**cls.credentials)
+        cls.profile = Profile.objects.create(
+            user=cls.user,
+            name="Ivan",
+            surname="Ivanov",
+            email="ivan@example.com",
+            phone="+79990000000",
+        )
+        sub_category = get_sub_category(get_category())
+        cls.products = [get_simple_product(sub_category) for _ in range(30)]
+        cls.basket_url = reverse("order_app:basket")
+        cls.login_url = reverse("auth_app:login")
+
+    def add(self, product: Product, count: int) -> None:
+        """
+        Добавит продукт в корзину текущего клиента.
+
+        :param product: Продукт.
+        :param count: Количество.
+        :return: None.
+        """
+        response: Response = self.client.post(
+            self.basket_url, {"id": product.pk, "count": count}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def login(self) -> int:
+        """
+        Выполнит вход и вернёт количество запросов входа.
+
+        :return: Количество запросов.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response: Response = self.client.post(
+                self.login_url, get_user_data_from_frontend(self.credentials)
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def get_user_counts(self) -> Dict[int, int]:
+        """
+        Вернёт количество единиц в открытых корзинах пользователя по продуктам.
+
+        :return: Количество по ID продуктов.
+        """
+        return dict(
+            Basket.objects.filter(user=self.user, order=None).values_list(
+                "product_id", "count"
+            )
+        )
+
+    def test_merge(self) -> None:
+        """
+        Проверяем: совпадающие продукты складываются, остальные переносятся,
+        анонимных корзин не остаётся, корзины заказов не затрагиваются.
+
+        :return: None.
+        """
+        first, second, third = self.products[:3]
+        Basket.objects.create(product=first, count=1, user=self.user)
+        Basket.objects.create(product=third, count=1, user=self.user)
+        order = Order.objects.create(user=self.user)
+        Basket.objects.create(product=first, count=5, user=self.user, order=order)
+        self.add(first, 2)
+        self.add(second, 3)
+
+        self.login()
+        self.assertEqual(
+            self.get_user_counts(), {first.pk: 3, second.pk: 3, third.pk: 1}
+        )
+        self.assertFalse(Basket.objects.filter(user=None).exists())
+        self.assertEqual(order.baskets.get().count, 5)
+        response: Response = self.client.get(self.basket_url)
+        self.assertEqual(len(response.data), 3)
+
+    def test_adopt_orders(self) -> None:
+        """
+        Проверяем: анонимный заказ переходит пользователю с данными профиля.
+
+        :return: None.
+        """
+        self.add(self.products[0], 1)
+        self.client.post(reverse("order_app:order"))
+        self.login()
+        order = Order.objects.get()
+        self.assertEqual(order.user, self.user)
+        self.assertIsNone(order.session_id)
+        self.assertEqual(order.full_name, self.profile.full_name)
+        self.assertEqual(order.email, self.profile.email)
+        self.assertEqual(order.phone, self.profile.phone)
+
+    def test_query_count(self) -> None:
+        """
+        Проверяем: количество запросов входа не зависит от размера корзины.
+
+        :return: None.
+        """
+        counts = []
+        for lines in (1, 30):
+            self.client.logout()
+            Basket.objects.all().delete()
+            for product in self.products[:lines]:
+                self.add(product, 1)
+            counts.append(self.login())
+            self.assertEqual(len(self.get_user_counts()), lines)
+        self.assertEqual(counts[0], counts[1])
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет заказы и корзины после каждого теста.
+
+        :return: None.
+        """
+        Order.objects.all().delete()
+        Basket.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        User.objects.all().delete()
+        super().tearDownClass()
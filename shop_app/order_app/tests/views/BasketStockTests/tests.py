@@ -0,0 +1,162 @@
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from order_app.models import Basket, Order
+from product_app.models import Category, Product, SubCategory
+from product_app.tests.utils import get_category, get_simple_product, get_sub_category
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+
+class BasketStockTests(APITestCase):
+    """
+    Тест списания и возврата единиц продукта при изменении корзины.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.sub_category = get_sub_category(get_category())
+        cls.url = reverse("order_app:basket")
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту: продукт на 100 единиц.
+
+        :return: None.
+        """
+        self.product = get_simple_product(self.sub_category)
+
+    def get_stock(self) -> int:
+        """
+        Вернёт количество единиц продукта в БД.
+
+        :return: Количество.
+        """
+        count: int = Product.objects.values_list("count", flat=True).get(
+            pk=self.product.pk
+        )
+        return count
+
+    def get_basket_count(self) -> int:
+        """
+        Вернёт количество единиц продукта в корзине (0, если корзины нет).
+
+        :return: Количество.
+        """
+        basket = Basket.objects.filter(product=self.product, order=None).first()
+        return basket.count if basket else 0
+
+    def test_add(self) -> None:
+        """
+        Проверяем: единицы списываются, повторное добавление увеличивает корзину,
+        при нехватке единиц или отсутствии продукта - 400 без изменений.
+
+        :return: None.
+        """
+        for count, stock in ((30, 70), (60, 10)):
+            response: Response = self.client.post(
+                self.url, {"id": self.product.pk, "count": count}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(self.get_stock(), stock)
+        self.assertEqual(self.get_basket_count(), 90)
+        self.assertEqual(response.data[0]["count"], 90)
+
+        response = self.client.post(self.url, {"id": self.product.pk, "count": 11})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {"id": self.product.pk + 1, "count": 1})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_stock(), 10)
+        self.assertEqual(self.get_basket_count(), 90)
+
+    def test_remove(self) -> None:
+        """
+        Проверяем: единицы возвращаются продукту, корзина удаляется при 0 единиц,
+        удаление из несуществующей корзины - 400.
+
+        :return: None.
+        """
+        self.client.post(self.url, {"id": self.product.pk, "count": 10})
+        response: Response = self.client.delete(
+            self.url, {"id": self.product.pk, "count": 4}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_stock(), 94)
+        self.assertEqual(self.get_basket_count(), 6)
+
+        response = self.client.delete(self.url, {"id": self.product.pk, "count": 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_stock(), 100)
+        self.assertEqual(self.get_basket_count(), 0)
+        self.assertEqual(response.data, [])
+
+        response = self.client.delete(self.url, {"id": self.product.pk, "count": 1})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_stock(), 100)
+
+    def test_count_out_of_range(self) -> None:
+        """
+        Проверяем: количество больше integer в БД - 400 без изменений, а не 500.
+
+        :return: None.
+        """
+        self.client.post(self.url, {"id": self.product.pk, "count": 1})
+        for method in (self.client.post, self.client.delete):
+            response: Response = method(
+                self.url, {"id": self.product.pk, "count": 2**31}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_stock(), 99)
+        self.assertEqual(self.get_basket_count(), 1)
+
+    def test_single_open_line(self) -> None:
+        """
+        Проверяем: повторное добавление не создаёт новую строку, вторая открытая
+        корзина того же продукта запрещена ограничением, в заказах - разрешена.
+
+        :return: None.
+        """
+        for _ in range(3):
+            self.client.post(self.url, {"id": self.product.pk, "count": 1})
+        basket = Basket.objects.get(product=self.product)
+        self.assertEqual(basket.count, 3)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Basket.objects.create(
+                product=self.product, count=1, session_id=basket.session_id
+            )
+        order = Order.objects.create(session_id=basket.session_id)
+        Basket.objects.filter(pk=basket.pk).update(order=order)
+        Basket.objects.create(
+            product=self.product, count=1, session_id=basket.session_id, order=order
+        )
+        self.client.post(self.url, {"id": self.product.pk, "count": 1})
+        self.assertEqual(
+            Basket.objects.filter(product=self.product, order=None).get().count, 1
+        )
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет корзины и продукт после каждого теста.
+
+        :return: None.
+        """
+        Order.objects.all().delete()
+        Basket.objects.all().delete()
+        Product.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -0,0 +1,181 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import now
+from order_app.models import Basket, Order
+from product_app.models import Category, Product, Sale, SubCategory, Tag
+from product_app.tests.utils import (
+    get_category,
+    get_product_image,
+    get_simple_product,
+    get_sub_category,
+    get_tag,
+)
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+
+class QueryCountTests(APITestCase):
+    """
+    Тест количества запросов корзины и заказа: не зависит от количества строк.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам: 50 продуктов с тегом и изображением, у половины - акция.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.category = get_category()
+        cls.sub_category = get_sub_category(cls.category)
+        cls.tag = get_tag()
+        cls.products = [get_simple_product(cls.sub_category) for _ in range(50)]
+        for i, product in enumerate(cls.products):
+            product.tags.add(cls.tag)
+            get_product_image(product)
+            if i % 2:
+                Sale.objects.create(
+                    product=product,
+                    price=Decimal("200.00"),
+                    sale_price=Decimal("50.00"),
+                    date_from=now().date() - timedelta(days=1),
+                    date_to=now().date() + timedelta(days=1),
+                )
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту: сессия анонимного пользователя.
+
+        :return: None.
+        """
+        response: Response = self.client.get(reverse("order_app:basket"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.session_id = self.client.session["anonymous_user_id"]
+
+    def create_baskets(self, lines: int) -> None:
+        """
+        Создаст корзину анонимного пользователя.
+
+        :param lines: Количество строк.
+        :return: None.
+        """
+        Basket.objects.filter(session_id=self.session_id).delete()
+        Basket.objects.bulk_create(
+            Basket(product=product, count=1, session_id=self.session_id)
+            for product in self.products[:lines]
+        )
+
+    def create_order(self, lines: int) -> Order:
+        """
+        Создаст заказ анонимного пользователя.
+
+        :param lines: Количество строк.
+        :return: Order.
+        """
+        self.create_baskets(lines)
+        order = Order.objects.create(session_id=self.session_id)
+        Basket.objects.filter(session_id=self.session_id).update(order=order)
+        return order
+
+    def count_queries(self, url: str) -> int:
+        """
+        Посчитает запросы GET запроса к url.
+
+        :param url: URL.
+        :return: Количество запросов.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response: Response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_basket(self) -> None:
+        """
+        Корзина из 50 строк стоит столько же запросов, сколько корзина из 1 строки.
+
+        :return: None.
+        """
+        url = reverse("order_app:basket")
+        self.create_baskets(1)
+        expected = self.count_queries(url)
+        self.create_baskets(50)
+        with self.assertNumQueries(expected):
+            response: Response = self.client.get(url)
+        self.assertEqual(len(response.data), 50)
+        prices = {item["id"]: item["price"] for item in response.data}
+        self.assertEqual(prices[self.products[0].pk], Decimal("100.00"))
+        self.assertEqual(prices[self.products[1].pk], Decimal("50.00"))
+
+    def test_order(self) -> None:
+        """
+        Заказ из 50 строк стоит столько же запросов, сколько заказ из 1 строки.
+
+        :return: None.
+        """
+        order = self.create_order(1)
+        expected = self.count_queries(
+            reverse("order_app:order_id", kwargs={"order_id": order.pk})
+        )
+        order = self.create_order(50)
+        with self.assertNumQueries(expected):
+            response: Response = self.client.get(
+                reverse("order_app:order_id", kwargs={"order_id": order.pk})
+            )
+        self.assertEqual(len(response.data["products"]), 50)
+        self.assertEqual(response.data["totalCost"], Decimal(25 * 100 + 25 * 50))
+
+    def test_payment(self) -> None:
+        """
+        Оплата заказа из 50 строк стоит столько же запросов, сколько из 1 строки.
+        Фиксируются цены с учётом акций.
+
+        :return: None.
+        """
+        payment = {
+            "number": "1234567812345670",
+            "name": "Ivan Ivanov",
+            "month": "01",
+            "year": now().year + 1,
+            "code": "123",
+        }
+        counts = []
+        for lines in (1, 50):
+            order = self.create_order(lines)
+            with CaptureQueriesContext(connection) as queries:
+                response: Response = self.client.post(
+                    reverse("order_app:payment", kwargs={"order_id": order.pk}),
+                    data=payment,
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+        prices = dict(order.baskets.values_list("product_id", "fixed_price"))
+        self.assertEqual(prices[self.products[1].pk], Decimal("50.00"))
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет заказы и корзины после каждого теста.
+
+        :return: None.
+        """
+        Order.objects.all().delete()
+        Basket.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+        Tag.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -1,5 +1,6 @@
 from django.urls import path
 from order_app.api_views.basket.basket import BasketAPIView
+from order_app.api_views.basket.batch import BasketBatchAPIView
 from order_app.api_views.order.orders import OrderAPIView
 from order_app.api_views.order.orders_id import OrderIdAPIView
 from order_app.api_views.payment.payment import PaymentAPIView
@@ -8,6 +9,7 @@ app_name = "order_app"
 
 urlpatterns = [
     path("basket", BasketAPIView.as_view(), name="basket"),
+    path("basket/batch", BasketBatchAPIView.as_view(), name="basket_batch"),
     path("orders", OrderAPIView.as_view(), name="order"),
     path("order/<int:order_id>", OrderIdAPIView.as_view(), name="order_id"),
     path("payment/<int:order_id>", PaymentAPIView.as_view(), name="payment"),
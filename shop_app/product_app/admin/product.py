@@ -62,6 +62,7 @@ class ProductImageInline(ImageTabularInline):
     model = ProductImage
     verbose_name_plural = _("Images")
     extra = 1
+    readonly_fields = ("image_status",)
 
 
 class ProductReviewsInline(ReviewTabularInline):
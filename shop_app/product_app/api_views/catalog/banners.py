@@ -1,20 +1,69 @@
+from random import randint
+from typing import List
+
+from django.db import connection
+from django.db.models import Max, Min
 from drf_spectacular.utils import extend_schema
+from product_app.api_views.catalog.cards import get_product_cards
 from product_app.models import Product
 from product_app.serializers.product import OutCatalogProductSerializer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+# Случайные точки в диапазоне id: для каждой берётся первый продукт (не в архиве)
+# с id не меньше точки - поиск по индексу первичного ключа, без сканирования таблицы.
+PROBE_SQL = """
+SELECT probe.id
+FROM unnest(%s::bigint[]) WITH ORDINALITY AS point(id, n)
+CROSS JOIN LATERAL (
+    SELECT product.id FROM {table} AS product
+    WHERE NOT product.archived AND product.id >= point.id
+    ORDER BY product.id
+    LIMIT 1
+) AS probe
+ORDER BY point.n
+"""
+
+
+def get_random_product_ids(limit: int, rounds: int = 3) -> List[int]:
+    """
+    Функция выберет до limit случайных продуктов (не в архиве) без ORDER BY random():
+    случайные точки между минимальным и максимальным id, каждая - один поиск по индексу.
+    Продукт после пропуска в id (удалённые/архивные продукты) выпадает чаще,
+    для баннеров это допустимо. Если за rounds попыток набралось меньше limit
+    (каталог из нескольких продуктов), остаток добирается ORDER BY random().
+
+    :param limit: Количество продуктов.
+    :param rounds: Количество попыток.
+    :return: ID продуктов в случайном порядке.
+    """
+    live = Product.objects.filter(archived=False)
+    bounds = live.aggregate(lo=Min("id"), hi=Max("id"))
+    if bounds["lo"] is None:
+        return []
+    sql = PROBE_SQL.format(table=connection.ops.quote_name(Product._meta.db_table))
+    ids: List[int] = []
+    for _ in range(rounds):
+        # С запасом: часть точек попадёт на уже выбранные продукты.
+        points = [randint(bounds["lo"], bounds["hi"]) for _ in range(limit * 3)]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [points])
+            for (pk,) in cursor.fetchall():
+                if pk not in ids:
+                    ids.append(pk)
+        if len(ids) >= limit:
+            return ids[:limit]
+    rest = live.exclude(pk__in=ids).order_by("?").values_list("pk", flat=True)
+    return ids + list(rest[: limit - len(ids)])
+
 
 class CatalogBannersAPIView(APIView):
     """
     Класс APIView для случайных продуктов.
     """
 
-    queryset = Product.objects.select_related("category").prefetch_related(
-        "tags", "images", "reviews", "sales"
-    )
-    product_serializer = OutCatalogProductSerializer
+    queryset = Product.objects.all()
     limit = 4
 
     @extend_schema(
@@ -30,5 +79,7 @@ class CatalogBannersAPIView(APIView):
         :param request: Request.
         :return: Response.
         """
-        products = self.queryset.filter(archived=False).order_by("?")[: self.limit]
-        return Response(self.product_serializer(products, many=True).data)
+        ids = get_random_product_ids(self.limit)
+        cards = get_product_cards(self.queryset.filter(pk__in=ids))
+        position = {pk: i for i, pk in enumerate(ids)}
+        return Response(sorted(cards, key=lambda card: position[card["id"]]))
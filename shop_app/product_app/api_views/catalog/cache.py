@@ -0,0 +1,324 @@
+import hashlib
+import json
+import os
+import socket
+import time
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from product_app.models import CatalogCacheStats, CatalogVersion, Product
+
+CATALOG_CACHE_PREFIX = "catalog"
+# Версия "всего каталога": меняется при любом изменении продуктов.
+# Нужна запросам без категории и без тегов.
+GLOBAL_VERSION_KEY = f"{CATALOG_CACHE_PREFIX}:v:all"
+
+
+def get_catalog_cache_timeout() -> int:
+    """
+    Функция вернёт время жизни закэшированной страницы каталога (секунды).
+    0 - кэш отключён.
+
+    :return: Время жизни.
+    """
+    return int(getattr(settings, "CATALOG_CACHE_TIMEOUT", 60))
+
+
+def subcategory_version_key(subcategory_id: int) -> str:
+    """
+    Ключ версии подкатегории.
+
+    :param subcategory_id: ID подкатегории.
+    :return: Ключ.
+    """
+    return f"{CATALOG_CACHE_PREFIX}:v:sub:{subcategory_id}"
+
+
+def tag_version_key(tag_id: int) -> str:
+    """
+    Ключ версии тега.
+
+    :param tag_id: ID тега.
+    :return: Ключ.
+    """
+    return f"{CATALOG_CACHE_PREFIX}:v:tag:{tag_id}"
+
+
+def product_version_key(product_id: int) -> str:
+    """
+    Ключ версии продукта (страница продукта).
+
+    :param product_id: ID продукта.
+    :return: Ключ.
+    """
+    return f"{CATALOG_CACHE_PREFIX}:v:product:{product_id}"
+
+
+def bump_versions(keys: Iterable[str]) -> None:
+    """
+    Функция сменит версии: все страницы и ETag, в которые входила старая версия,
+    становятся недействительны (страницы вытесняются кэшем по TTL).
+    Версии хранятся в БД (CatalogVersion) - общие для всех процессов -
+    и меняются в текущей транзакции, поэтому видны вместе с новыми строками:
+    до фиксации параллельный запрос получает и старую версию, и старые строки.
+
+    :param keys: Ключи версий.
+    :return: None.
+    """
+    CatalogVersion.bump_many(keys)
+
+
+def invalidate_catalog_for_subcategories(
+    subcategory_ids: Iterable[Optional[int]],
+) -> None:
+    """
+    Функция сбросит страницы каталога подкатегорий (и общие страницы каталога).
+
+    :param subcategory_ids: ID подкатегорий.
+    :return: None.
+    """
+    keys = [subcategory_version_key(pk) for pk in subcategory_ids if pk is not None]
+    bump_versions([GLOBAL_VERSION_KEY, *keys])
+
+
+def invalidate_catalog_for_tags(tag_ids: Iterable[int]) -> None:
+    """
+    Функция сбросит страницы каталога, отфильтрованные по тегам (и общие страницы).
+
+    :param tag_ids: ID тегов.
+    :return: None.
+    """
+    bump_versions([GLOBAL_VERSION_KEY, *(tag_version_key(pk) for pk in tag_ids)])
+
+
+def invalidate_catalog_for_products(product_ids: Iterable[int]) -> None:
+    """
+    Функция сбросит все страницы каталога, на которых могли быть продукты:
+    страницы их подкатегорий, их тегов, общие страницы и страницы самих продуктов.
+
+    :param product_ids: ID продуктов.
+    :return: None.
+    """
+    product_ids = list(product_ids)
+    keys = [GLOBAL_VERSION_KEY, *(product_version_key(pk) for pk in product_ids)]
+    rows = Product.objects.filter(pk__in=product_ids).values_list(
+        "category_id", "tags__id"
+    )
+    for subcategory_id, tag_id in rows:
+        keys.append(subcategory_version_key(subcategory_id))
+        if tag_id is not None:
+            keys.append(tag_version_key(tag_id))
+    bump_versions(keys)
+
+
+def invalidate_categories() -> None:
+    """
+    Функция сменит версию дерева категорий (bump_versions).
+
+    :return: None.
+    """
+    bump_versions([CatalogVersion.CATEGORIES])
+
+
+def get_versions(version_keys: List[str]) -> List[int]:
+    """
+    Функция вернёт текущие версии (в порядке ключей) одним запросом к БД.
+
+    :param version_keys: Ключи версий.
+    :return: Версии.
+    """
+    return CatalogVersion.get_many(version_keys)
+
+
+def get_validators(
+    version_keys: List[str], params: Dict[str, Any], kind: str
+) -> Tuple[str, float]:
+    """
+    Функция посчитает валидаторы ответа по версиям из кэша (get_versions_validators).
+
+    :param version_keys: Ключи версий, от которых зависит ответ.
+    :param params: Параметры запроса.
+    :param kind: Вид ответа.
+    :return: Хэш и время последнего изменения (timestamp).
+    """
+    return get_versions_validators(get_versions(version_keys), params, kind)
+
+
+def get_versions_validators(
+    versions: List[int], params: Dict[str, Any], kind: str
+) -> Tuple[str, float]:
+    """
+    Функция посчитает валидаторы ответа без запросов к БД:
+    хэш параметров и версий (ETag, ключ кэша) и время последнего изменения
+    (версия - время смены в наносекундах, Last-Modified).
+
+    :param versions: Версии, от которых зависит ответ.
+    :param params: Параметры запроса.
+    :param kind: Вид ответа.
+    :return: Хэш и время последнего изменения (timestamp).
+    """
+    raw_key = json.dumps(
+        {"kind": kind, "params": params, "versions": versions},
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(raw_key.encode()).hexdigest()
+    return digest, max(versions) / 1e9
+
+
+def get_catalog_validators(
+    validated_data: Dict[str, Any], kind: str = "page"
+) -> Tuple[str, float]:
+    """
+    Функция создаст ключ страницы каталога и время её последнего изменения.
+    Ключ состоит из нормализованных параметров запроса (порядок тегов не важен)
+    и текущих версий данных, от которых зависит страница:
+    подкатегории и тегов, а если их нет в запросе - всего каталога.
+
+    :param validated_data: Проверенные параметры запроса (InCatalogSerializer).
+    :param kind: Вид данных ('page' - страница каталога, 'facets' - фасеты).
+    :return: Ключ и время последнего изменения (timestamp).
+    """
+    params = dict(validated_data)
+    version_keys: List[str] = []
+    if params.get("tags"):
+        params["tags"] = sorted(set(params["tags"]))
+        version_keys.extend(tag_version_key(pk) for pk in params["tags"])
+    if params.get("category"):
+        version_keys.append(subcategory_version_key(params["category"]))
+    if not version_keys:
+        version_keys.append(GLOBAL_VERSION_KEY)
+
+    digest, last_modified = get_validators(version_keys, params, kind)
+    return f"{CATALOG_CACHE_PREFIX}:{kind}:{digest}", last_modified
+
+
+def get_catalog_cache_stats_interval() -> float:
+    """
+    Функция вернёт, как часто (секунды) процесс прибавляет свои счётчики
+    к общим (CatalogCacheStats).
+
+    :return: Интервал.
+    """
+    return float(getattr(settings, "CATALOG_CACHE_STATS_INTERVAL", 10))
+
+
+class CatalogCacheCounters:
+    """
+    Счётчики попаданий и промахов кэша каталога текущего процесса.
+    Запрос только увеличивает счётчик в памяти; накопленное прибавляется
+    к строке процесса в БД (CatalogCacheStats) не чаще раза
+    в CATALOG_CACHE_STATS_INTERVAL секунд.
+    """
+
+    def __init__(self) -> None:
+        """
+        Пустые счётчики.
+
+        :return: None.
+        """
+        self.hits = 0
+        self.misses = 0
+        # Время первого не сохранённого в БД попадания/промаха.
+        self.since: Optional[float] = None
+        self.lock = Lock()
+
+    def count(self, hit: bool) -> None:
+        """
+        Учтёт попадание или промах, при необходимости сохранит счётчики в БД.
+
+        :param hit: True - попадание, False - промах.
+        :return: None.
+        """
+        now = time.monotonic()
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if self.since is None:
+                self.since = now
+            due = now - self.since >= get_catalog_cache_stats_interval()
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Прибавит накопленные счётчики к строке процесса в БД.
+
+        :return: None.
+        """
+        with self.lock:
+            hits, misses = self.hits, self.misses
+            self.clear_unlocked()
+        if hits or misses:
+            process = f"{socket.gethostname()}:{os.getpid()}"
+            CatalogCacheStats.add(process, hits, misses)
+
+    def clear(self) -> None:
+        """
+        Обнулит счётчики процесса, не сохраняя их.
+
+        :return: None.
+        """
+        with self.lock:
+            self.clear_unlocked()
+
+    def clear_unlocked(self) -> None:
+        """
+        Обнулит счётчики процесса (вызывается под блокировкой).
+
+        :return: None.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.since = None
+
+
+catalog_cache_counters = CatalogCacheCounters()
+
+
+def get_cached_catalog_page(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Функция вернёт закэшированную страницу каталога и учтёт попадание/промах.
+
+    :param key: Ключ страницы (get_catalog_validators).
+    :return: Данные страницы или None.
+    """
+    data = cache.get(key)
+    catalog_cache_counters.count(hit=data is not None)
+    return data
+
+
+def set_cached_catalog_page(key: str, data: Dict[str, Any]) -> None:
+    """
+    Функция сохранит страницу каталога в кэш.
+
+    :param key: Ключ страницы (get_catalog_validators).
+    :param data: Данные страницы.
+    :return: None.
+    """
+    cache.set(key, data, timeout=get_catalog_cache_timeout())
+
+
+def get_catalog_cache_stats() -> Dict[str, int]:
+    """
+    Функция вернёт счётчики попаданий и промахов кэша каталога всех процессов
+    (счётчики других процессов - с задержкой до CATALOG_CACHE_STATS_INTERVAL).
+
+    :return: {"hits": ..., "misses": ...}.
+    """
+    catalog_cache_counters.flush()
+    return CatalogCacheStats.totals()
+
+
+def reset_catalog_cache_stats() -> None:
+    """
+    Функция обнулит счётчики попаданий и промахов кэша каталога всех процессов.
+
+    :return: None.
+    """
+    catalog_cache_counters.clear()
+    CatalogCacheStats.objects.all().delete()
@@ -0,0 +1,127 @@
+from typing import Any, Callable, Dict, Iterable, List
+
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db.models import JSONField, OuterRef, QuerySet, Subquery
+from django.db.models.functions import JSONObject
+from product_app.models import Product, ProductImage
+from rest_framework import serializers
+
+from shop_app.thumbnails import ImageStatus, get_image_variants, get_url_builder
+
+# Колонки продукта, нужные карточке (OutCatalogProductSerializer).
+CARD_FIELDS = (
+    "id",
+    "category_id",
+    "effective_price",
+    "count",
+    "created_at",
+    "title",
+    "description",
+    "free_delivery",
+    "reviews_count",
+    "rating",
+)
+
+# Поле только форматирует дату так же, как сериализатор (формат и часовой пояс).
+DATE_FIELD = serializers.DateTimeField()
+
+
+def get_product_card_rows(
+    queryset: QuerySet[Product], *extra_fields: str
+) -> QuerySet[Product, Dict[str, Any]]:
+    """
+    Функция превратит queryset продуктов в queryset строк карточек (values()):
+    только нужные колонки, изображения и теги - массивами JSON из подзапросов.
+    Модели и вложенные сериализаторы не создаются, запрос к БД - один.
+    Изображения и теги упорядочены по id.
+
+    :param queryset: Отфильтрованные продукты (до сортировки и среза).
+    :param extra_fields: Дополнительные колонки (например, ключ сортировки для курсора).
+    :return: QuerySet словарей.
+    """
+    images = (
+        ProductImage.objects.filter(product_id=OuterRef("pk"))
+        .order_by()
+        .values("product_id")
+        .annotate(
+            items=JSONBAgg(
+                JSONObject(src="image", alt="title", status="image_status"),
+                ordering="pk",
+            )
+        )
+        .values("items")
+    )
+    tags = (
+        Product.tags.through.objects.filter(product_id=OuterRef("pk"))
+        .order_by()
+        .values("product_id")
+        .annotate(
+            items=JSONBAgg(JSONObject(id="tag_id", name="tag__name"), ordering="tag_id")
+        )
+        .values("items")
+    )
+    return queryset.annotate(
+        card_images=Subquery(images, output_field=JSONField()),
+        card_tags=Subquery(tags, output_field=JSONField()),
+    ).values(*CARD_FIELDS, *extra_fields, "card_images", "card_tags")
+
+
+def get_image_url_builder() -> Callable[[str], str]:
+    """
+    Функция вернёт функцию построения url изображения продукта по имени файла.
+
+    :return: Функция: имя файла -> url.
+    """
+    return get_url_builder(ProductImage._meta.get_field("image").storage)
+
+
+def render_product_cards(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Функция соберёт карточки продуктов из строк get_product_card_rows.
+    Результат совпадает с OutCatalogProductSerializer(many=True).data
+    (тот же порядок ключей и те же типы значений).
+
+    :param rows: Строки карточек.
+    :return: Список карточек.
+    """
+    to_url = get_image_url_builder()
+    to_date = DATE_FIELD.to_representation
+    return [
+        {
+            "id": row["id"],
+            "category": row["category_id"],
+            "price": row["effective_price"],
+            "count": row["count"],
+            "date": to_date(row["created_at"]),
+            "title": row["title"],
+            "description": row["description"],
+            "freeDelivery": row["free_delivery"],
+            "images": [
+                {
+                    "src": to_url(image["src"]) if image["src"] else None,
+                    "alt": image["alt"],
+                    **get_image_variants(
+                        image["src"] if image["status"] == ImageStatus.READY else None,
+                        to_url,
+                    ),
+                }
+                for image in row["card_images"] or ()
+            ],
+            "tags": [
+                {"id": tag["id"], "name": tag["name"]} for tag in row["card_tags"] or ()
+            ],
+            "reviews": row["reviews_count"],
+            "rating": float(row["rating"]) if row["reviews_count"] else 0,
+        }
+        for row in rows
+    ]
+
+
+def get_product_cards(queryset: QuerySet[Product]) -> List[Dict[str, Any]]:
+    """
+    Функция вернёт карточки продуктов queryset (сортировка и срез уже применены).
+
+    :param queryset: Продукты.
+    :return: Список карточек.
+    """
+    return render_product_cards(get_product_card_rows(queryset))
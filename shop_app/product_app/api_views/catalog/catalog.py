@@ -1,15 +1,134 @@
+from typing import Any, Dict
+
 from django.core.paginator import Paginator
-from django.db.models import Avg, Case, Count, DecimalField, F, Q, When
-from django.utils import timezone
-from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
-from product_app.api_views.catalog.utils import get_catalog_filters, get_catalog_sort
+from django.db.models import FloatField, QuerySet, Value
+from django.http.response import HttpResponseBase
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    PolymorphicProxySerializer,
+    extend_schema,
+)
+from product_app.api_views.catalog.cache import (
+    get_cached_catalog_page,
+    get_catalog_cache_timeout,
+    get_catalog_validators,
+    set_cached_catalog_page,
+)
+from product_app.api_views.catalog.cards import (
+    CARD_FIELDS,
+    get_product_card_rows,
+    render_product_cards,
+)
+from product_app.api_views.catalog.search import get_search_rank
+from product_app.api_views.catalog.utils import (
+    encode_catalog_cursor,
+    get_catalog_cursor_filter,
+    get_catalog_filters,
+    get_catalog_ordering,
+    get_catalog_sort,
+)
 from product_app.models import Product
-from product_app.serializers.catalog import InCatalogSerializer, OutCatalogSerializer
+from product_app.serializers.catalog import (
+    InCatalogSerializer,
+    OutCatalogCursorSerializer,
+    OutCatalogSerializer,
+)
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from utils import parser_query_params
+from utils import conditional_response, parser_query_params
+
+# Параметры запроса каталога (используются также фасетами каталога).
+CATALOG_PARAMETERS = [
+    OpenApiParameter(
+        "filter[name]",
+        str,
+        description=(
+            "Поиск продукта по названию и описанию (полнотекстовый, "
+            "слова ищутся как префиксы)."
+        ),
+        required=True,
+    ),
+    OpenApiParameter(
+        "filter[minPrice]",
+        float,
+        description="Минимальная цена продукта.",
+        required=True,
+    ),
+    OpenApiParameter(
+        "filter[maxPrice]",
+        float,
+        description="Максимальная цена продукта.",
+        required=True,
+    ),
+    OpenApiParameter(
+        "filter[freeDelivery]",
+        bool,
+        description="Фильтр по бесплатной доставке.",
+        required=True,
+    ),
+    OpenApiParameter(
+        "filter[available]",
+        bool,
+        description="Фильтр по доступности продукта.",
+        required=True,
+    ),
+    OpenApiParameter(
+        "currentPage", int, description="Номер текущей страницы.", required=True
+    ),
+    OpenApiParameter(
+        "category", int, description="ID категории продукта.", required=False
+    ),
+    OpenApiParameter(
+        "sort",
+        str,
+        description=(
+            "Параметр сортировки (например, 'price'; "
+            "'relevance' - по релевантности filter[name], "
+            "'popularity' - по популярности: покупки и отзывы)."
+        ),
+        required=True,
+    ),
+    OpenApiParameter(
+        "sortType",
+        str,
+        description="Тип сортировки (например, 'inc' или 'dec').",
+        required=True,
+    ),
+    OpenApiParameter(
+        "limit",
+        int,
+        description="Количество продуктов на странице.",
+        required=True,
+    ),
+    OpenApiParameter(
+        "cursor",
+        str,
+        description=(
+            "Курсорная пагинация (необязательно). Пустое значение - первая "
+            "страница, далее - nextCursor из предыдущего ответа. "
+            "lastPage в этом режиме - оценка."
+        ),
+        required=False,
+    ),
+    OpenApiParameter(
+        name="tags[]",
+        type={"type": "array", "items": {"type": "integer"}},
+        description="Список id тегов для фильтрации.",
+        required=False,
+    ),
+    OpenApiParameter(
+        "tagsMode",
+        str,
+        description=(
+            "Режим фильтра по тегам: 'any' - любой из тегов (по умолчанию), "
+            "'all' - все теги."
+        ),
+        required=False,
+    ),
+]
 
 
 class CatalogAPIView(APIView):
@@ -18,83 +137,23 @@ class CatalogAPIView(APIView):
     """
 
     query_serializer = InCatalogSerializer
-    queryset = Product.objects.select_related("category").prefetch_related(
-        "tags", "images", "reviews", "sales"
-    )
-    catalog_serializer = OutCatalogSerializer
+    queryset = Product.objects.all()
 
     @extend_schema(
         request=None,
         responses={
-            200: OutCatalogSerializer,
+            200: PolymorphicProxySerializer(
+                component_name="Catalog",
+                serializers=[OutCatalogSerializer, OutCatalogCursorSerializer],
+                resource_type_field_name=None,
+            ),
             400: OpenApiResponse(description="Неверный запрос."),
         },
         description="Получение списка продуктов с учётом заданных параметров.",
         tags=("Catalog",),
-        parameters=[
-            OpenApiParameter(
-                "filter[name]",
-                str,
-                description="Фильтр по имени продукта.",
-                required=True,
-            ),
-            OpenApiParameter(
-                "filter[minPrice]",
-                float,
-                description="Минимальная цена продукта.",
-                required=True,
-            ),
-            OpenApiParameter(
-                "filter[maxPrice]",
-                float,
-                description="Максимальная цена продукта.",
-                required=True,
-            ),
-            OpenApiParameter(
-                "filter[freeDelivery]",
-                bool,
-                description="Фильтр по бесплатной доставке.",
-                required=True,
-            ),
-            OpenApiParameter(
-                "filter[available]",
-                bool,
-                description="Фильтр по доступности продукта.",
-                required=True,
-            ),
-            OpenApiParameter(
-                "currentPage", int, description="Номер текущей страницы.", required=True
-            ),
-            OpenApiParameter(
-                "category", int, description="ID категории продукта.", required=False
-            ),
-            OpenApiParameter(
-                "sort",
-                str,
-                description="Параметр сортировки (например, 'price').",
-                required=True,
-            ),
-            OpenApiParameter(
-                "sortType",
-                str,
-                description="Тип сортировки (например, 'inc' или 'dec').",
-                required=True,
-            ),
-            OpenApiParameter(
-                "limit",
-                int,
-                description="Количество продуктов на странице.",
-                required=True,
-            ),
-            OpenApiParameter(
-                name="tags[]",
-                type={"type": "array", "items": {"type": "integer"}},
-                description="Список id тегов для фильтрации.",
-                required=False,
-            ),
-        ],
+        parameters=CATALOG_PARAMETERS,
     )
-    def get(self, request: Request) -> Response:
+    def get(self, request: Request) -> HttpResponseBase:
         """
         Получение списка продуктов с учётом переданных параметров.
 
@@ -106,49 +165,116 @@ class CatalogAPIView(APIView):
         q_serializer = self.query_serializer(data=data)
         if not q_serializer.is_valid():
             return Response(status=status.HTTP_400_BAD_REQUEST)
+        validated_data = q_serializer.validated_data
+
+        # Ключ страницы зависит от версий данных (их сбрасывают сигналы),
+        # поэтому он же - ETag: актуальной копии клиента отвечаем 304 без запросов к БД.
+        cache_key, last_modified = get_catalog_validators(validated_data)
+        return conditional_response(
+            request,
+            cache_key,
+            last_modified,
+            lambda: self.get_cached_response(validated_data, cache_key),
+            lambda: get_catalog_validators(validated_data)[0],
+        )
+
+    def get_cached_response(
+        self, validated_data: Dict[str, Any], cache_key: str
+    ) -> Response:
+        """
+        Получение страницы каталога: одинаковые запросы отдаём из кэша.
+
+        :param validated_data: Проверенные параметры запроса.
+        :param cache_key: Ключ страницы.
+        :return: Response.
+        """
+        if not get_catalog_cache_timeout():
+            return self.get_catalog_response(validated_data)
+        data = get_cached_catalog_page(cache_key)
+        if data is not None:
+            return Response(data=data)
+        response = self.get_catalog_response(validated_data)
+        if response.status_code == status.HTTP_200_OK:
+            set_cached_catalog_page(cache_key, response.data)
+        return response
+
+    def get_catalog_response(self, validated_data: Dict[str, Any]) -> Response:
+        """
+        Получение страницы каталога из БД.
+
+        :param validated_data: Проверенные параметры запроса.
+        :return: Response.
+        """
         # Получаем фильтры.
-        filter_params = get_catalog_filters(q_serializer.validated_data)
-
-        # Получаем сортировку.
-        sort = get_catalog_sort(q_serializer.validated_data)
-
-        # Если у продукта есть действующая акция,
-        # то final_price будет от акции, иначе от продукта,
-        # и всё это дело пропускаем через фильтр max_price и min_price плюс созданные фильтры выше.
-        products = (
-            self.queryset.annotate(
-                final_price=Case(
-                    # Если акция активна, используем цену со скидкой
-                    # (действующая акция может быть только одна).
-                    When(
-                        Q(sales__date_from__lte=timezone.now().date())
-                        & Q(sales__date_to__gte=timezone.now().date()),
-                        then=F("sales__sale_price"),
-                    ),
-                    # Иначе используем стандартную цену.
-                    default=F("price"),
-                    output_field=DecimalField(),
-                ),
-                # Добавим недостающие поля для продуктов (для сортировки).
-                reviews_count=Count("reviews"),
-                rating=Case(
-                    # Если отзывы есть, то считаем среднее значение рейтинга.
-                    When(reviews_count__gt=0, then=Avg("reviews__rate")),
-                    # Иначе 0.
-                    default=0,
-                    output_field=DecimalField(),
-                ),
-            )
-            .filter(
-                # Фильтруем по заданным параметрам.
-                Q(final_price__gte=q_serializer.validated_data["filter"]["minPrice"])
-                & Q(final_price__lte=q_serializer.validated_data["filter"]["maxPrice"])
-                & filter_params
+        filter_params = get_catalog_filters(validated_data)
+
+        # Получаем сортировку (rating, reviews_count и popularity - хранимые поля).
+        sort = get_catalog_sort(validated_data)
+
+        # Теги фильтруются через EXISTS, поэтому дублей строк нет и DISTINCT не нужен.
+        products = self.queryset.filter(filter_params)
+        if sort.lstrip("-") == "search_rank":
+            # Без строки поиска релевантность у всех продуктов одинаковая.
+            rank = get_search_rank(validated_data["filter"]["name"])
+            products = products.annotate(
+                search_rank=rank if rank is not None else Value(0.0, FloatField())
             )
-            .order_by(sort)
+
+        if "cursor" in validated_data:
+            return self.get_cursor_page(products, sort, validated_data)
+
+        # Карточки собираются из values() без моделей и вложенных сериализаторов.
+        paginator = Paginator(
+            get_product_card_rows(products).order_by(sort), validated_data["limit"]
         )
+        page_odj = paginator.get_page(validated_data["currentPage"])
 
-        paginator = Paginator(products, q_serializer.validated_data["limit"])
-        page_odj = paginator.get_page(q_serializer.validated_data["currentPage"])
+        return Response(
+            data={
+                "items": render_product_cards(page_odj.object_list),
+                "currentPage": page_odj.number,
+                "lastPage": paginator.num_pages,
+            }
+        )
+
+    def get_cursor_page(
+        self, products: QuerySet[Product], sort: str, validated_data: Dict[str, Any]
+    ) -> Response:
+        """
+        Курсорная (keyset) пагинация: без COUNT(*) и без OFFSET,
+        любая страница стоит столько же, сколько первая.
+        lastPage в этом режиме - оценка: следующая страница, если она есть.
 
-        return Response(data=self.catalog_serializer(page_odj).data)
+        :param products: Отфильтрованные продукты.
+        :param sort: Параметр сортировки.
+        :param validated_data: Проверенные параметры запроса.
+        :return: Response.
+        """
+        limit = validated_data["limit"]
+        if validated_data["cursor"]:
+            try:
+                products = products.filter(
+                    get_catalog_cursor_filter(validated_data["cursor"], sort)
+                )
+            except ValueError:
+                return Response(status=status.HTTP_400_BAD_REQUEST)
+        # Берём на один продукт больше, чтобы узнать, есть ли следующая страница.
+        # Ключ сортировки нужен курсору (search_rank - аннотация, его нет среди колонок).
+        extra_fields = [sort.lstrip("-")] if sort.lstrip("-") not in CARD_FIELDS else []
+        rows = list(
+            get_product_card_rows(products, *extra_fields).order_by(
+                *get_catalog_ordering(sort)
+            )[: limit + 1]
+        )
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        return Response(
+            data={
+                "items": render_product_cards(rows),
+                "currentPage": validated_data["currentPage"],
+                "lastPage": validated_data["currentPage"] + int(has_next),
+                "nextCursor": (
+                    encode_catalog_cursor(rows[-1], sort) if has_next else None
+                ),
+            }
+        )
@@ -1,10 +1,15 @@
+from functools import partial
 from typing import Any
 
+from django.http.response import HttpResponseBase
 from drf_spectacular.utils import extend_schema
-from product_app.models import Category
+from product_app.api_views.catalog.cache import get_versions_validators
+from product_app.api_views.catalog.category_tree import category_tree
+from product_app.models import CatalogVersion, Category
 from product_app.serializers.category import OutCategorySerializer
 from rest_framework.generics import ListAPIView
 from rest_framework.response import Response
+from utils import conditional_response
 
 
 class CategoryListAPIView(ListAPIView[Category]):
@@ -21,5 +26,35 @@ class CategoryListAPIView(ListAPIView[Category]):
         description="Получение списка категорий.",
         tags=("Catalog",),
     )
-    def get(self, *args: Any, **kwargs: Any) -> Response:
-        return super().get(*args, **kwargs)
+    def get(self, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        # Версия дерева читается из БД один раз: и для ETag, и для дерева.
+        version = CatalogVersion.get(CatalogVersion.CATEGORIES)
+        etag, last_modified = get_versions_validators([version], {}, "categories")
+        return conditional_response(
+            self.request,
+            etag,
+            last_modified,
+            partial(self.get_response, version),
+            self.get_etag,
+        )
+
+    @staticmethod
+    def get_etag() -> str:
+        """
+        ETag текущей версии дерева категорий.
+
+        :return: ETag.
+        """
+        version = CatalogVersion.get(CatalogVersion.CATEGORIES)
+        return get_versions_validators([version], {}, "categories")[0]
+
+    @staticmethod
+    def get_response(version: int) -> Response:
+        """
+        Получение дерева категорий из кэша процесса (без запросов к БД,
+        пока версия дерева не изменилась).
+
+        :param version: Версия дерева категорий (CatalogVersion).
+        :return: Response.
+        """
+        return Response(category_tree.get(version))
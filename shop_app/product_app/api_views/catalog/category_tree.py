@@ -0,0 +1,86 @@
+import json
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from django.db import DatabaseError
+from product_app.models import CatalogVersion, Category
+from product_app.serializers.category import OutCategorySerializer
+from rest_framework.renderers import JSONRenderer
+
+
+class CategoryTreeCache:
+    """
+    Дерево категорий, сериализованное в памяти текущего процесса.
+    Дерево меняется редко (через админку), поэтому хранится целиком вместе
+    с версией CatalogVersion.CATEGORIES из БД (общей для всех процессов).
+    Версию меняют сигналы Category/SubCategory в той же транзакции, что
+    и категории, поэтому каждый процесс перестроит дерево на первом же
+    запросе после фиксации изменения.
+    """
+
+    def __init__(self) -> None:
+        """
+        Пустой кэш.
+
+        :return: None.
+        """
+        self.version: Optional[int] = None
+        self.data: List[Dict[str, Any]] = []
+        self.lock = Lock()
+
+    @staticmethod
+    def build() -> List[Dict[str, Any]]:
+        """
+        Сериализация дерева категорий из БД в простые списки и словари
+        (без ссылок на сериализаторы и модели).
+
+        :return: Дерево категорий.
+        """
+        categories = Category.objects.prefetch_related("subcategories").all()
+        data = OutCategorySerializer(categories, many=True).data
+        tree: List[Dict[str, Any]] = json.loads(JSONRenderer().render(data))
+        return tree
+
+    def get(self, version: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Вернёт дерево категорий актуальной версии, при необходимости перестроит его.
+
+        :param version: Версия дерева (None - прочитать из БД).
+        :return: Дерево категорий.
+        """
+        if version is None:
+            version = CatalogVersion.get(CatalogVersion.CATEGORIES)
+        if self.version == version:
+            return self.data
+        with self.lock:
+            # Дерево могли перестроить, пока ждали блокировку.
+            if self.version != version:
+                self.data = self.build()
+                self.version = version
+            return self.data
+
+    def clear(self) -> None:
+        """
+        Очистит кэш процесса.
+
+        :return: None.
+        """
+        with self.lock:
+            self.version = None
+            self.data = []
+
+
+category_tree = CategoryTreeCache()
+
+
+def prewarm_category_tree() -> None:
+    """
+    Функция заполнит кэш дерева категорий процесса при старте (wsgi/asgi).
+    Если БД недоступна, дерево будет построено на первом запросе.
+
+    :return: None.
+    """
+    try:
+        category_tree.get()
+    except DatabaseError:
+        pass
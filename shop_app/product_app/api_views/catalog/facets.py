@@ -0,0 +1,256 @@
+import json
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from django.db import connection
+from django.db.models import BooleanField, ExpressionWrapper, Q, Value
+from django.http.response import HttpResponseBase
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from product_app.api_views.catalog.cache import (
+    get_cached_catalog_page,
+    get_catalog_cache_timeout,
+    get_catalog_validators,
+    set_cached_catalog_page,
+)
+from product_app.api_views.catalog.catalog import CATALOG_PARAMETERS
+from product_app.api_views.catalog.utils import get_catalog_filter_parts
+from product_app.models import Product, Tag
+from product_app.serializers.catalog import (
+    InCatalogSerializer,
+    OutCatalogFacetsSerializer,
+)
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from utils import conditional_response, parser_query_params
+
+# Параметры каталога, от которых фасеты не зависят (страница, сортировка).
+PAGE_PARAMS = ("currentPage", "sort", "sortType", "limit", "cursor")
+
+# Один запрос: CTE с продуктами (фильтры поиска/категории) и флагами остальных
+# фильтров, из которого считаются все фасеты. Каждый фасет считается
+# без собственного фильтра (так работают фильтры в боковой панели).
+FACETS_SQL = """
+WITH base AS ({base_sql}),
+stats AS (
+    SELECT
+        COUNT(*) FILTER (
+            WHERE free_delivery_ok AND available_ok AND price_ok AND tags_ok
+        ) AS total,
+        COUNT(*) FILTER (
+            WHERE free_delivery AND available_ok AND price_ok AND tags_ok
+        ) AS free_delivery,
+        COUNT(*) FILTER (
+            WHERE count > 0 AND free_delivery_ok AND price_ok AND tags_ok
+        ) AS available,
+        MIN(effective_price) FILTER (
+            WHERE free_delivery_ok AND available_ok AND tags_ok
+        ) AS lo,
+        MAX(effective_price) FILTER (
+            WHERE free_delivery_ok AND available_ok AND tags_ok
+        ) AS hi
+    FROM base
+)
+SELECT
+    stats.total,
+    stats.free_delivery,
+    stats.available,
+    stats.lo,
+    stats.hi,
+    (SELECT json_agg(json_build_array(tags.tag_id, tag.name, tags.n)) FROM (
+        SELECT pt.tag_id, COUNT(*) AS n
+        FROM base JOIN {product_tags_table} AS pt ON pt.product_id = base.id
+        WHERE free_delivery_ok AND available_ok AND price_ok
+        GROUP BY pt.tag_id
+    ) AS tags JOIN {tag_table} AS tag ON tag.id = tags.tag_id),
+    (SELECT json_agg(json_build_array(bucket, n)) FROM (
+        SELECT
+            CASE WHEN stats.hi = stats.lo THEN 1
+            ELSE LEAST(width_bucket(effective_price, stats.lo, stats.hi, %s), %s)
+            END AS bucket,
+            COUNT(*) AS n
+        FROM base
+        WHERE free_delivery_ok AND available_ok AND tags_ok
+        GROUP BY 1
+    ) AS histogram)
+FROM stats
+"""
+
+
+def as_flag(q: Q) -> ExpressionWrapper:
+    """
+    Функция превратит фильтр в логическую колонку (пустой фильтр - True).
+
+    :param q: Фильтр.
+    :return: Выражение.
+    """
+    return ExpressionWrapper(q if q else Value(True), output_field=BooleanField())
+
+
+def get_histogram(
+    lo: Optional[Decimal], hi: Optional[Decimal], counts: Dict[int, int], buckets: int
+) -> List[Dict[str, Any]]:
+    """
+    Функция соберёт гистограмму цен: равные интервалы от lo до hi.
+
+    :param lo: Минимальная цена.
+    :param hi: Максимальная цена.
+    :param counts: Количество продуктов по номерам интервалов (с 1).
+    :param buckets: Количество интервалов.
+    :return: Список интервалов.
+    """
+    if lo is None or hi is None:
+        return []
+    if lo == hi:
+        return [{"min": lo, "max": hi, "count": counts.get(1, 0)}]
+    step = (hi - lo) / buckets
+    return [
+        {
+            "min": round(lo + step * i, 2),
+            "max": round(lo + step * (i + 1), 2) if i + 1 < buckets else hi,
+            "count": counts.get(i + 1, 0),
+        }
+        for i in range(buckets)
+    ]
+
+
+def get_catalog_facets(
+    validated_data: Dict[str, Any], buckets: int = 10
+) -> Dict[str, Any]:
+    """
+    Функция посчитает фасеты каталога одним запросом к БД.
+
+    :param validated_data: Проверенные параметры каталога (InCatalogSerializer).
+    :param buckets: Количество интервалов гистограммы цен.
+    :return: Фасеты.
+    """
+    parts = get_catalog_filter_parts(validated_data)
+    base = (
+        Product.objects.filter(parts["common"])
+        .annotate(
+            free_delivery_ok=as_flag(parts["freeDelivery"]),
+            available_ok=as_flag(parts["available"]),
+            price_ok=as_flag(parts["price"]),
+            tags_ok=as_flag(parts["tags"]),
+        )
+        .values(
+            "id",
+            "effective_price",
+            "free_delivery",
+            "count",
+            "free_delivery_ok",
+            "available_ok",
+            "price_ok",
+            "tags_ok",
+        )
+    )
+    base_sql, base_params = base.query.sql_with_params()
+    sql = FACETS_SQL.format(
+        base_sql=base_sql,
+        product_tags_table=connection.ops.quote_name(
+            Product.tags.through._meta.db_table
+        ),
+        tag_table=connection.ops.quote_name(Tag._meta.db_table),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (*base_params, buckets, buckets))
+        total, free_delivery, available, lo, hi, tags, histogram = cursor.fetchone()
+
+    tag_rows = json.loads(tags) if isinstance(tags, str) else tags or []
+    hist_counts = dict(
+        json.loads(histogram) if isinstance(histogram, str) else histogram or []
+    )
+    return {
+        "total": total,
+        "freeDelivery": free_delivery,
+        "available": available,
+        "minPrice": lo,
+        "maxPrice": hi,
+        "tags": sorted(
+            ({"id": pk, "name": name, "count": count} for pk, name, count in tag_rows),
+            key=lambda tag: (-tag["count"], tag["id"]),
+        ),
+        "histogram": get_histogram(lo, hi, hist_counts, buckets),
+    }
+
+
+class CatalogFacetsAPIView(APIView):
+    """
+    Класс APIView для фасетов каталога (боковая панель фильтров).
+    """
+
+    query_serializer = InCatalogSerializer
+    facets_serializer = OutCatalogFacetsSerializer
+    histogram_buckets = 10
+
+    @extend_schema(
+        request=None,
+        responses={
+            200: OutCatalogFacetsSerializer,
+            400: OpenApiResponse(description="Неверный запрос."),
+        },
+        description=(
+            "Фасеты каталога для текущего фильтра: количество продуктов по тегам, "
+            "с бесплатной доставкой, в наличии, диапазон и гистограмма цен. "
+            "Каждый фасет считается без собственного фильтра. "
+            "Параметры - как у /api/catalog (страница и сортировка не учитываются)."
+        ),
+        tags=("Catalog",),
+        parameters=CATALOG_PARAMETERS,
+    )
+    def get(self, request: Request) -> HttpResponseBase:
+        """
+        Получение фасетов каталога.
+
+        :param request: Request.
+        :return: Response.
+        """
+        data = parser_query_params(request.GET)
+        q_serializer = self.query_serializer(data=data)
+        if not q_serializer.is_valid():
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        validated_data = {
+            key: value
+            for key, value in q_serializer.validated_data.items()
+            if key not in PAGE_PARAMS
+        }
+
+        # Фасеты кэшируются вместе со страницами каталога (те же версии),
+        # ключ кэша - он же ETag.
+        cache_key, last_modified = get_catalog_validators(validated_data, kind="facets")
+        return conditional_response(
+            request,
+            cache_key,
+            last_modified,
+            lambda: self.get_cached_response(validated_data, cache_key),
+            lambda: get_catalog_validators(validated_data, kind="facets")[0],
+        )
+
+    def get_cached_response(
+        self, validated_data: Dict[str, Any], cache_key: str
+    ) -> Response:
+        """
+        Получение фасетов: одинаковые запросы отдаём из кэша.
+
+        :param validated_data: Проверенные параметры каталога.
+        :param cache_key: Ключ фасетов.
+        :return: Response.
+        """
+        if not get_catalog_cache_timeout():
+            return Response(data=self.get_facets_data(validated_data))
+        facets = get_cached_catalog_page(cache_key)
+        if facets is None:
+            facets = self.get_facets_data(validated_data)
+            set_cached_catalog_page(cache_key, facets)
+        return Response(data=facets)
+
+    def get_facets_data(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Подсчёт и сериализация фасетов.
+
+        :param validated_data: Проверенные параметры каталога.
+        :return: Данные ответа.
+        """
+        facets = get_catalog_facets(validated_data, self.histogram_buckets)
+        return self.facets_serializer(facets).data
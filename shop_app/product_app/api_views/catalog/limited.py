@@ -1,10 +1,16 @@
+from functools import partial
+
 from django.db.models import Q
+from django.http.response import HttpResponseBase
 from drf_spectacular.utils import extend_schema
+from product_app.api_views.catalog.cache import GLOBAL_VERSION_KEY, get_validators
+from product_app.api_views.catalog.cards import get_product_cards
 from product_app.models import Product
 from product_app.serializers.product import OutCatalogProductSerializer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from utils import conditional_response
 
 
 class CatalogLimitedAPIView(APIView):
@@ -12,10 +18,7 @@ class CatalogLimitedAPIView(APIView):
     Класс APIView для продуктов, которые заканчиваются.
     """
 
-    queryset = Product.objects.select_related("category").prefetch_related(
-        "tags", "images", "reviews", "sales"
-    )
-    product_serializer = OutCatalogProductSerializer
+    queryset = Product.objects.all()
     limit = 4
     count = 10
 
@@ -25,14 +28,28 @@ class CatalogLimitedAPIView(APIView):
         description=f"Получение продуктов, которые заканчиваются. (топ {limit})",
         tags=("Catalog",),
     )
-    def get(self, request: Request) -> Response:
+    def get(self, request: Request) -> HttpResponseBase:
         """
         Получение продуктов, которые заканчиваются. (топ 4)
 
         :param request: Request.
         :return: Response.
         """
-        products = self.queryset.filter(Q(count__lte=self.count) & Q(archived=False))[
-            : self.limit
-        ]
-        return Response(self.product_serializer(products, many=True).data)
+        # Список меняется только вместе с версией всего каталога.
+        validators = partial(get_validators, [GLOBAL_VERSION_KEY], {}, "limited")
+        etag, last_modified = validators()
+        return conditional_response(
+            request, etag, last_modified, self.get_response, lambda: validators()[0]
+        )
+
+    def get_response(self) -> Response:
+        """
+        Получение продуктов, которые заканчиваются, из БД.
+
+        :return: Response.
+        """
+        # Сначала те, которых осталось меньше всего (частичный индекс product_low_stock_idx).
+        products = self.queryset.filter(
+            Q(count__lte=self.count) & Q(archived=False)
+        ).order_by("count", "pk")[: self.limit]
+        return Response(get_product_cards(products))
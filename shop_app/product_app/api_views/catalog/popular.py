@@ -1,10 +1,15 @@
-from django.db.models import Avg, Case, Count, DecimalField, When
+from functools import partial
+
+from django.http.response import HttpResponseBase
 from drf_spectacular.utils import extend_schema
+from product_app.api_views.catalog.cache import GLOBAL_VERSION_KEY, get_validators
+from product_app.api_views.catalog.cards import get_product_cards
 from product_app.models import Product
 from product_app.serializers.product import OutCatalogProductSerializer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from utils import conditional_response
 
 
 class CatalogPopularAPIView(APIView):
@@ -12,10 +17,7 @@ class CatalogPopularAPIView(APIView):
     Класс APIView для самых (топ 4) популярных продуктов во всём каталоге.
     """
 
-    queryset = Product.objects.select_related("category").prefetch_related(
-        "tags", "images", "reviews", "sales"
-    )
-    product_serializer = OutCatalogProductSerializer
+    queryset = Product.objects.all()
     limit = 4
 
     @extend_schema(
@@ -24,7 +26,7 @@ class CatalogPopularAPIView(APIView):
         description=f"Получение топ {limit} популярных продуктов во всём каталоге.",
         tags=("Catalog",),
     )
-    def get(self, request: Request) -> Response:
+    def get(self, request: Request) -> HttpResponseBase:
         """
         Получение топ 4 популярных продуктов во всём каталоге.
 
@@ -32,18 +34,22 @@ class CatalogPopularAPIView(APIView):
         :return: Response.
         """
 
-        products = (
-            self.queryset.annotate(
-                reviews_count=Count("reviews"),
-                rating=Case(
-                    # Если отзывы есть, то считаем среднее значение рейтинга.
-                    When(reviews_count__gt=0, then=Avg("reviews__rate")),
-                    # Иначе 0.
-                    default=0,
-                    output_field=DecimalField(),
-                ),
-            )
-            .filter(archived=False)
-            .order_by("-rating")[: self.limit]
+        # Список меняется только вместе с версией всего каталога.
+        validators = partial(get_validators, [GLOBAL_VERSION_KEY], {}, "popular")
+        etag, last_modified = validators()
+        return conditional_response(
+            request, etag, last_modified, self.get_response, lambda: validators()[0]
         )
-        return Response(self.product_serializer(products, many=True).data)
+
+    def get_response(self) -> Response:
+        """
+        Получение топ 4 популярных продуктов из БД.
+
+        :return: Response.
+        """
+        # popularity - хранимое поле продукта (покупки и отзывы с затуханием),
+        # запрос - чтение первых строк индекса product_live_popularity_idx.
+        products = self.queryset.filter(archived=False).order_by("-popularity")[
+            : self.limit
+        ]
+        return Response(get_product_cards(products))
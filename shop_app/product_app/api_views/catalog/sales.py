@@ -1,8 +1,15 @@
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+from functools import partial
+
 from django.core.paginator import Paginator
 from django.db.models import Q
+from django.http.response import HttpResponseBase
 from django.utils import timezone
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from product_app.api_views.catalog.cache import GLOBAL_VERSION_KEY, get_validators
 from product_app.models import Sale
+from product_app.models.sale import sale_period
 from product_app.serializers.catalog import (
     InCurrentPageSerializer,
     OutCatalogSalesSerializer,
@@ -11,6 +18,7 @@ from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from utils import conditional_response
 
 
 class CatalogSalesAPIView(APIView):
@@ -42,7 +50,7 @@ class CatalogSalesAPIView(APIView):
         description="Получение списка продуктов с действующей акцией.",
         tags=("Catalog",),
     )
-    def get(self, request: Request) -> Response:
+    def get(self, request: Request) -> HttpResponseBase:
         """
         Получение списка продуктов с действующей акцией.
 
@@ -52,13 +60,42 @@ class CatalogSalesAPIView(APIView):
         current_page_serializer = InCurrentPageSerializer(data=request.GET)
         if not current_page_serializer.is_valid():
             return Response(status=status.HTTP_400_BAD_REQUEST)
-        sales = self.queryset.filter(
-            Q(date_from__lte=timezone.now().date())
-            & Q(date_to__gte=timezone.now().date())
-            & Q(product__archived=False)
-        ).order_by("date_to")
-        paginator = Paginator(sales, self.limit_on_page)
-        page_odj = paginator.get_page(
-            current_page_serializer.validated_data["currentPage"]
+        current_page = current_page_serializer.validated_data["currentPage"]
+
+        # Акции начинаются и заканчиваются по датам (UTC, как в Product.sync_sales):
+        # дата входит в ETag, а Last-Modified - не раньше начала текущих суток.
+        today = timezone.now().date()
+        validators = partial(
+            get_validators,
+            [GLOBAL_VERSION_KEY],
+            {"currentPage": current_page, "date": today},
+            "sales",
         )
+        etag, last_modified = validators()
+        start_of_day = datetime.combine(
+            today, datetime.min.time(), tzinfo=dt_timezone.utc
+        ).timestamp()
+        return conditional_response(
+            request,
+            etag,
+            max(last_modified, start_of_day),
+            lambda: self.get_response(current_page, today),
+            lambda: validators()[0],
+        )
+
+    def get_response(self, current_page: int, today: date) -> Response:
+        """
+        Получение страницы продуктов с действующей акцией из БД.
+
+        :param current_page: Номер страницы.
+        :param today: Текущая дата.
+        :return: Response.
+        """
+        sales = (
+            self.queryset.alias(period=sale_period())
+            .filter(Q(period__contains=today) & Q(product__archived=False))
+            .order_by("date_to")
+        )
+        paginator = Paginator(sales, self.limit_on_page)
+        page_odj = paginator.get_page(current_page)
         return Response(self.catalog_serializer(page_odj).data)
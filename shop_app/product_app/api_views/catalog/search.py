@@ -0,0 +1,95 @@
+import re
+from functools import lru_cache
+from typing import List, Optional
+
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast, Upper
+from product_app.models.product import SEARCH_CONFIG
+
+# Термы короче этой длины в нечёткий поиск не попадают: у них нет полной
+# триграммы, и триграммный индекс их не обслуживает (их покрывает префикс tsquery).
+MIN_TRIGRAM_TERM_LENGTH = 3
+
+
+def get_search_terms(name: str) -> List[str]:
+    """
+    Функция разобьёт строку поиска на слова.
+    Всё, кроме букв и цифр, отбрасывается, поэтому спецсимволы tsquery в запрос не попадут.
+
+    :param name: Строка поиска.
+    :return: Список слов.
+    """
+    return re.findall(r"\w+", name.lower())
+
+
+def get_search_query(name: str) -> Optional[SearchQuery]:
+    """
+    Функция создаст полнотекстовый запрос: все слова, каждое как префикс
+    (например, 'nok lum' найдёт 'Nokia Lumia').
+
+    :param name: Строка поиска.
+    :return: SearchQuery или None, если искать нечего.
+    """
+    terms = get_search_terms(name)
+    if not terms:
+        return None
+    raw_query = " & ".join(f"{term}:*" for term in terms)
+    return SearchQuery(raw_query, search_type="raw", config=SEARCH_CONFIG)
+
+
+@lru_cache(maxsize=1)
+def trigram_available() -> bool:
+    """
+    Функция проверит, установлено ли расширение pg_trgm (результат кэшируется на процесс).
+
+    :return: True, если расширение установлено.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def get_search_filter(name: str) -> Q:
+    """
+    Функция создаст фильтр поиска продуктов по названию и описанию.
+    Основной поиск - полнотекстовый по хранимому search_vector (GIN индекс).
+    Если установлен pg_trgm, добавляется нечёткий поиск по названию для слов
+    с опечатками: каждое слово не короче MIN_TRIGRAM_TERM_LENGTH должно быть
+    похоже на слово названия (word_similarity, оператор %>, триграммный
+    GIN индекс по UPPER(title)).
+
+    :param name: Строка поиска.
+    :return: Фильтр.
+    """
+    query = get_search_query(name)
+    if query is None:
+        return Q()
+    search_filter = Q(search_vector=query)
+    terms = [
+        term for term in get_search_terms(name) if len(term) >= MIN_TRIGRAM_TERM_LENGTH
+    ]
+    if terms and trigram_available():
+        similar = Q()
+        for term in terms:
+            similar &= Q(TrigramWordSimilar(Upper("title"), term.upper()))
+        search_filter |= similar
+    return search_filter
+
+
+def get_search_rank(name: str) -> Optional[Cast]:
+    """
+    Функция создаст выражение релевантности продукта строке поиска.
+    ts_rank возвращает real (float4), а значение из курсора приходит как
+    double precision и с real не совпадает, поэтому ранг сразу приводится
+    к double precision: значение точно переживает путь через курсор.
+
+    :param name: Строка поиска.
+    :return: Релевантность или None, если искать нечего.
+    """
+    query = get_search_query(name)
+    if query is None:
+        return None
+    return Cast(SearchRank(F("search_vector"), query), FloatField())
@@ -1,38 +1,92 @@
-from typing import Any, Dict
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Tuple
 
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
+from product_app.api_views.catalog.search import get_search_filter
+from product_app.models import Product
 
 
-def get_catalog_filters(data: Dict[str, Any]) -> Q:
+def get_catalog_filter_parts(data: Dict[str, Any]) -> Dict[str, Q]:
     """
-    Функция создаст фильтр на основе переданных данных.
+    Функция создаст фильтры каталога по отдельности (нужно для фасетов,
+    где каждый фасет считается без собственного фильтра).
+
+    **common** - Поиск, категория и не архивированные продукты. \n
+    **freeDelivery** - Бесплатная доставка. \n
+    **available** - Наличие. \n
+    **price** - Диапазон актуальной цены. \n
+    **tags** - Теги (пустой фильтр, если теги не выбраны).
 
     :param data: Данные.
-    :return: Фильтр.
+    :return: Словарь фильтров.
     """
     filter_data = data["filter"]
-    # Создаём простые фильтры.
-    filter_params = Q(title__icontains=filter_data["name"])
-    filter_params &= Q(free_delivery=filter_data["freeDelivery"])
-    filter_params &= Q(count__gt=0) if filter_data["available"] else Q(count=0)
+    # Полнотекстовый поиск по названию и описанию.
+    common = get_search_filter(filter_data["name"])
     # А также учитываем категорию и не архивированные продукты.
     if data.get("category"):
-        filter_params &= Q(category__id=data["category"])
-    filter_params &= Q(archived=False)
+        common &= Q(category_id=data["category"])
+    common &= Q(archived=False)
     # Если есть tags, то их тоже учитываем.
     tags_list = data.get("tags")
-    if tags_list:
-        filter_params &= Q(tags__pk__in=tags_list)
+    return {
+        "common": common,
+        "freeDelivery": Q(free_delivery=filter_data["freeDelivery"]),
+        "available": Q(count__gt=0) if filter_data["available"] else Q(count=0),
+        # effective_price - хранимая актуальная цена (с учётом действующей акции).
+        "price": Q(effective_price__gte=filter_data["minPrice"])
+        & Q(effective_price__lte=filter_data["maxPrice"]),
+        "tags": (
+            get_tags_filter(tags_list, data.get("tagsMode", "any"))
+            if tags_list
+            else Q()
+        ),
+    }
+
 
+def get_catalog_filters(data: Dict[str, Any]) -> Q:
+    """
+    Функция создаст фильтр на основе переданных данных.
+
+    :param data: Данные.
+    :return: Фильтр.
+    """
+    filter_params = Q()
+    for part in get_catalog_filter_parts(data).values():
+        filter_params &= part
     return filter_params
 
 
+def get_tags_filter(tags_list: List[int], mode: str) -> Q:
+    """
+    Функция создаст фильтр по тегам в виде EXISTS (полусоединение):
+    в отличие от JOIN с product_tags, строки продуктов не размножаются
+    и DISTINCT не нужен.
+
+    :param tags_list: Список id тегов.
+    :param mode: 'any' - есть хотя бы один из тегов, 'all' - есть все теги.
+    :return: Фильтр.
+    """
+    product_tags = Product.tags.through.objects.filter(product_id=OuterRef("pk"))
+    if mode == "all":
+        filter_params = Q()
+        for tag_id in sorted(set(tags_list)):
+            filter_params &= Exists(product_tags.filter(tag_id=tag_id))
+        return filter_params
+    return Q(Exists(product_tags.filter(tag_id__in=tags_list)))
+
+
 def get_catalog_sort(data: Dict[str, Any]) -> str:
     """
     Функция создаст параметр сортировки на основе переданных данных с некоторой заменой.
-    Вместо 'price' будет 'final_price'.
+    Вместо 'price' будет 'effective_price'.
     Вместо 'reviews' будет 'reviews_count'.
     Вместо 'date' будет 'created_at'.
+    Вместо 'relevance' будет 'search_rank' (аннотация, см. CatalogAPIView).
 
     :param data: Данные.
     :return: Параметр сортировки.
@@ -41,14 +95,92 @@ def get_catalog_sort(data: Dict[str, Any]) -> str:
     # Переопределяем названия сортировки,
     # так как эти названия пересекаются с полями продукта или вовсе отсутствуют,
     # например reviews в продукте - это связанная сущность, а не количество отзывов,
-    # а price у нас, после применения аннотации, будет final_price...
+    # а price у нас - это хранимая актуальная цена effective_price...
     if data["sort"] == "price":
-        pre_sort = "final_price"
+        pre_sort = "effective_price"
     elif data["sort"] == "reviews":
         pre_sort = "reviews_count"
     elif data["sort"] == "date":
         pre_sort = "created_at"
+    elif data["sort"] == "relevance":
+        pre_sort = "search_rank"
     else:
         pre_sort = data["sort"]
     # Определяем тип сортировки (убывание/возрастание) и возвращаем.
     return f"-{pre_sort}" if data["sortType"] == "inc" else pre_sort
+
+
+# Типы значений ключа сортировки, которые можно восстановить из курсора.
+CURSOR_SORT_FIELDS: Dict[str, Callable[[str], Any]] = {
+    "effective_price": Decimal,
+    "rating": Decimal,
+    "reviews_count": int,
+    "created_at": datetime.fromisoformat,
+    "search_rank": float,
+    "popularity": float,
+}
+
+
+def get_catalog_ordering(sort: str) -> Tuple[str, str]:
+    """
+    Функция дополнит сортировку каталога сортировкой по pk в том же направлении,
+    чтобы порядок был однозначным (необходимо для курсора).
+
+    :param sort: Параметр сортировки (результат get_catalog_sort).
+    :return: Сортировка по полю и сортировка по pk.
+    """
+    return sort, "-pk" if sort.startswith("-") else "pk"
+
+
+def encode_catalog_cursor(row: Dict[str, Any], sort: str) -> str:
+    """
+    Функция создаст непрозрачный курсор: значение ключа сортировки и pk продукта.
+
+    :param row: Строка (values()) последнего продукта страницы.
+    :param sort: Параметр сортировки.
+    :return: Курсор.
+    """
+    value = row[sort.lstrip("-")]
+    payload = {
+        "s": sort,
+        "k": value.isoformat() if isinstance(value, datetime) else str(value),
+        "id": row["id"],
+    }
+    return urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_catalog_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """
+    Функция разберёт курсор. Курсор должен быть создан для той же сортировки.
+
+    :param cursor: Курсор.
+    :param sort: Параметр сортировки.
+    :return: Значение ключа сортировки и pk продукта.
+    :raises ValueError: Если курсор повреждён или создан для другой сортировки.
+    """
+    try:
+        payload = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["s"] != sort:
+            raise ValueError("Курсор создан для другой сортировки.")
+        value = CURSOR_SORT_FIELDS[sort.lstrip("-")](payload["k"])
+        return value, int(payload["id"])
+    except (KeyError, TypeError, ArithmeticError, binascii.Error) as exc:
+        raise ValueError("Неверный курсор.") from exc
+
+
+def get_catalog_cursor_filter(cursor: str, sort: str) -> Q:
+    """
+    Функция создаст фильтр для keyset-пагинации: продукты строго после курсора
+    в порядке (ключ сортировки, pk).
+
+    :param cursor: Курсор.
+    :param sort: Параметр сортировки.
+    :return: Фильтр.
+    :raises ValueError: Если курсор неверный.
+    """
+    value, pk = decode_catalog_cursor(cursor, sort)
+    field = sort.lstrip("-")
+    lookup = "lt" if sort.startswith("-") else "gt"
+    return Q(**{f"{field}__{lookup}": value}) | (
+        Q(**{field: value}) & Q(**{f"pk__{lookup}": pk})
+    )
@@ -1,11 +1,15 @@
+from functools import partial
+
+from django.http.response import HttpResponseBase
 from drf_spectacular.utils import OpenApiResponse, extend_schema
+from product_app.api_views.catalog.cache import get_validators, product_version_key
 from product_app.models import Product
 from product_app.serializers.product import OutProductSerializer
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from utils import get_or_none
+from utils import conditional_response, get_or_none
 
 
 class ProductView(APIView):
@@ -14,7 +18,7 @@ class ProductView(APIView):
     """
 
     queryset = Product.objects.select_related("category").prefetch_related(
-        "tags", "images", "reviews", "sales"
+        "tags", "images", "reviews", "specifications"
     )
     product_serializer = OutProductSerializer
 
@@ -27,11 +31,34 @@ class ProductView(APIView):
         description="Получение подробной информации о продукте.",
         tags=("Product",),
     )
-    def get(self, request: Request, product_id: int) -> Response:
+    def get(self, request: Request, product_id: int) -> HttpResponseBase:
         """
         Получение подробной информации о продукте.
 
         :param request: Request.
+        :param product_id: ID продукта.
+        :return: Response.
+        """
+        # Версию продукта меняют сигналы (продукт, отзывы, акции, изображения, ...).
+        validators = partial(
+            get_validators,
+            [product_version_key(product_id)],
+            {"id": product_id},
+            "product",
+        )
+        etag, last_modified = validators()
+        return conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: self.get_response(product_id),
+            lambda: validators()[0],
+        )
+
+    def get_response(self, product_id: int) -> Response:
+        """
+        Получение подробной информации о продукте из БД.
+
         :param product_id: ID продукта.
         :return: Response.
         """
@@ -1,12 +1,17 @@
-from django.db.models import Count
+from functools import partial
+from typing import Iterable, Optional
+
+from django.http.response import HttpResponseBase
 from drf_spectacular.utils import OpenApiParameter, extend_schema
-from product_app.models import Tag
+from product_app.api_views.catalog.cache import GLOBAL_VERSION_KEY, get_validators
+from product_app.models import SubCategoryTagCount, Tag
 from product_app.serializers.category import InCategoryIDSerializer
 from product_app.serializers.tag import OutTagSerializer
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from utils import conditional_response
 
 
 class TagAPIView(APIView):
@@ -14,7 +19,8 @@ class TagAPIView(APIView):
     Класс APIView для тегов.
     """
 
-    queryset = Tag.objects.prefetch_related("products")
+    queryset = Tag.objects.all()
+    limit = 10
     tag_serializer = OutTagSerializer
     id_category_serializer = InCategoryIDSerializer
 
@@ -32,7 +38,7 @@ class TagAPIView(APIView):
             ),
         ],
     )
-    def get(self, request: Request) -> Response:
+    def get(self, request: Request) -> HttpResponseBase:
         """
         Получение первых популярных тегов категории.
 
@@ -48,16 +54,41 @@ class TagAPIView(APIView):
             if not id_serializer.is_valid():
                 return Response(status=status.HTTP_400_BAD_REQUEST)
 
-            tags = (
-                self.queryset.filter(products__category_id=category_id)
-                .annotate(products_count=Count("products"))
-                .order_by("-products_count")[:10]
-            )
+        # Теги и их продукты меняются только вместе с версией всего каталога.
+        validators = partial(
+            get_validators, [GLOBAL_VERSION_KEY], {"category": category_id}, "tags"
+        )
+        etag, last_modified = validators()
+        return conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: self.get_response(category_id),
+            lambda: validators()[0],
+        )
+
+    def get_response(self, category_id: Optional[str]) -> Response:
+        """
+        Получение первых популярных тегов категории из БД.
+
+        :param category_id: ID подкатегории.
+        :return: Response.
+        """
+        # Количество продуктов хранится (SubCategoryTagCount и Tag.products_count),
+        # запрос - чтение первых строк индекса без соединения с продуктами.
+        tags: Iterable[Tag]
+        if category_id:
+            tags = [
+                count.tag
+                for count in SubCategoryTagCount.objects.filter(
+                    subcategory_id=category_id, products_count__gt=0
+                )
+                .select_related("tag")
+                .order_by("-products_count", "tag_id")[: self.limit]
+            ]
         else:
-            tags = (
-                self.queryset.all()
-                .annotate(products_count=Count("products"))
-                .order_by("-products_count")[:10]
-            )
+            tags = self.queryset.filter(products_count__gt=0).order_by(
+                "-products_count", "pk"
+            )[: self.limit]
         serializer = self.tag_serializer(tags, many=True)
         return Response(serializer.data)
@@ -0,0 +1,63 @@
+from functools import partial
+from typing import Mapping
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from product_app.api_views.catalog.cache import invalidate_catalog_for_products
+from product_app.models import Product
+
+
+def reserve_stock(product_id: int, count: int) -> bool:
+    """
+    Функция спишет count единиц продукта одним условным UPDATE
+    (count = count - n WHERE id = ... AND count >= n): без блокировки строки
+    на время запроса и без перезаписи остальных полей продукта.
+    Кэш каталога с продуктом сбрасывается после фиксации транзакции: строки
+    версий каталога не блокируются на всё время транзакции корзины.
+
+    :param product_id: ID продукта.
+    :param count: Количество.
+    :return: True, если единицы списаны; False, если продукта нет
+        или его не хватает.
+    """
+    reserved = Product.objects.filter(pk=product_id, count__gte=count).update(
+        count=F("count") - count
+    )
+    if not reserved:
+        return False
+    transaction.on_commit(partial(invalidate_catalog_for_products, [product_id]))
+    return True
+
+
+def release_stock(counts: Mapping[int, int]) -> None:
+    """
+    Функция вернёт продуктам единицы одним UPDATE (adjust_stock).
+
+    :param counts: Количество возвращаемых единиц по ID продуктов.
+    :return: None.
+    """
+    adjust_stock(counts)
+
+
+def adjust_stock(counts: Mapping[int, int]) -> None:
+    """
+    Функция изменит количество единиц продуктов одним UPDATE
+    (count = count + CASE ...). Отрицательное значение списывает единицы -
+    наличие проверяет вызывающий код (под блокировкой строк продуктов).
+    Кэш каталога с продуктами сбрасывается после фиксации транзакции.
+
+    :param counts: Изменение количества по ID продуктов.
+    :return: None.
+    """
+    counts = {pk: count for pk, count in counts.items() if count}
+    if not counts:
+        return
+    Product.objects.filter(pk__in=counts).update(
+        count=F("count")
+        + Case(
+            *(When(pk=pk, then=Value(count)) for pk, count in counts.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    transaction.on_commit(partial(invalidate_catalog_for_products, list(counts)))
@@ -0,0 +1,195 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from django.db import transaction
+from django.db.models import QuerySet
+from product_app.models import (
+    Category,
+    Product,
+    Sale,
+    SubCategory,
+    SubCategoryTagCount,
+    Tag,
+)
+
+
+class Rollback(Exception):
+    """
+    Исключение для отката транзакции бенчмарка.
+    """
+
+
+@contextmanager
+def rolled_back() -> Iterator[None]:
+    """
+    Контекстный менеджер: всё, что создано внутри, будет откачено.
+    Бенчмарки не оставляют данных в БД.
+
+    :return: Iterator[None].
+    """
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def seed_catalog(
+    products: int,
+    tags: int,
+    subcategories: int = 10,
+    sales_share: float = 0,
+    seed: float = 0.5,
+) -> Dict[str, List[int]]:
+    """
+    Функция быстро (INSERT ... SELECT generate_series, без сигналов) заполнит
+    каталог для бенчмарков. Каждому продукту достаётся от 1 до 3 случайных тегов.
+    Акции (если нужны) - на 1-30 дней в пределах года до и после текущей даты,
+    поля действующей акции продуктов не заполняются. Счётчики SubCategoryTagCount
+    пересчитываются, статистика таблиц собирается (ANALYZE).
+
+    :param products: Количество продуктов.
+    :param tags: Количество тегов.
+    :param subcategories: Количество подкатегорий.
+    :param sales_share: Доля продуктов с акцией.
+    :param seed: Зерно генератора случайных чисел PostgreSQL (от -1 до 1).
+    :return: {"subcategories": [...], "tags": [...], "products": [...]} - id.
+    """
+    category = Category.objects.create(name="bench")
+    subcategory_ids = [
+        subcategory.pk
+        for subcategory in SubCategory.objects.bulk_create(
+            SubCategory(name=f"bench {i}", category=category)
+            for i in range(subcategories)
+        )
+    ]
+    tag_ids = [
+        tag.pk
+        for tag in Tag.objects.bulk_create(Tag(name=f"bench {i}") for i in range(tags))
+    ]
+    product_table = Product._meta.db_table
+    product_tags_table = Product.tags.through._meta.db_table
+    sale_table = Sale._meta.db_table
+    with transaction.get_connection().cursor() as cursor:
+        cursor.execute("SELECT setseed(%s)", [seed])
+        cursor.execute(
+            f"""
+            INSERT INTO {product_table} (
+                category_id, title, description, full_description, price, count,
+                created_at, updated_at, free_delivery, archived,
+                reviews_count, rate_sum, rating, popularity
+            )
+            SELECT
+                (%s::bigint[])[1 + floor(random() * %s)::int],
+                'Product ' || i, 'Description ' || i, 'Full description ' || i,
+                round((1 + random() * 999)::numeric, 2),
+                floor(random() * 200)::int,
+                now() - random() * interval '365 days', now(),
+                random() < 0.3, false, 0, 0, 0, random() * 100
+            FROM generate_series(1, %s) AS i
+            RETURNING id
+            """,
+            [subcategory_ids, len(subcategory_ids), products],
+        )
+        product_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            f"""
+            INSERT INTO {product_tags_table} (product_id, tag_id)
+            SELECT DISTINCT p.id, (%s::bigint[])[1 + floor(random() * %s)::int]
+            FROM unnest(%s::bigint[]) AS p(id),
+                generate_series(1, 1 + floor(random() * 3)::int)
+            """,
+            [tag_ids, len(tag_ids), product_ids],
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {sale_table} (
+                product_id, date_from, date_to, price, sale_price, created_at
+            )
+            SELECT id, date_from, date_from + floor(random() * 30)::int, 1000, 500, now()
+            FROM (
+                SELECT p.id, CURRENT_DATE - 365 + floor(random() * 730)::int AS date_from
+                FROM unnest(%s::bigint[]) AS p(id)
+                WHERE random() < %s
+            ) AS s
+            """,
+            [product_ids, sales_share],
+        )
+        cursor.execute(f"ANALYZE {product_table}, {product_tags_table}, {sale_table}")
+    SubCategoryTagCount.refresh(subcategory_ids, None)
+    with transaction.get_connection().cursor() as cursor:
+        cursor.execute(f"ANALYZE {SubCategoryTagCount._meta.db_table}")
+    return {
+        "subcategories": subcategory_ids,
+        "tags": tag_ids,
+        "products": product_ids,
+    }
+
+
+def get_plan(queryset: QuerySet[Any]) -> Dict[str, Any]:
+    """
+    Функция выполнит EXPLAIN ANALYZE запроса и вернёт план (JSON формат PostgreSQL).
+
+    :param queryset: QuerySet.
+    :return: План запроса.
+    """
+    return json.loads(queryset.explain(format="json", analyze=True))[0]
+
+
+def get_count_plan(queryset: QuerySet[Any]) -> Dict[str, Any]:
+    """
+    Функция выполнит EXPLAIN ANALYZE подсчёта строк запроса (как Paginator.count).
+
+    :param queryset: QuerySet.
+    :return: План запроса.
+    """
+    sql, params = queryset.values("pk").query.sql_with_params()
+    with transaction.get_connection().cursor() as cursor:
+        cursor.execute(
+            f"EXPLAIN (ANALYZE, FORMAT JSON) SELECT COUNT(*) FROM ({sql}) AS sub",
+            params,
+        )
+        plan = cursor.fetchone()[0]
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+
+def count_plan_nodes(plan: Dict[str, Any]) -> int:
+    """
+    Функция посчитает количество узлов плана.
+
+    :param plan: Узел плана.
+    :return: Количество узлов.
+    """
+    return 1 + sum(count_plan_nodes(node) for node in plan.get("Plans", []))
+
+
+def get_plan_nodes(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Функция вернёт все узлы плана списком.
+
+    :param plan: Узел плана.
+    :return: Список узлов.
+    """
+    nodes = [plan]
+    for node in plan.get("Plans", []):
+        nodes.extend(get_plan_nodes(node))
+    return nodes
+
+
+def timeit(func: Any, repeat: int) -> float:
+    """
+    Функция вернёт лучшее время выполнения func из repeat попыток (миллисекунды).
+
+    :param func: Функция без аргументов.
+    :param repeat: Количество попыток.
+    :return: Время в миллисекундах.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
@@ -0,0 +1,133 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandParser
+from product_app.api_views.catalog.cache import (
+    GLOBAL_VERSION_KEY,
+    bump_versions,
+    invalidate_categories,
+)
+
+from shop_app.thumbnails import ImageStatus, has_thumbnails, make_thumbnails
+
+# Модели и поля с изображениями, для которых создаются производные изображения.
+IMAGE_FIELDS = (
+    ("product_app.ProductImage", "image"),
+    ("product_app.Category", "image"),
+    ("product_app.SubCategory", "image"),
+    ("auth_app.Profile", "avatar"),
+)
+# Задача: (модель, поле, имя файла в хранилище).
+Task = Tuple[str, str, str]
+
+
+def process_image(task: Task, force: bool) -> Optional[str]:
+    """
+    Функция создаст производные изображения одного файла (выполняется в процессе-воркере).
+    Хранилище берётся из поля модели, БД не используется.
+
+    :param task: (модель, поле, имя файла в хранилище).
+    :param force: Пересоздать существующие производные изображения.
+    :return: None при успехе, иначе текст ошибки.
+    """
+    model_label, field_name, name = task
+    storage = apps.get_model(model_label)._meta.get_field(field_name).storage
+    try:
+        if force or not has_thumbnails(storage, name):
+            make_thumbnails(storage, name)
+    except OSError as exc:
+        return f"{name}: {exc}"
+    return None
+
+
+class Command(BaseCommand):
+    """
+    Команда создаёт производные изображения (уменьшенные копии в WebP и JPEG)
+    для уже загруженных изображений продуктов, категорий, подкатегорий и аватарок.
+    Новые изображения обрабатываются фоновыми задачами (run_jobs).
+    Файлы обрабатываются параллельно в нескольких процессах (декодирование
+    и сжатие изображений нагружают CPU), с БД работает только основной процесс:
+    после обработки он записывает статусы изображений и сбрасывает кэш каталога.
+    """
+
+    help = "Создание уменьшенных копий уже загруженных изображений."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Количество процессов (по умолчанию - количество CPU).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Пересоздать уже существующие уменьшенные копии.",
+        )
+
+    @staticmethod
+    def get_tasks() -> Iterator[Task]:
+        """
+        Функция вернёт задачи по всем файлам изображений из БД.
+
+        :return: Задачи.
+        """
+        for model_label, field_name in IMAGE_FIELDS:
+            names = (
+                apps.get_model(model_label)
+                .objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .values_list(field_name, flat=True)
+                .order_by("pk")
+            )
+            for name in names.iterator():
+                yield model_label, field_name, name
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Создание производных изображений.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        force: bool = options["force"]
+        # Все имена файлов читаются до запуска воркеров: воркеры к БД не обращаются.
+        tasks = list(self.get_tasks())
+        errors: List[str] = []
+        # Имена файлов по моделям и статусам обработки.
+        statuses: Dict[Tuple[str, str, ImageStatus], List[str]] = defaultdict(list)
+        with ProcessPoolExecutor(
+            max_workers=options["workers"], initializer=django.setup
+        ) as executor:
+            for task, error in zip(
+                tasks,
+                executor.map(process_image, tasks, [force] * len(tasks), chunksize=8),
+            ):
+                model_label, field_name, name = task
+                status = ImageStatus.READY if error is None else ImageStatus.FAILED
+                statuses[model_label, field_name, status].append(name)
+                if error is not None:
+                    errors.append(error)
+                    self.stderr.write(error)
+        for (model_label, field_name, status), names in statuses.items():
+            apps.get_model(model_label).objects.filter(
+                **{f"{field_name}__in": names}
+            ).update(**{f"{field_name}_status": status})
+        bump_versions([GLOBAL_VERSION_KEY])
+        invalidate_categories()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Обработано изображений: {len(tasks) - len(errors)}, "
+                f"ошибок: {len(errors)}."
+            )
+        )
@@ -0,0 +1,81 @@
+from typing import Any, Callable, Dict, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from product_app.api_views.catalog.banners import get_random_product_ids
+from product_app.management.bench import rolled_back, seed_catalog, timeit
+from product_app.models import Product
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк выбора случайных продуктов для баннеров: ORDER BY random()
+    (прежний вариант) против случайных точек по индексу первичного ключа.
+    Данные создаются во временной транзакции и откатываются.
+    """
+
+    help = "Сравнение способов выбора случайных продуктов для баннеров."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--products", type=int, default=1_000_000, help="Количество продуктов."
+        )
+        parser.add_argument(
+            "--archived", type=float, default=0.1, help="Доля продуктов в архиве."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Количество повторов."
+        )
+
+    @staticmethod
+    def order_by_random(limit: int) -> List[int]:
+        """
+        Прежний вариант: сортировка всех продуктов в случайном порядке.
+
+        :param limit: Количество продуктов.
+        :return: ID продуктов.
+        """
+        return list(
+            Product.objects.filter(archived=False)
+            .order_by("?")
+            .values_list("pk", flat=True)[:limit]
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Запуск бенчмарка.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        with rolled_back():
+            seeded = seed_catalog(options["products"], 10)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {Product._meta.db_table} SET archived = random() < %s "
+                    f"WHERE id = ANY(%s)",
+                    [options["archived"], seeded["products"]],
+                )
+                cursor.execute(f"ANALYZE {Product._meta.db_table}")
+            variants: Dict[str, Callable[[], List[int]]] = {
+                "ORDER BY random()": lambda: self.order_by_random(4),
+                "случайные точки по id": lambda: get_random_product_ids(4),
+            }
+            self.stdout.write(
+                f"Продуктов: {options['products']}, в архиве: {options['archived']:.0%}."
+            )
+            for name, func in variants.items():
+                with CaptureQueriesContext(connection) as queries:
+                    func()
+                best = timeit(func, options["repeat"])
+                self.stdout.write(
+                    f"{name:<24} запросов: {len(queries)}, время: {best:.2f} мс"
+                )
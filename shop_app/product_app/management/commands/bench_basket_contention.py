@@ -0,0 +1,143 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from order_app.api_views.utils import add_to_basket
+from order_app.models import Basket
+from product_app.models import Category, Product, SubCategory
+
+
+def add_to_basket_with_lock(product_id: int, count: int, session_id: str) -> bool:
+    """
+    Прежний вариант добавления в корзину: блокировка строки продукта
+    (SELECT ... FOR UPDATE) до конца транзакции и сохранение всех полей продукта.
+
+    :param product_id: ID продукта.
+    :param count: Количество.
+    :param session_id: ID анонимного пользователя.
+    :return: False, если продукта не хватает.
+    """
+    with transaction.atomic():
+        product = Product.objects.select_for_update().get(pk=product_id)
+        if product.count < count:
+            return False
+        basket, _ = Basket.objects.get_or_create(
+            user=None, product=product, session_id=session_id, order=None
+        )
+        basket.count += count
+        basket.save()
+        product.count -= count
+        product.save()
+    return True
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк добавления в корзину одного продукта из нескольких потоков:
+    блокировка строки продукта (прежний вариант) против условного UPDATE
+    (product_app.inventory.reserve_stock). У каждого потока своя корзина.
+    Потокам нужны зафиксированные данные, поэтому продукт создаётся
+    вне транзакции и удаляется после замера.
+    """
+
+    help = "Сравнение пропускной способности добавления в корзину одного продукта."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--threads", type=int, default=8, help="Количество потоков."
+        )
+        parser.add_argument(
+            "--operations",
+            type=int,
+            default=200,
+            help="Количество добавлений в корзину на поток.",
+        )
+
+    @staticmethod
+    def run_threads(
+        func: Callable[[str], bool], threads: int, operations: int
+    ) -> float:
+        """
+        Функция выполнит func в threads потоках по operations раз
+        и вернёт пропускную способность.
+
+        :param func: Функция добавления в корзину (аргумент - ID сессии).
+        :param threads: Количество потоков.
+        :param operations: Количество вызовов на поток.
+        :return: Добавлений в корзину в секунду.
+        """
+        barrier = threading.Barrier(threads + 1)
+
+        def worker() -> None:
+            session_id = uuid.uuid4().hex
+            barrier.wait()
+            try:
+                for _ in range(operations):
+                    func(session_id)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [executor.submit(worker) for _ in range(threads)]
+            barrier.wait()
+            start = time.perf_counter()
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - start
+        return threads * operations / elapsed
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Запуск бенчмарка.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        threads: int = options["threads"]
+        operations: int = options["operations"]
+        stock = threads * operations
+        category = Category.objects.create(name="bench")
+        subcategory = SubCategory.objects.create(name="bench", category=category)
+        product = Product.objects.create(
+            category=subcategory,
+            title="bench",
+            description="bench",
+            full_description="bench",
+            price=100,
+            count=stock,
+        )
+        variants: Dict[str, Callable[[str], bool]] = {
+            "SELECT FOR UPDATE + save": lambda session_id: add_to_basket_with_lock(
+                product.pk, 1, session_id
+            ),
+            "условный UPDATE": lambda session_id: add_to_basket(
+                product.pk, 1, None, session_id
+            ),
+        }
+        self.stdout.write(
+            f"Потоков: {threads}, добавлений в корзину на поток: {operations}."
+        )
+        try:
+            for name, func in variants.items():
+                Basket.objects.filter(product=product).delete()
+                Product.objects.filter(pk=product.pk).update(count=stock)
+                rate = self.run_threads(func, threads, operations)
+                product.refresh_from_db(fields=["count"])
+                self.stdout.write(
+                    f"{name:<26} {rate:,.0f} добавлений/с, остаток: {product.count}"
+                )
+        finally:
+            product.delete()
+            subcategory.delete()
+            category.delete()
@@ -0,0 +1,156 @@
+import time
+from typing import Any, Callable, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.utils import timezone
+from order_app.models import Basket
+from product_app.inventory import release_stock
+from product_app.management.bench import rolled_back, seed_catalog
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк удаления корзин с истёкшим резервом: Basket.release_expired
+    (пачки, один запрос на пачку) с разным размером пачки против удаления
+    по одной корзине через ORM (прежний подход, на части корзин).
+    Данные создаются во временной транзакции и откатываются.
+    """
+
+    help = "Скорость возврата единиц из просроченных корзин."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--baskets",
+            type=int,
+            default=1_000_000,
+            help="Количество просроченных корзин.",
+        )
+        parser.add_argument(
+            "--products", type=int, default=100_000, help="Количество продуктов."
+        )
+        parser.add_argument(
+            "--batch-sizes",
+            type=lambda value: [int(size) for size in value.split(",")],
+            default=[1000, 10000],
+            help="Размеры пачек через запятую.",
+        )
+        parser.add_argument(
+            "--orm-baskets",
+            type=int,
+            default=5000,
+            help="Количество корзин для удаления по одной через ORM.",
+        )
+
+    @staticmethod
+    def seed_baskets(product_ids: List[int], baskets: int) -> None:
+        """
+        Функция создаст просроченные корзины анонимных пользователей
+        (каждая десятая - с действующим резервом).
+
+        :param product_ids: ID продуктов.
+        :param baskets: Количество корзин.
+        :return: None.
+        """
+        basket_table = Basket._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {basket_table} (
+                    product_id, count, session_id, created_at, reserved_until
+                )
+                SELECT
+                    (%s::bigint[])[1 + floor(random() * %s)::int],
+                    1 + floor(random() * 3)::int,
+                    md5(i::text),
+                    CURRENT_DATE,
+                    now() + CASE WHEN i %% 10 = 0 THEN interval '1 day'
+                        ELSE -random() * interval '30 days' END
+                FROM generate_series(1, %s) AS i
+                """,
+                [product_ids, len(product_ids), baskets],
+            )
+            cursor.execute(f"ANALYZE {basket_table}")
+
+    @staticmethod
+    def release_one_by_one(limit: int) -> int:
+        """
+        Прежний подход: корзины удаляются по одной, единицы возвращаются
+        отдельным UPDATE на каждую корзину.
+
+        :param limit: Количество корзин.
+        :return: Количество удалённых корзин.
+        """
+        baskets = Basket.objects.filter(
+            order=None, reserved_until__lt=timezone.now()
+        ).order_by("reserved_until")[:limit]
+        deleted = 0
+        for basket in baskets:
+            release_stock({basket.product_id: basket.count})
+            basket.delete()
+            deleted += 1
+        return deleted
+
+    @staticmethod
+    def release_in_batches(batch_size: int) -> int:
+        """
+        Функция удалит все просроченные корзины пачками (Basket.release_expired).
+
+        :param batch_size: Размер пачки.
+        :return: Количество удалённых корзин.
+        """
+        total = 0
+        after = None
+        while True:
+            deleted, _, after = Basket.release_expired(batch_size, after)
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+    def measure(self, name: str, func: Callable[[], int]) -> None:
+        """
+        Выполнит func внутри откатываемой транзакции и выведет скорость.
+
+        :param name: Название варианта.
+        :param func: Функция, возвращающая количество удалённых корзин.
+        :return: None.
+        """
+        with rolled_back():
+            start = time.perf_counter()
+            deleted = func()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{name:<24} корзин: {deleted:>9,}, время: {elapsed:7.2f} с, "
+            f"{deleted / elapsed:,.0f} корзин/с"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Запуск бенчмарка.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        with rolled_back():
+            seeded = seed_catalog(options["products"], 10)
+            self.seed_baskets(seeded["products"], options["baskets"])
+            self.stdout.write(
+                f"Корзин: {options['baskets']:,} (90% просрочены), "
+                f"продуктов: {options['products']:,}."
+            )
+            self.measure(
+                "по одной (ORM)",
+                lambda: self.release_one_by_one(options["orm_baskets"]),
+            )
+            for batch_size in options["batch_sizes"]:
+                self.measure(
+                    f"пачки по {batch_size}",
+                    lambda: self.release_in_batches(batch_size),
+                )
@@ -0,0 +1,72 @@
+from decimal import Decimal
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from product_app.api_views.catalog.facets import get_catalog_facets
+from product_app.management.bench import rolled_back, seed_catalog, timeit
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк фасетов каталога: время и количество запросов к БД.
+    Данные создаются во временной транзакции и откатываются.
+    """
+
+    help = "Время подсчёта фасетов каталога."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--products", type=int, default=1_000_000, help="Количество продуктов."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Количество повторов."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Запуск бенчмарка.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        with rolled_back():
+            seeded = seed_catalog(options["products"], 20)
+            data: Dict[str, Any] = {
+                "filter": {
+                    "name": "",
+                    "minPrice": Decimal("0"),
+                    "maxPrice": Decimal("100000"),
+                    "freeDelivery": False,
+                    "available": True,
+                },
+            }
+            variants = {
+                "весь каталог": data,
+                "подкатегория": {**data, "category": seeded["subcategories"][0]},
+                "подкатегория + 2 тега": {
+                    **data,
+                    "category": seeded["subcategories"][0],
+                    "tags": seeded["tags"][:2],
+                },
+                "поиск 'product 12'": {
+                    **data,
+                    "filter": {**data["filter"], "name": "product 12"},
+                },
+            }
+            self.stdout.write(f"Продуктов: {options['products']}.")
+            for name, variant in variants.items():
+                with CaptureQueriesContext(connection) as queries:
+                    get_catalog_facets(variant)
+                best = timeit(lambda: get_catalog_facets(variant), options["repeat"])
+                self.stdout.write(
+                    f"{name:<24} запросов: {len(queries)}, время: {best:.1f} мс"
+                )
@@ -0,0 +1,112 @@
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import Q, QuerySet
+from product_app.api_views.catalog.utils import get_catalog_filters
+from product_app.management.bench import (
+    count_plan_nodes,
+    get_count_plan,
+    get_plan,
+    get_plan_nodes,
+    rolled_back,
+    seed_catalog,
+)
+from product_app.models import Product
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк фильтра каталога по тегам: JOIN с product_tags + DISTINCT
+    (прежний вариант) против EXISTS (полусоединение).
+    Данные создаются во временной транзакции и откатываются.
+    """
+
+    help = "Сравнение планов запроса каталога с фильтром по тегам."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--products", type=int, default=50000, help="Количество продуктов."
+        )
+        parser.add_argument(
+            "--tags", type=int, default=5, help="Количество выбранных тегов."
+        )
+
+    @staticmethod
+    def get_queryset(data: Dict[str, Any], legacy: bool = False) -> QuerySet[Product]:
+        """
+        Запрос первой страницы каталога.
+
+        :param data: Параметры каталога.
+        :param legacy: True - прежний фильтр через JOIN и DISTINCT.
+        :return: QuerySet.
+        """
+        if legacy:
+            tags_data = {**data, "tags": None}
+            queryset = Product.objects.filter(
+                get_catalog_filters(tags_data) & Q(tags__pk__in=data["tags"])
+            ).distinct()
+        else:
+            queryset = Product.objects.filter(get_catalog_filters(data))
+        return queryset.order_by("-effective_price")
+
+    def report(self, name: str, queryset: QuerySet[Product]) -> None:
+        """
+        Вывод размера и времени планов: страница (LIMIT 20) и подсчёт (как в Paginator).
+
+        :param name: Название варианта.
+        :param queryset: QuerySet.
+        :return: None.
+        """
+        self.report_plan(f"{name}, страница", get_plan(queryset[:20]))
+        self.report_plan(f"{name}, COUNT", get_count_plan(queryset))
+
+    def report_plan(self, name: str, plan: Dict[str, Any]) -> None:
+        """
+        Вывод размера и времени плана.
+
+        :param name: Название.
+        :param plan: План запроса.
+        :return: None.
+        """
+        nodes = get_plan_nodes(plan["Plan"])
+        max_rows = max(node.get("Actual Rows", 0) for node in nodes)
+        self.stdout.write(
+            f"{name:<30} узлов плана: {count_plan_nodes(plan['Plan']):>3}, "
+            f"макс. строк в узле: {max_rows:>8}, "
+            f"время: {plan['Execution Time']:.2f} мс"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Запуск бенчмарка.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        with rolled_back():
+            seeded = seed_catalog(options["products"], max(options["tags"], 10))
+            tags: List[int] = seeded["tags"][: options["tags"]]
+            data: Dict[str, Any] = {
+                "filter": {
+                    "name": "",
+                    "minPrice": Decimal("0"),
+                    "maxPrice": Decimal("100000"),
+                    "freeDelivery": False,
+                    "available": True,
+                },
+                "tags": tags,
+            }
+            self.stdout.write(
+                f"Продуктов: {options['products']}, выбрано тегов: {len(tags)}."
+            )
+            self.report("JOIN + DISTINCT", self.get_queryset(data, legacy=True))
+            self.report("EXISTS (any)", self.get_queryset({**data, "tagsMode": "any"}))
+            self.report("EXISTS (all)", self.get_queryset({**data, "tagsMode": "all"}))
@@ -0,0 +1,116 @@
+from functools import partial
+from io import BytesIO
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.core.paginator import Paginator
+from order_app.api_views.utils import get_order_baskets_prefetch
+from order_app.models import Basket, Order
+from order_app.serializers.order import OutOrderSerializer
+from product_app.management.bench import rolled_back, seed_catalog, timeit
+from product_app.models import Product
+from product_app.serializers.catalog import OutCatalogSerializer
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from shop_app.parsers import OrjsonParser
+from shop_app.renderers import OrjsonRenderer
+
+
+class Command(BaseCommand):
+    """
+    Микробенчмарк рендера и разбора JSON: JSONRenderer/JSONParser DRF (json)
+    против OrjsonRenderer/OrjsonParser. Данные сериализуются заранее,
+    замеряется только JSON. Данные создаются во временной транзакции и откатываются.
+    """
+
+    help = "Сравнение скорости JSONRenderer и OrjsonRenderer."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--items", type=int, default=100, help="Продуктов на странице каталога."
+        )
+        parser.add_argument(
+            "--orders", type=int, default=20, help="Количество заказов."
+        )
+        parser.add_argument(
+            "--baskets", type=int, default=5, help="Корзин (позиций) в заказе."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=200, help="Количество повторов."
+        )
+
+    @staticmethod
+    def get_payloads(options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Подготовка данных: страница каталога и список заказов.
+
+        :param options: Аргументы команды.
+        :return: Данные по названиям.
+        """
+        seeded = seed_catalog(max(options["items"], options["baskets"]), 10)
+        products = Product.objects.filter(pk__in=seeded["products"]).order_by("pk")
+        page = Paginator(
+            products.select_related("category").prefetch_related("tags", "images"),
+            options["items"],
+        ).page(1)
+
+        product_list = list(products[: options["baskets"]])
+        for _ in range(options["orders"]):
+            order = Order.objects.create(full_name="Bench", city="Minsk")
+            Basket.objects.bulk_create(
+                Basket(product=product, count=2, order=order)
+                for product in product_list
+            )
+        orders = Order.objects.prefetch_related(*get_order_baskets_prefetch())
+        return {
+            f"каталог ({options['items']} продуктов)": OutCatalogSerializer(page).data,
+            f"заказы ({options['orders']} x {options['baskets']})": (
+                OutOrderSerializer(orders, many=True).data
+            ),
+        }
+
+    @staticmethod
+    def parse(parser: BaseParser, content: bytes) -> Any:
+        """
+        Разбор JSON парсером DRF.
+
+        :param parser: Парсер.
+        :param content: JSON.
+        :return: Данные.
+        """
+        return parser.parse(BytesIO(content))
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Запуск бенчмарка.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        with rolled_back():
+            payloads = self.get_payloads(options)
+        drf_renderer, orjson_renderer = JSONRenderer(), OrjsonRenderer()
+        for name, data in payloads.items():
+            content = drf_renderer.render(data)
+            identical = content == orjson_renderer.render(data)
+            self.stdout.write(
+                f"{name}: {len(content)} байт, "
+                f"совпадает побайтно: {'да' if identical else 'нет'}"
+            )
+            variants = {
+                "render json": partial(drf_renderer.render, data),
+                "render orjson": partial(orjson_renderer.render, data),
+                "parse json": partial(self.parse, JSONParser(), content),
+                "parse orjson": partial(self.parse, OrjsonParser(), content),
+            }
+            for variant, func in variants.items():
+                best = timeit(func, options["repeat"])
+                self.stdout.write(f"    {variant:<14} {best * 1000:>8.1f} мкс")
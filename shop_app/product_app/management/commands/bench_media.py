@@ -0,0 +1,133 @@
+import os
+import tempfile
+from io import BytesIO
+from typing import Any, Callable, Dict, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.http import HttpResponseBase
+from django.test import RequestFactory, override_settings
+from django.views.static import serve
+from PIL import Image
+from product_app.management.bench import timeit
+
+from shop_app.media import serve_media
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк отдачи загруженных изображений: django.views.static.serve
+    (прежний вариант) против shop_app.media.serve_media - полный ответ,
+    повторный запрос с валидаторами (304) и Range.
+    Измеряется только работа Python (RequestFactory, тело ответа читается целиком);
+    выигрыш от os.sendfile виден лишь под WSGI-сервером с wsgi.file_wrapper,
+    а от X-Accel-Redirect - за nginx. Изображения создаются во временной папке.
+    """
+
+    help = "Сравнение способов отдачи загруженных изображений (изображений/с)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--images", type=int, default=200, help="Количество изображений."
+        )
+        parser.add_argument(
+            "--size", type=int, default=1280, help="Ширина изображений (пиксели)."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Количество повторов."
+        )
+
+    @staticmethod
+    def make_images(root: str, count: int, size: int) -> List[str]:
+        """
+        Функция создаст JPEG изображения (шум, чтобы размер был реалистичным).
+
+        :param root: Папка.
+        :param count: Количество изображений.
+        :param size: Ширина изображений.
+        :return: Имена файлов относительно root.
+        """
+        buffer = BytesIO()
+        Image.effect_noise((size, size * 3 // 4), 64).convert("RGB").save(
+            buffer, format="JPEG", quality=85
+        )
+        names = []
+        for i in range(count):
+            name = f"bench_{i}.jpg"
+            with open(os.path.join(root, name), "wb") as file:
+                file.write(buffer.getvalue())
+            names.append(name)
+        return names
+
+    @staticmethod
+    def consume(response: HttpResponseBase) -> None:
+        """
+        Функция прочитает тело ответа, как это сделал бы WSGI-сервер без sendfile.
+
+        :param response: Ответ.
+        :return: None.
+        """
+        if response.streaming:
+            for _ in response.streaming_content:  # type: ignore[attr-defined]
+                pass
+        response.close()
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Запуск бенчмарка.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        factory = RequestFactory()
+        with tempfile.TemporaryDirectory() as root, override_settings(
+            MEDIA_ROOT=root, MEDIA_SENDFILE_BACKEND=None
+        ):
+            names = self.make_images(root, options["images"], options["size"])
+            file_size = os.path.getsize(os.path.join(root, names[0]))
+            validators = {}
+            for name in names:
+                response = serve_media(factory.head(f"/{name}"), name)
+                validators[name] = {
+                    "If-None-Match": response.headers["ETag"],
+                    "If-Modified-Since": response.headers["Last-Modified"],
+                }
+            views: Dict[str, Callable[..., HttpResponseBase]] = {
+                "static.serve": lambda request, name: serve(
+                    request, name, document_root=root
+                ),
+                "serve_media": serve_media,
+            }
+            cases: Dict[str, Callable[[str], Dict[str, str]]] = {
+                "полный ответ": lambda name: {},
+                "условный запрос": lambda name: validators[name],
+                "Range 0-65535": lambda name: {"Range": "bytes=0-65535"},
+            }
+            self.stdout.write(
+                f"Изображений: {len(names)}, размер файла: {file_size // 1024} КБ."
+            )
+            for case, get_headers in cases.items():
+                requests = [
+                    factory.get(f"/{name}", headers=get_headers(name)) for name in names
+                ]
+                for view_name, view in views.items():
+
+                    def run() -> None:
+                        for request, name in zip(requests, names):
+                            self.consume(view(request, name))
+
+                    response = view(requests[0], names[0])
+                    status = response.status_code
+                    self.consume(response)
+                    best = timeit(run, options["repeat"])
+                    rate = len(names) / best * 1000
+                    self.stdout.write(
+                        f"{case:<16} {view_name:<14} статус: {status}, "
+                        f"{rate:,.0f} изображений/с"
+                    )
@@ -0,0 +1,98 @@
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
+from product_app.api_views.catalog.cards import get_product_cards
+from product_app.management.bench import rolled_back, seed_catalog, timeit
+from product_app.models import Product, ProductImage, Tag
+from product_app.serializers.product import OutCatalogProductSerializer
+from rest_framework.renderers import JSONRenderer
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк карточек продуктов: OutCatalogProductSerializer(many=True)
+    против карточек из values() (get_product_cards), вместе с рендером JSON.
+    Данные создаются во временной транзакции и откатываются.
+    """
+
+    help = "Сравнение времени сериализации карточек продуктов."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--products", type=int, default=1000, help="Количество продуктов."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Количество повторов."
+        )
+
+    @staticmethod
+    def add_images(product_ids: List[int], per_product: int = 2) -> None:
+        """
+        Добавит продуктам изображения (только записи в БД, без файлов).
+
+        :param product_ids: ID продуктов.
+        :param per_product: Количество изображений у продукта.
+        :return: None.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {ProductImage._meta.db_table} (title, image, product_id)
+                SELECT 'Image ' || n, 'product_image/' || id || '/images/' || n || '.png', id
+                FROM unnest(%s::bigint[]) AS id, generate_series(1, %s) AS n
+                """,
+                [product_ids, per_product],
+            )
+            cursor.execute(f"ANALYZE {ProductImage._meta.db_table}")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Запуск бенчмарка.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        renderer = JSONRenderer()
+        with rolled_back():
+            seeded = seed_catalog(options["products"], 20)
+            self.add_images(seeded["products"])
+            products = Product.objects.filter(pk__in=seeded["products"]).order_by("pk")
+
+            def serializer_path() -> bytes:
+                # Теги и изображения - в порядке id, как в карточках.
+                queryset = products.select_related("category").prefetch_related(
+                    Prefetch("tags", queryset=Tag.objects.order_by("pk")),
+                    Prefetch("images", queryset=ProductImage.objects.order_by("pk")),
+                )
+                data = OutCatalogProductSerializer(queryset, many=True).data
+                return bytes(renderer.render(data))
+
+            def cards_path() -> bytes:
+                return bytes(renderer.render(get_product_cards(products)))
+
+            variants: Dict[str, Any] = {
+                "OutCatalogProductSerializer": serializer_path,
+                "values() карточки": cards_path,
+            }
+            self.stdout.write(f"Продуктов: {options['products']}.")
+            for name, func in variants.items():
+                with CaptureQueriesContext(connection) as queries:
+                    func()
+                best = timeit(func, options["repeat"])
+                self.stdout.write(
+                    f"{name:<28} запросов: {len(queries)}, время: {best:.1f} мс"
+                )
+            identical = serializer_path() == cards_path()
+            self.stdout.write(
+                f"JSON совпадает побайтно: {'да' if identical else 'нет'}"
+            )
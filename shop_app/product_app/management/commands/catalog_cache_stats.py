@@ -0,0 +1,48 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from product_app.api_views.catalog.cache import (
+    get_catalog_cache_stats,
+    reset_catalog_cache_stats,
+)
+
+
+class Command(BaseCommand):
+    """
+    Команда выводит счётчики попаданий и промахов кэша страниц /api/catalog
+    всех процессов (CatalogCacheStats).
+    """
+
+    help = "Счётчики попаданий/промахов кэша каталога."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Обнулить счётчики после вывода.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Вывод счётчиков.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        stats = get_catalog_cache_stats()
+        total = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] / total * 100 if total else 0
+        self.stdout.write(
+            f"Попаданий: {stats['hits']}, промахов: {stats['misses']} "
+            f"(попаданий {ratio:.1f}%)."
+        )
+        if options["reset"]:
+            reset_catalog_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Счётчики обнулены."))
@@ -0,0 +1,37 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from product_app.api_views.catalog.category_tree import category_tree
+
+
+class Command(BaseCommand):
+    """
+    Команда строит дерево категорий в кэше текущего процесса.
+    Кэш дерева - память процесса, поэтому команду нужно вызывать внутри воркера
+    (call_command, например, в хуке post_worker_init gunicorn); wsgi.py и asgi.py
+    уже прогревают дерево при загрузке приложения. Отдельный запуск из консоли
+    только проверяет сборку дерева (версия дерева - CatalogVersion в БД,
+    команда её не меняет).
+    """
+
+    help = "Прогрев кэша дерева категорий."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Прогрев кэша.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        start = time.perf_counter()
+        category_tree.clear()
+        tree = category_tree.get()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Категорий: {len(tree)}, версия: {category_tree.version}, "
+                f"время: {elapsed:.1f} мс."
+            )
+        )
@@ -0,0 +1,56 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from product_app.api_views.catalog.cache import invalidate_catalog_for_products
+from product_app.models import Product
+
+
+class Command(BaseCommand):
+    """
+    Команда пересчитывает хранимые количество отзывов, сумму оценок и рейтинг продуктов.
+    Пересчёт идёт пачками по диапазонам id, каждая пачка - отдельная транзакция.
+    """
+
+    help = "Пересчёт хранимых reviews_count, rate_sum и rating продуктов."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество продуктов в одной пачке.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Пересчёт рейтингов.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        batch_size: int = options["batch_size"]
+        last_pk = 0
+        total = 0
+        while True:
+            pks = list(
+                Product.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            with transaction.atomic():
+                total += Product.rebuild_rating(
+                    Product.objects.filter(pk__gte=pks[0], pk__lte=pks[-1])
+                )
+            invalidate_catalog_for_products(pks)
+            last_pk = pks[-1]
+        self.stdout.write(self.style.SUCCESS(f"Пересчитано продуктов: {total}."))
@@ -0,0 +1,39 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from product_app.api_views.catalog.cache import GLOBAL_VERSION_KEY, bump_versions
+from product_app.models import SubCategory, SubCategoryTagCount, Tag
+
+
+class Command(BaseCommand):
+    """
+    Команда пересчитывает количество живых продуктов с тегами по подкатегориям
+    (SubCategoryTagCount) и по всему каталогу (Tag.products_count).
+    Между запусками счётчики поддерживаются сигналами, периодический запуск
+    исправляет расхождения после массовых операций (QuerySet.update и т.п.).
+    Каждая подкатегория пересчитывается отдельной транзакцией.
+    """
+
+    help = "Пересчёт количества продуктов с тегами по подкатегориям."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Пересчёт счётчиков.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        subcategory_ids = list(
+            SubCategory.objects.order_by("pk").values_list("pk", flat=True)
+        )
+        for pk in subcategory_ids:
+            SubCategoryTagCount.refresh([pk], None)
+        total = SubCategoryTagCount.refresh_totals(Tag.objects.all())
+        # Счётчики влияют только на /api/tags (версия всего каталога).
+        bump_versions([GLOBAL_VERSION_KEY])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Пересчитано подкатегорий: {len(subcategory_ids)}, тегов: {total}."
+            )
+        )
@@ -0,0 +1,112 @@
+import time
+from datetime import date, datetime
+from datetime import time as dt_time
+from datetime import timedelta
+from typing import Any, List, Optional
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from product_app.api_views.catalog.cache import invalidate_catalog_for_products
+from product_app.models import Product
+
+
+class Command(BaseCommand):
+    """
+    Команда включает и выключает акции на границах дней (date_from / date_to).
+    Обновляются только продукты, у которых состояние акции должно измениться.
+    Запускается раз в сутки (cron) или в режиме --loop как простой планировщик.
+    """
+
+    help = "Включение/выключение акций продуктов на текущую дату."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Аргументы команды.
+
+        :param parser: CommandParser.
+        :return: None.
+        """
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество продуктов в одной пачке.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а повторять синхронизацию на начале каждого дня.",
+        )
+
+    @staticmethod
+    def get_products_to_sync(today: date) -> List[int]:
+        """
+        Вернёт id продуктов, у которых действующая акция должна измениться.
+
+        :param today: Текущая дата.
+        :return: Список id продуктов.
+        """
+        # Акция продукта закончилась или ещё не началась.
+        expired = Q(active_sale__isnull=False) & (
+            Q(active_sale__date_to__lt=today) | Q(active_sale__date_from__gt=today)
+        )
+        # У продукта есть действующая акция, но она не проставлена.
+        started = Q(sales__date_from__lte=today, sales__date_to__gte=today) & (
+            Q(active_sale__isnull=True) | ~Q(active_sale=F("sales__pk"))
+        )
+        return list(
+            Product.objects.filter(expired | started)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .distinct()
+        )
+
+    def sync(self, batch_size: int) -> int:
+        """
+        Одна синхронизация акций.
+
+        :param batch_size: Количество продуктов в одной пачке.
+        :return: Количество обновлённых продуктов.
+        """
+        today = timezone.now().date()
+        pks = self.get_products_to_sync(today)
+        total = 0
+        for i in range(0, len(pks), batch_size):
+            with transaction.atomic():
+                total += Product.sync_sales(
+                    Product.objects.filter(pk__in=pks[i : i + batch_size]), today
+                )
+                invalidate_catalog_for_products(pks[i : i + batch_size])
+        return total
+
+    @staticmethod
+    def seconds_to_next_day(now: Optional[datetime] = None) -> float:
+        """
+        Количество секунд до начала следующего дня.
+
+        :param now: Текущее время.
+        :return: Секунды.
+        """
+        now = now or timezone.now()
+        next_day = datetime.combine(
+            now.date() + timedelta(days=1), dt_time.min, tzinfo=now.tzinfo
+        )
+        return (next_day - now).total_seconds()
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Синхронизация акций.
+
+        :param args: Any.
+        :param options: Any.
+        :return: None.
+        """
+        while True:
+            total = self.sync(options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Обновлено продуктов: {total}."))
+            if not options["loop"]:
+                break
+            # Небольшой запас, чтобы точно оказаться в новом дне.
+            time.sleep(self.seconds_to_next_day() + 1)
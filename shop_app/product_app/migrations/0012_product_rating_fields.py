@@ -0,0 +1,56 @@
+# Generated by Django 5.1.15 on 2026-10-18 01:39
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_app", "0011_alter_review_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="rate_sum",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="rate sum"
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="rating",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=Decimal("0"),
+                editable=False,
+                max_digits=3,
+                verbose_name="rating",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="reviews_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="reviews count"
+            ),
+        ),
+        # Заполняем новые поля по уже существующим отзывам.
+        migrations.RunSQL(
+            sql="""
+                UPDATE product_app_product AS p
+                SET reviews_count = r.reviews_count,
+                    rate_sum = r.rate_sum,
+                    rating = ROUND(r.rate_sum::numeric / r.reviews_count, 2)
+                FROM (
+                    SELECT product_id, COUNT(*) AS reviews_count, SUM(rate) AS rate_sum
+                    FROM product_app_review
+                    GROUP BY product_id
+                ) AS r
+                WHERE r.product_id = p.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
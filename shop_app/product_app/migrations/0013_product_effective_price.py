@@ -0,0 +1,81 @@
+# Generated by Django 5.1.15 on 2026-10-18 01:41
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_app", "0012_product_rating_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="active_sale",
+            field=models.ForeignKey(
+                default=None,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="product_app.sale",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="sale_price",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=None,
+                editable=False,
+                max_digits=10,
+                null=True,
+                verbose_name="sale price",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="sale_price_before",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=None,
+                editable=False,
+                max_digits=10,
+                null=True,
+                verbose_name="sale price before",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="effective_price",
+            field=models.GeneratedField(
+                db_index=True,
+                db_persist=True,
+                expression=django.db.models.functions.comparison.Coalesce(
+                    "sale_price", "price"
+                ),
+                output_field=models.DecimalField(decimal_places=2, max_digits=10),
+                verbose_name="effective price",
+            ),
+        ),
+        # Проставляем действующие на сегодня акции уже существующим продуктам.
+        migrations.RunSQL(
+            sql="""
+                UPDATE product_app_product AS p
+                SET active_sale_id = s.id,
+                    sale_price = s.sale_price,
+                    sale_price_before = s.price
+                FROM (
+                    SELECT DISTINCT ON (product_id) id, product_id, sale_price, price
+                    FROM product_app_sale
+                    WHERE date_from <= CURRENT_DATE AND date_to >= CURRENT_DATE
+                    ORDER BY product_id, date_to DESC
+                ) AS s
+                WHERE s.product_id = p.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.15 on 2026-10-18 02:06
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_app", "0014_product_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("archived", False)),
+                fields=["category", "free_delivery", "effective_price"],
+                name="product_live_category_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("archived", False)),
+                fields=["-rating"],
+                name="product_live_rating_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("archived", False), ("count__lte", 10)),
+                fields=["count"],
+                name="product_low_stock_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sale",
+            index=django.contrib.postgres.indexes.GistIndex(
+                models.Func(
+                    models.F("date_from"),
+                    models.F("date_to"),
+                    models.Value("[]"),
+                    function="daterange",
+                    output_field=django.contrib.postgres.fields.ranges.DateRangeField(),
+                ),
+                name="sale_period_gist",
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.15 on 2026-10-18 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_app", "0015_catalog_indexes"),
+        ("order_app", "0015_remove_order_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="popularity",
+            field=models.FloatField(
+                default=0, editable=False, verbose_name="popularity"
+            ),
+        ),
+        # Заполняем новое поле по уже оплаченным заказам (момент оплаты неизвестен,
+        # берётся дата заказа) и отзывам. Константы - как в product_app.models.product
+        # на момент миграции: эпоха 2024-01-01 UTC, период полураспада 30 дней,
+        # вес единицы покупки 1, вес отзыва 2 * оценка / 5.
+        migrations.RunSQL(
+            sql="""
+                UPDATE product_app_product AS p
+                SET popularity = COALESCE(b.score, 0) + COALESCE(r.score, 0)
+                FROM product_app_product AS p2
+                LEFT JOIN (
+                    SELECT b.product_id, SUM(
+                        b.count * power(
+                            2.0, (extract(epoch FROM o.created_at) - 1704067200) / 2592000
+                        )
+                    ) AS score
+                    FROM order_app_basket AS b
+                    JOIN order_app_order AS o ON o.id = b.order_id
+                    WHERE o.paid_for
+                    GROUP BY b.product_id
+                ) AS b ON b.product_id = p2.id
+                LEFT JOIN (
+                    SELECT product_id, SUM(
+                        2.0 * rate / 5 * power(
+                            2.0, (extract(epoch FROM date) - 1704067200) / 2592000
+                        )
+                    ) AS score
+                    FROM product_app_review
+                    GROUP BY product_id
+                ) AS r ON r.product_id = p2.id
+                WHERE p2.id = p.id AND (b.score IS NOT NULL OR r.score IS NOT NULL);
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("archived", False)),
+                fields=["-popularity"],
+                name="product_live_popularity_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.1.15 on 2026-10-18 02:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_app", "0016_product_popularity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubCategoryTagCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "products_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="products count"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="products_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="products count"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["-products_count"], name="tag_products_count_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="subcategorytagcount",
+            name="subcategory",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tag_counts",
+                to="product_app.subcategory",
+            ),
+        ),
+        migrations.AddField(
+            model_name="subcategorytagcount",
+            name="tag",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tag_counts",
+                to="product_app.tag",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subcategorytagcount",
+            index=models.Index(
+                fields=["subcategory", "-products_count"],
+                name="subcategory_tag_count_top_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="subcategorytagcount",
+            constraint=models.UniqueConstraint(
+                fields=("subcategory", "tag"), name="subcategory_tag_count_unique"
+            ),
+        ),
+        # Заполняем счётчики по уже существующим продуктам и тегам.
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO product_app_subcategorytagcount
+                    (subcategory_id, tag_id, products_count)
+                SELECT p.category_id, pt.tag_id, COUNT(*)
+                FROM product_app_product_tags AS pt
+                JOIN product_app_product AS p ON p.id = pt.product_id
+                WHERE NOT p.archived
+                GROUP BY p.category_id, pt.tag_id;
+
+                UPDATE product_app_tag AS t
+                SET products_count = c.products_count
+                FROM (
+                    SELECT tag_id, SUM(products_count) AS products_count
+                    FROM product_app_subcategorytagcount
+                    GROUP BY tag_id
+                ) AS c
+                WHERE c.tag_id = t.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.15 on 2026-10-18 02:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_app", "0017_tag_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="image_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "pending"),
+                    ("ready", "ready"),
+                    ("failed", "failed"),
+                ],
+                default="ready",
+                editable=False,
+                max_length=16,
+                verbose_name="image status",
+            ),
+        ),
+        migrations.AddField(
+            model_name="productimage",
+            name="image_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "pending"),
+                    ("ready", "ready"),
+                    ("failed", "failed"),
+                ],
+                default="ready",
+                editable=False,
+                max_length=16,
+                verbose_name="image status",
+            ),
+        ),
+        migrations.AddField(
+            model_name="subcategory",
+            name="image_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "pending"),
+                    ("ready", "ready"),
+                    ("failed", "failed"),
+                ],
+                default="ready",
+                editable=False,
+                max_length=16,
+                verbose_name="image status",
+            ),
+        ),
+    ]
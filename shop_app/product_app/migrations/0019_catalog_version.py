@@ -0,0 +1,41 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_app", "0018_image_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogVersion",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="name",
+                    ),
+                ),
+                ("version", models.BigIntegerField(verbose_name="version")),
+            ],
+            options={
+                "verbose_name": "catalog version",
+                "verbose_name_plural": "catalog versions",
+            },
+        ),
+        # Начальная версия дерева категорий - время миграции.
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO product_app_catalogversion (name, version)
+                VALUES ('categories', (extract(epoch FROM now()) * 1e9)::bigint)
+                ON CONFLICT (name) DO NOTHING;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
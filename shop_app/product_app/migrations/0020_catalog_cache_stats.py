@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_app", "0019_catalog_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogCacheStats",
+            fields=[
+                (
+                    "process",
+                    models.CharField(
+                        max_length=255,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="process",
+                    ),
+                ),
+                ("hits", models.BigIntegerField(default=0, verbose_name="hits")),
+                ("misses", models.BigIntegerField(default=0, verbose_name="misses")),
+            ],
+            options={
+                "verbose_name": "catalog cache stats",
+                "verbose_name_plural": "catalog cache stats",
+            },
+        ),
+    ]
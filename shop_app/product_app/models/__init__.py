@@ -1,3 +1,5 @@
+from .catalog_cache_stats import CatalogCacheStats
+from .catalog_version import CatalogVersion
 from .category import Category
 from .product import Product
 from .product_image import ProductImage
@@ -6,14 +8,18 @@ from .sale import Sale
 from .specification import Specification
 from .subcategory import SubCategory
 from .tag import Tag
+from .tag_count import SubCategoryTagCount
 
 __all__ = [
+    "CatalogCacheStats",
+    "CatalogVersion",
     "Category",
     "Product",
     "ProductImage",
     "Review",
     "Specification",
     "SubCategory",
+    "SubCategoryTagCount",
     "Tag",
     "Sale",
 ]
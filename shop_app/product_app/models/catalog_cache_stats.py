@@ -0,0 +1,67 @@
+from typing import Dict
+
+from django.db import connection, models
+from django.db.models import Sum
+from django.utils.translation import gettext_lazy as _
+
+
+class CatalogCacheStats(models.Model):
+    """
+    Модель счётчиков попаданий и промахов кэша каталога одного процесса.
+    Процессы копят счётчики в памяти и прибавляют их к своей строке
+    (см. product_app.api_views.catalog.cache), поэтому счётчики всех процессов
+    видны из любого процесса (команда catalog_cache_stats).
+
+    **process** - Процесс (хост:pid). \n
+    **hits** - Попадания. \n
+    **misses** - Промахи.
+    """
+
+    process = models.CharField(_("process"), max_length=255, primary_key=True)
+    hits = models.BigIntegerField(_("hits"), default=0, null=False)
+    misses = models.BigIntegerField(_("misses"), default=0, null=False)
+
+    @classmethod
+    def add(cls, process: str, hits: int, misses: int) -> None:
+        """
+        Прибавит счётчики к строке процесса одним запросом
+        INSERT ... ON CONFLICT DO UPDATE.
+
+        :param process: Процесс.
+        :param hits: Попадания.
+        :param misses: Промахи.
+        :return: None.
+        """
+        table = cls._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (process, hits, misses) VALUES (%s, %s, %s)
+                ON CONFLICT (process) DO UPDATE SET
+                    hits = {table}.hits + EXCLUDED.hits,
+                    misses = {table}.misses + EXCLUDED.misses
+                """,
+                [process, hits, misses],
+            )
+
+    @classmethod
+    def totals(cls) -> Dict[str, int]:
+        """
+        Вернёт сумму счётчиков всех процессов.
+
+        :return: {"hits": ..., "misses": ...}.
+        """
+        totals = cls.objects.aggregate(hits=Sum("hits"), misses=Sum("misses"))
+        return {"hits": totals["hits"] or 0, "misses": totals["misses"] or 0}
+
+    class Meta:
+        verbose_name = _("catalog cache stats")
+        verbose_name_plural = _("catalog cache stats")
+
+    def __str__(self) -> str:
+        """
+        Строковое представление.
+
+        :return: Процесс и счётчики.
+        """
+        return f"{self.process}: {self.hits}/{self.misses}"
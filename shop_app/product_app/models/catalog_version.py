@@ -0,0 +1,110 @@
+import time
+from typing import Dict, Iterable, List
+
+from django.db import connection, models
+from django.utils.translation import gettext_lazy as _
+
+
+class CatalogVersion(models.Model):
+    """
+    Модель версии данных каталога, общей для всех процессов.
+    Версия меняется в транзакции, изменившей данные, поэтому новая версия
+    становится видна ровно тогда же, когда и новые строки (после фиксации).
+
+    **name** - Название версии (CATEGORIES или ключ версии каталога,
+    см. product_app.api_views.catalog.cache). \n
+    **version** - Версия: время изменения в наносекундах
+    (не меньше предыдущей версии + 1).
+    """
+
+    # Дерево категорий (категории и подкатегории).
+    CATEGORIES = "categories"
+
+    name = models.CharField(_("name"), max_length=50, primary_key=True)
+    version = models.BigIntegerField(_("version"), null=False)
+
+    @classmethod
+    def get(cls, name: str) -> int:
+        """
+        Вернёт текущую версию (get_many).
+
+        :param name: Название версии.
+        :return: Версия.
+        """
+        return cls.get_many([name])[0]
+
+    @classmethod
+    def get_many(cls, names: List[str]) -> List[int]:
+        """
+        Вернёт текущие версии (в порядке названий) одним запросом.
+        Версии, которых ещё нет, заводятся со временем текущего запроса
+        (ON CONFLICT DO NOTHING не перезапишет версию, созданную параллельно).
+
+        :param names: Названия версий.
+        :return: Версии.
+        """
+        versions: Dict[str, int] = dict(
+            cls.objects.filter(pk__in=names).values_list("name", "version")
+        )
+        missing = sorted(set(names) - set(versions))
+        if missing:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    INSERT INTO {cls._meta.db_table} (name, version)
+                    SELECT name, %s FROM unnest(%s::varchar[]) AS name
+                    ON CONFLICT (name) DO NOTHING
+                    """,
+                    [time.time_ns(), missing],
+                )
+            versions.update(
+                cls.objects.filter(pk__in=missing).values_list("name", "version")
+            )
+        return [versions[name] for name in names]
+
+    @classmethod
+    def bump(cls, name: str) -> None:
+        """
+        Сменит версию (bump_many).
+
+        :param name: Название версии.
+        :return: None.
+        """
+        cls.bump_many([name])
+
+    @classmethod
+    def bump_many(cls, names: Iterable[str]) -> None:
+        """
+        Сменит версии одним запросом INSERT ... ON CONFLICT DO UPDATE.
+        Строки блокируются в порядке названий (без взаимных блокировок
+        параллельных транзакций). Версия растёт и при отставании часов процесса.
+
+        :param names: Названия версий.
+        :return: None.
+        """
+        names = sorted(set(names))
+        if not names:
+            return
+        table = cls._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (name, version)
+                SELECT name, %s FROM unnest(%s::varchar[]) AS name ORDER BY name
+                ON CONFLICT (name) DO UPDATE SET
+                    version = GREATEST({table}.version + 1, EXCLUDED.version)
+                """,
+                [time.time_ns(), names],
+            )
+
+    class Meta:
+        verbose_name = _("catalog version")
+        verbose_name_plural = _("catalog versions")
+
+    def __str__(self) -> str:
+        """
+        Строковое представление.
+
+        :return: Название и версия.
+        """
+        return f"{self.name}: {self.version}"
@@ -4,6 +4,8 @@ import uuid
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from shop_app.thumbnails import ImageStatus
+
 
 def category_image_directory_path(instance: "Category", filename: str) -> str:
     """
@@ -20,7 +22,9 @@ class Category(models.Model):
     """
     Модель категории.
 
-    **name** - Имя категории.
+    **name** - Имя категории. \n
+    **image** - Изображение категории. \n
+    **image_status** - Статус обработки изображения (производные изображения).
     """
 
     unique_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
@@ -30,6 +34,13 @@ class Category(models.Model):
     image = models.ImageField(
         _("image"), null=True, blank=False, upload_to=category_image_directory_path
     )
+    image_status = models.CharField(
+        _("image status"),
+        max_length=16,
+        choices=ImageStatus.choices,
+        default=ImageStatus.READY,
+        editable=False,
+    )
 
     def __str__(self) -> str:
         """
@@ -1,14 +1,123 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Dict, Optional, Sequence
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MinValueValidator
 from django.db import models
-from django.db.models import Avg
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.expressions import Combinable
+from django.db.models.functions import Cast, Coalesce, Extract, Power, Round
+from django.db.models.lookups import GreaterThan
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from product_app.models.subcategory import SubCategory
 from product_app.models.tag import Tag
 
+# Конфигурация полнотекстового поиска (для латиницы использует english_stem).
+SEARCH_CONFIG = "russian"
+
+# Популярность продукта - сумма вкладов покупок и отзывов, каждый вклад убывает
+# вдвое за POPULARITY_HALF_LIFE. Хранимые значения со временем не пересчитываются:
+# вклад события сразу умножается на 2^((момент события - POPULARITY_EPOCH) / период),
+# порядок продуктов при этом тот же, что и при честном затухании всех вкладов.
+# Запаса float хватит на ~80 лет от POPULARITY_EPOCH (при периоде 30 дней).
+POPULARITY_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+POPULARITY_HALF_LIFE = timedelta(days=30)
+# Вес одной купленной единицы продукта и вес отзыва с оценкой 5.
+POPULARITY_PURCHASE_WEIGHT = 1.0
+POPULARITY_REVIEW_WEIGHT = 2.0
+
+
+def rating_expression(rate_sum: Combinable, reviews_count: Combinable) -> Case:
+    """
+    Выражение для расчёта среднего рейтинга на стороне БД (округление до 2 знаков).
+    Используется при обновлении хранимых полей продукта.
+
+    :param rate_sum: Выражение суммы оценок.
+    :param reviews_count: Выражение количества отзывов.
+    :return: Выражение среднего рейтинга (0, если отзывов нет).
+    """
+    return Case(
+        When(
+            GreaterThan(reviews_count, 0),
+            then=Round(
+                Cast(
+                    rate_sum, output_field=DecimalField(max_digits=12, decimal_places=6)
+                )
+                / reviews_count,
+                precision=2,
+            ),
+        ),
+        default=Value(0),
+        output_field=DecimalField(max_digits=3, decimal_places=2),
+    )
+
+
+def popularity_decay(moment: datetime) -> float:
+    """
+    Множитель вклада события в популярность (см. POPULARITY_EPOCH).
+
+    :param moment: Момент события.
+    :return: Множитель.
+    """
+    return 2 ** ((moment - POPULARITY_EPOCH) / POPULARITY_HALF_LIFE)
+
+
+def popularity_decay_expression(moment: Combinable) -> Power:
+    """
+    Выражение множителя вклада события в популярность на стороне БД
+    (то же, что popularity_decay).
+
+    :param moment: Выражение момента события.
+    :return: Выражение множителя.
+    """
+    seconds = Cast(
+        Extract(moment, "epoch", tzinfo=dt_timezone.utc), output_field=FloatField()
+    )
+    return Power(
+        Value(2.0),
+        (seconds - POPULARITY_EPOCH.timestamp()) / POPULARITY_HALF_LIFE.total_seconds(),
+        output_field=FloatField(),
+    )
+
+
+def purchase_popularity(count: int, moment: datetime) -> float:
+    """
+    Вклад покупки в популярность продукта.
+
+    :param count: Количество купленных единиц.
+    :param moment: Момент оплаты.
+    :return: Вклад.
+    """
+    return POPULARITY_PURCHASE_WEIGHT * count * popularity_decay(moment)
+
+
+def review_popularity(rate: int, moment: datetime) -> float:
+    """
+    Вклад отзыва в популярность продукта (пропорционален оценке).
+
+    :param rate: Оценка.
+    :param moment: Дата отзыва.
+    :return: Вклад.
+    """
+    return POPULARITY_REVIEW_WEIGHT * rate / 5 * popularity_decay(moment)
+
 
 class Product(models.Model):
     """
@@ -24,7 +133,17 @@ class Product(models.Model):
     **full_description** - Полное описание продукта. \n
     **free_delivery** - Есть ли бесплатная доставка. \n
     **tags** - Теги продукта.  \n
-    **archived** - Является ли продукт архивированным.
+    **archived** - Является ли продукт архивированным. \n
+    **reviews_count** - Количество отзывов (поддерживается сигналами Review). \n
+    **rate_sum** - Сумма оценок отзывов (поддерживается сигналами Review). \n
+    **rating** - Средний рейтинг (поддерживается сигналами Review). \n
+    **active_sale** - Действующая акция (поддерживается сигналами Sale и командой sync_sales). \n
+    **sale_price** - Цена со скидкой действующей акции. \n
+    **sale_price_before** - Мнимая цена действующей акции (якобы цена до акции). \n
+    **effective_price** - Актуальная цена (вычисляется БД: цена акции, иначе цена продукта). \n
+    **search_vector** - Вектор полнотекстового поиска по названию и описанию (вычисляется БД). \n
+    **popularity** - Популярность: покупки и отзывы с затуханием (поддерживается оплатой
+    заказов, сигналами Review и командой rebuild_product_popularity).
     """
 
     category = models.ForeignKey(
@@ -62,17 +181,89 @@ class Product(models.Model):
     archived = models.BooleanField(
         _("archived"), default=False, null=False, blank=False
     )
+    reviews_count = models.PositiveIntegerField(
+        _("reviews count"), default=0, null=False, editable=False
+    )
+    rate_sum = models.PositiveIntegerField(
+        _("rate sum"), default=0, null=False, editable=False
+    )
+    rating = models.DecimalField(
+        _("rating"),
+        max_digits=3,
+        decimal_places=2,
+        default=Decimal("0"),
+        null=False,
+        editable=False,
+    )
+    active_sale = models.ForeignKey(
+        "product_app.Sale",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        default=None,
+        editable=False,
+    )
+    sale_price = models.DecimalField(
+        _("sale price"),
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        default=None,
+        editable=False,
+    )
+    sale_price_before = models.DecimalField(
+        _("sale price before"),
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        default=None,
+        editable=False,
+    )
+    effective_price = models.GeneratedField(
+        expression=Coalesce("sale_price", "price"),
+        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        db_persist=True,
+        db_index=True,
+        verbose_name=_("effective price"),
+    )
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    popularity = models.FloatField(
+        _("popularity"), default=0, null=False, editable=False
+    )
+
+    # Подкатегория и архивация, загруженные из БД (нужны для сброса кэша каталога
+    # и пересчёта SubCategoryTagCount при переносе/архивации).
+    loaded_category_id: Optional[int] = None
+    loaded_archived: Optional[bool] = None
+
+    @classmethod
+    def from_db(
+        cls, db: Optional[str], field_names: Sequence[str], values: Sequence[Any]
+    ) -> "Product":
+        """
+        Запоминаем загруженные из БД подкатегорию и архивацию.
+
+        :param db: Алиас БД.
+        :param field_names: Имена загруженных полей.
+        :param values: Значения загруженных полей.
+        :return: Product.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_category_id = instance.__dict__.get("category_id")
+        instance.loaded_archived = instance.__dict__.get("archived")
+        return instance
 
     def get_actual_price(self) -> Decimal:
         """
-        Возвращает цену с учетом активной акции.
+        Возвращает цену с учетом активной акции (хранимое значение, без запроса к акциям).
         :return: Актуальная цена.
         """
-        today = timezone.now().date()
-        active_sale = self.sales.filter(
-            date_from__lte=today, date_to__gte=today
-        ).first()
-        return active_sale.sale_price if active_sale else self.price
+        return self.sale_price if self.sale_price is not None else self.price
 
     def get_imaginary_price(self) -> Optional[Decimal]:
         """
@@ -81,20 +272,189 @@ class Product(models.Model):
 
         :return: Мнимую цену, если акция есть, иначе None.
         """
-        today = timezone.now().date()
-        active_sale = self.sales.filter(
-            date_from__lte=today, date_to__gte=today
-        ).first()
-        return active_sale.price if active_sale else None
+        return self.sale_price_before
+
+    @classmethod
+    def sync_sales(
+        cls, queryset: "QuerySet[Product]", today: Optional[date] = None
+    ) -> int:
+        """
+        Проставит продуктам из queryset действующую на дату today акцию
+        (или уберёт её, если акция закончилась / ещё не началась).
+
+        :param queryset: QuerySet продуктов.
+        :param today: Дата, по умолчанию текущая.
+        :return: Количество обновлённых продуктов.
+        """
+        from product_app.models.sale import Sale
+
+        today = today or timezone.now().date()
+        # При нескольких подходящих акциях берём ту же, что и Meta.ordering Sale.
+        active_sales = Sale.objects.filter(
+            product=OuterRef("pk"), date_from__lte=today, date_to__gte=today
+        ).order_by("-date_to")
+        updated: int = queryset.update(
+            active_sale=Subquery(active_sales.values("pk")[:1]),
+            sale_price=Subquery(active_sales.values("sale_price")[:1]),
+            sale_price_before=Subquery(active_sales.values("price")[:1]),
+        )
+        return updated
 
     def get_rating(self) -> float:
         """
-        Вернёт средний рейтинг продукта.
+        Вернёт средний рейтинг продукта (хранимое значение, без запроса к отзывам).
 
         :return: Средний рейтинг.
         """
-        rating = self.reviews.aggregate(rating=Avg("rate"))
-        return round(rating["rating"], 2) if rating["rating"] else 0
+        return float(self.rating) if self.reviews_count else 0
+
+    @classmethod
+    def change_rating(
+        cls,
+        product_id: int,
+        count_delta: int,
+        rate_delta: int,
+        popularity_delta: float = 0,
+    ) -> None:
+        """
+        Атомарно изменит хранимые количество отзывов, сумму оценок, рейтинг
+        и популярность продукта одним UPDATE
+        (без блокировок и без агрегации по таблице отзывов).
+
+        :param product_id: ID продукта.
+        :param count_delta: Изменение количества отзывов.
+        :param rate_delta: Изменение суммы оценок.
+        :param popularity_delta: Изменение популярности.
+        :return: None.
+        """
+        new_count = F("reviews_count") + count_delta
+        new_sum = F("rate_sum") + rate_delta
+        cls.objects.filter(pk=product_id).update(
+            reviews_count=new_count,
+            rate_sum=new_sum,
+            rating=rating_expression(new_sum, new_count),
+            popularity=F("popularity") + popularity_delta,
+        )
+
+    @classmethod
+    def change_popularity(cls, deltas: Dict[int, float]) -> None:
+        """
+        Атомарно изменит хранимую популярность нескольких продуктов одним UPDATE.
+
+        :param deltas: Изменение популярности по ID продуктов.
+        :return: None.
+        """
+        if not deltas:
+            return
+        cls.objects.filter(pk__in=deltas).update(
+            popularity=F("popularity")
+            + Case(
+                *(When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+
+    @classmethod
+    def rebuild_popularity(cls, queryset: "QuerySet[Product]") -> int:
+        """
+        Пересчитает хранимую популярность продуктов из queryset
+        по оплаченным заказам и отзывам (исправление расхождений).
+
+        :param queryset: QuerySet продуктов.
+        :return: Количество обновлённых продуктов.
+        """
+        from order_app.models import Basket
+        from product_app.models.review import Review
+
+        purchases = (
+            Basket.objects.filter(product=OuterRef("pk"), order__paid_for=True)
+            .order_by()
+            .values("product")
+            .annotate(
+                s=Sum(
+                    F("count")
+                    * popularity_decay_expression(
+                        Coalesce("order__paid_at", "order__created_at")
+                    ),
+                    output_field=FloatField(),
+                )
+            )
+            .values("s")
+        )
+        reviews = (
+            Review.objects.filter(product=OuterRef("pk"))
+            .order_by()
+            .values("product")
+            .annotate(
+                s=Sum(
+                    F("rate") * popularity_decay_expression(F("date")),
+                    output_field=FloatField(),
+                )
+            )
+            .values("s")
+        )
+        updated: int = queryset.update(
+            popularity=POPULARITY_PURCHASE_WEIGHT * Coalesce(Subquery(purchases), 0.0)
+            + POPULARITY_REVIEW_WEIGHT / 5 * Coalesce(Subquery(reviews), 0.0)
+        )
+        return updated
+
+    @classmethod
+    def rebuild_rating(cls, queryset: "QuerySet[Product]") -> int:
+        """
+        Пересчитает хранимые количество отзывов, сумму оценок и рейтинг
+        для продуктов из queryset по таблице отзывов (исправление расхождений).
+
+        :param queryset: QuerySet продуктов.
+        :return: Количество обновлённых продуктов.
+        """
+        from product_app.models.review import Review
+
+        reviews = (
+            Review.objects.filter(product=OuterRef("pk")).order_by().values("product")
+        )
+        updated: int = queryset.update(
+            reviews_count=Coalesce(
+                Subquery(reviews.annotate(c=Count("pk")).values("c")), 0
+            ),
+            rate_sum=Coalesce(Subquery(reviews.annotate(s=Sum("rate")).values("s")), 0),
+        )
+        queryset.update(rating=rating_expression(F("rate_sum"), F("reviews_count")))
+        return updated
+
+    class Meta:
+        """
+        Метаданные.
+        """
+
+        indexes = (
+            GinIndex(fields=["search_vector"], name="product_search_vector_gin"),
+            # Каталог подкатегории (живые продукты) с сортировкой по цене.
+            models.Index(
+                fields=["category", "free_delivery", "effective_price"],
+                condition=Q(archived=False),
+                name="product_live_category_idx",
+            ),
+            # Сортировка каталога по рейтингу.
+            models.Index(
+                fields=["-rating"],
+                condition=Q(archived=False),
+                name="product_live_rating_idx",
+            ),
+            # Популярные продукты (хранимая популярность) и сортировка каталога по ней.
+            models.Index(
+                fields=["-popularity"],
+                condition=Q(archived=False),
+                name="product_live_popularity_idx",
+            ),
+            # Заканчивающиеся продукты (порог - CatalogLimitedAPIView.count).
+            models.Index(
+                fields=["count"],
+                condition=Q(archived=False, count__lte=10),
+                name="product_low_stock_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         """
@@ -4,6 +4,8 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from product_app.models.product import Product
 
+from shop_app.thumbnails import ImageStatus
+
 
 def product_image_directory_path(instance: "ProductImage", filename: str) -> str:
     """
@@ -22,6 +24,7 @@ class ProductImage(models.Model):
 
     **title** - Краткое описание (будет показано, если вдруг изображение будет не доступно). \n
     **image** - Изображение продукта. \n
+    **image_status** - Статус обработки изображения (производные изображения). \n
     **product** - Продукт. \n
     """
 
@@ -29,6 +32,13 @@ class ProductImage(models.Model):
     image = models.ImageField(
         _("image"), null=True, blank=False, upload_to=product_image_directory_path
     )
+    image_status = models.CharField(
+        _("image status"),
+        max_length=16,
+        choices=ImageStatus.choices,
+        default=ImageStatus.READY,
+        editable=False,
+    )
     product = models.ForeignKey(
         Product, on_delete=models.CASCADE, related_name="images"
     )
@@ -1,3 +1,5 @@
+from typing import Any, Optional, Sequence
+
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
@@ -32,6 +34,27 @@ class Review(models.Model):
         validators=[MinValueValidator(1), MaxValueValidator(5)],
     )
 
+    # Значения, загруженные из БД (нужны для расчёта разницы при изменении отзыва).
+    loaded_rate: Optional[int] = None
+    loaded_product_id: Optional[int] = None
+
+    @classmethod
+    def from_db(
+        cls, db: Optional[str], field_names: Sequence[str], values: Sequence[Any]
+    ) -> "Review":
+        """
+        Запоминаем загруженные из БД оценку и продукт.
+
+        :param db: Алиас БД.
+        :param field_names: Имена загруженных полей.
+        :param values: Значения загруженных полей.
+        :return: Review.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_rate = instance.__dict__.get("rate")
+        instance.loaded_product_id = instance.__dict__.get("product_id")
+        return instance
+
     def __str__(self) -> str:
         """
         Строковое представление.
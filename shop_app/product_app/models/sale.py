@@ -1,14 +1,33 @@
 from decimal import Decimal
+from typing import Any, Optional, Sequence
 
+from django.contrib.postgres.fields import DateRangeField
+from django.contrib.postgres.indexes import GistIndex
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, Func, Q, Value
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from product_app.models import Product
 
 
+def sale_period() -> Func:
+    """
+    Период акции в виде диапазона дат (обе даты включительно).
+    Действующие акции: alias(period=sale_period()).filter(period__contains=сегодня).
+
+    :return: Выражение daterange(date_from, date_to, '[]').
+    """
+    return Func(
+        F("date_from"),
+        F("date_to"),
+        Value("[]"),
+        function="daterange",
+        output_field=DateRangeField(),
+    )
+
+
 class Sale(models.Model):
     """
     Модель распродажи.
@@ -42,6 +61,25 @@ class Sale(models.Model):
     )
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
 
+    # Продукт, загруженный из БД (при переносе акции нужно обновить и прежний).
+    loaded_product_id: Optional[int] = None
+
+    @classmethod
+    def from_db(
+        cls, db: Optional[str], field_names: Sequence[str], values: Sequence[Any]
+    ) -> "Sale":
+        """
+        Запоминаем загруженный из БД продукт.
+
+        :param db: Алиас БД.
+        :param field_names: Имена загруженных полей.
+        :param values: Значения загруженных полей.
+        :return: Sale.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_product_id = instance.__dict__.get("product_id")
+        return instance
+
     def clean(self) -> None:
         """
         Будут проведена валидация данных, ошибки будут отображаться в админ панели.
@@ -84,3 +122,8 @@ class Sale(models.Model):
         verbose_name = _("sale")
         verbose_name_plural = _("sales")
         ordering = ("-date_to",)
+        indexes = (
+            # Действующие акции: GiST по периоду и точная оценка их количества
+            # (статистика по выражению индекса), в отличие от пары date_from/date_to.
+            GistIndex(sale_period(), name="sale_period_gist"),
+        )
@@ -5,6 +5,8 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from product_app.models.category import Category
 
+from shop_app.thumbnails import ImageStatus
+
 
 def subcategory_image_directory_path(instance: "SubCategory", filename: str) -> str:
     """
@@ -21,7 +23,9 @@ class SubCategory(models.Model):
     Модель подкатегории.
 
     **name** - Имя подкатегории. \n
-    **category** - Категория.
+    **category** - Категория. \n
+    **image** - Изображение подкатегории. \n
+    **image_status** - Статус обработки изображения (производные изображения).
     """
 
     unique_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
@@ -31,6 +35,13 @@ class SubCategory(models.Model):
     image = models.ImageField(
         _("image"), upload_to=subcategory_image_directory_path, null=True, blank=False
     )
+    image_status = models.CharField(
+        _("image status"),
+        max_length=16,
+        choices=ImageStatus.choices,
+        default=ImageStatus.READY,
+        editable=False,
+    )
     category = models.ForeignKey(
         Category, on_delete=models.PROTECT, related_name="subcategories"
     )
@@ -6,10 +6,25 @@ class Tag(models.Model):
     """
     Модель тега.
 
-    **name** - Имя тега.
+    **name** - Имя тега. \n
+    **products_count** - Количество живых продуктов с тегом
+    (сумма SubCategoryTagCount по подкатегориям).
     """
 
     name = models.CharField(_("name"), max_length=100, null=False, blank=False)
+    products_count = models.PositiveIntegerField(
+        _("products count"), default=0, null=False, editable=False
+    )
+
+    class Meta:
+        """
+        Метаданные.
+        """
+
+        indexes = (
+            # Популярные теги всего каталога (/api/tags без категории).
+            models.Index(fields=["-products_count"], name="tag_products_count_idx"),
+        )
 
     def __str__(self) -> str:
         """
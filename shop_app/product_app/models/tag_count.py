@@ -0,0 +1,130 @@
+from typing import Iterable, Optional, Set
+
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils.translation import gettext_lazy as _
+from product_app.models.product import Product
+from product_app.models.subcategory import SubCategory
+from product_app.models.tag import Tag
+
+
+class SubCategoryTagCount(models.Model):
+    """
+    Модель количества живых (не в архиве) продуктов подкатегории с тегом.
+    Поддерживается сигналами (теги, подкатегория и архивация продукта)
+    и командой rebuild_tag_counts. Сумма по подкатегориям хранится в Tag.products_count.
+
+    **subcategory** - Подкатегория. \n
+    **tag** - Тег. \n
+    **products_count** - Количество продуктов.
+    """
+
+    subcategory = models.ForeignKey(
+        SubCategory, on_delete=models.CASCADE, related_name="tag_counts"
+    )
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="tag_counts")
+    products_count = models.PositiveIntegerField(
+        _("products count"), default=0, null=False
+    )
+
+    @classmethod
+    def refresh(
+        cls,
+        subcategory_ids: Optional[Iterable[Optional[int]]],
+        tag_ids: Optional[Iterable[int]],
+    ) -> None:
+        """
+        Пересчитает количество продуктов для всех пар из подкатегорий subcategory_ids
+        и тегов tag_ids (None - все подкатегории/все теги) и сумму по тегам.
+        Считаются только связи выбранных пар, а не весь каталог.
+
+        :param subcategory_ids: ID подкатегорий.
+        :param tag_ids: ID тегов.
+        :return: None.
+        """
+        rows = cls.objects.all()
+        links = Product.tags.through.objects.filter(product__archived=False)
+        if subcategory_ids is not None:
+            subcategory_ids = [pk for pk in subcategory_ids if pk is not None]
+            rows = rows.filter(subcategory_id__in=subcategory_ids)
+            links = links.filter(product__category_id__in=subcategory_ids)
+        if tag_ids is not None:
+            tag_ids = list(tag_ids)
+            rows = rows.filter(tag_id__in=tag_ids)
+            links = links.filter(tag_id__in=tag_ids)
+        with transaction.atomic():
+            counts = [
+                cls(subcategory_id=subcategory_id, tag_id=tag_id, products_count=count)
+                for subcategory_id, tag_id, count in links.values(
+                    "product__category_id", "tag_id"
+                )
+                .annotate(count=Count("pk"))
+                .values_list("product__category_id", "tag_id", "count")
+                .order_by()
+            ]
+            changed_tags: Set[int] = set(rows.values_list("tag_id", flat=True))
+            changed_tags.update(count.tag_id for count in counts)
+            rows.delete()
+            cls.objects.bulk_create(
+                counts,
+                update_conflicts=True,
+                unique_fields=["subcategory", "tag"],
+                update_fields=["products_count"],
+            )
+            cls.refresh_totals(Tag.objects.filter(pk__in=changed_tags))
+
+    @classmethod
+    def refresh_totals(cls, tags: "QuerySet[Tag]") -> int:
+        """
+        Пересчитает Tag.products_count (сумму по подкатегориям) для тегов из queryset.
+
+        :param tags: QuerySet тегов.
+        :return: Количество обновлённых тегов.
+        """
+        totals = (
+            cls.objects.filter(tag=OuterRef("pk"))
+            .order_by()
+            .values("tag")
+            .annotate(s=Sum("products_count"))
+            .values("s")
+        )
+        updated: int = tags.update(products_count=Coalesce(Subquery(totals), 0))
+        return updated
+
+    class Meta:
+        """
+        Метаданные.
+        """
+
+        constraints = (
+            models.UniqueConstraint(
+                fields=["subcategory", "tag"], name="subcategory_tag_count_unique"
+            ),
+        )
+        indexes = (
+            # Популярные теги подкатегории (/api/tags?category=...).
+            models.Index(
+                fields=["subcategory", "-products_count"],
+                name="subcategory_tag_count_top_idx",
+            ),
+        )
+
+    def __str__(self) -> str:
+        """
+        Строковое представление.
+
+        :return: Подкатегория, тег и количество.
+        """
+        return f"{self.subcategory_id}/{self.tag_id}: {self.products_count}"
+
+    def __repr__(self) -> str:
+        """
+        Строковое представление для отладки.
+
+        :return: SubCategoryTagCount(Подкатегория, тег, количество).
+        """
+        return (
+            f"SubCategoryTagCount({self.subcategory_id}, {self.tag_id}, "
+            f"{self.products_count})"
+        )
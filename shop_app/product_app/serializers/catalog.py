@@ -20,6 +20,19 @@ class OutCatalogSerializer(serializers.Serializer[Page[Product]]):
     lastPage = serializers.IntegerField(read_only=True, source="paginator.num_pages")
 
 
+class OutCatalogCursorSerializer(serializers.Serializer[Any]):
+    """
+    Serializer каталога исходящих данных (курсорная пагинация).
+    """
+
+    items = OutCatalogProductSerializer(many=True, read_only=True, source="object_list")
+    currentPage = serializers.IntegerField(read_only=True, source="number")
+    lastPage = serializers.IntegerField(read_only=True, source="last_page")
+    nextCursor = serializers.CharField(
+        read_only=True, source="next_cursor", allow_null=True
+    )
+
+
 class InFilterSerializer(serializers.Serializer[Dict[str, Any]]):
     """
     Serializer для фильтра каталога входящих данных.
@@ -76,6 +89,8 @@ class InCatalogSerializer(serializers.Serializer[Dict[str, Any]]):
             ("price", "price"),
             ("reviews", "reviews"),
             ("date", "date"),
+            ("relevance", "relevance"),
+            ("popularity", "popularity"),
         ],
         required=True,
     )
@@ -86,6 +101,12 @@ class InCatalogSerializer(serializers.Serializer[Dict[str, Any]]):
     tags = serializers.ListField(
         required=False, allow_empty=False, child=serializers.IntegerField(min_value=1)
     )
+    tagsMode = serializers.ChoiceField(
+        choices=[("any", "any"), ("all", "all")], required=False, default="any"
+    )
+    cursor = serializers.CharField(
+        required=False, allow_blank=True, max_length=1000, trim_whitespace=True
+    )
 
 
 class InCurrentPageSerializer(serializers.Serializer[Dict[str, Any]]):
@@ -106,3 +127,41 @@ class OutCatalogSalesSerializer(serializers.Serializer[Page[Sale]]):
     )
     currentPage = serializers.IntegerField(read_only=True, source="number")
     lastPage = serializers.IntegerField(read_only=True, source="paginator.num_pages")
+
+
+class OutFacetTagSerializer(serializers.Serializer[Dict[str, Any]]):
+    """
+    Serializer фасета тега исходящих данных.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    count = serializers.IntegerField(read_only=True)
+
+
+class OutFacetPriceBucketSerializer(serializers.Serializer[Dict[str, Any]]):
+    """
+    Serializer интервала гистограммы цен исходящих данных.
+    """
+
+    min = serializers.DecimalField(read_only=True, max_digits=10, decimal_places=2)
+    max = serializers.DecimalField(read_only=True, max_digits=10, decimal_places=2)
+    count = serializers.IntegerField(read_only=True)
+
+
+class OutCatalogFacetsSerializer(serializers.Serializer[Dict[str, Any]]):
+    """
+    Serializer фасетов каталога исходящих данных.
+    """
+
+    total = serializers.IntegerField(read_only=True)
+    freeDelivery = serializers.IntegerField(read_only=True)
+    available = serializers.IntegerField(read_only=True)
+    minPrice = serializers.DecimalField(
+        read_only=True, max_digits=10, decimal_places=2, allow_null=True
+    )
+    maxPrice = serializers.DecimalField(
+        read_only=True, max_digits=10, decimal_places=2, allow_null=True
+    )
+    tags = OutFacetTagSerializer(many=True, read_only=True)
+    histogram = OutFacetPriceBucketSerializer(many=True, read_only=True)
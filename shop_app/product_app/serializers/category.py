@@ -4,6 +4,8 @@ from django.db.models.fields.files import ImageFieldFile
 from product_app.models import Category, SubCategory
 from rest_framework import serializers
 
+from shop_app.thumbnails import get_file_sizes, get_file_srcset
+
 
 class OutImageSerializer(serializers.Serializer[Any]):
     """
@@ -12,6 +14,9 @@ class OutImageSerializer(serializers.Serializer[Any]):
 
     src = serializers.SerializerMethodField()
     alt = serializers.CharField(default="No Image")
+    srcset = serializers.SerializerMethodField()
+    srcsetWebp = serializers.SerializerMethodField(method_name="get_srcset_webp")
+    sizes = serializers.SerializerMethodField()
 
     @staticmethod
     def get_src(image: Optional[ImageFieldFile]) -> Optional[str]:
@@ -25,6 +30,36 @@ class OutImageSerializer(serializers.Serializer[Any]):
             return image.url
         return None
 
+    @staticmethod
+    def get_srcset(image: Optional[ImageFieldFile]) -> Optional[str]:
+        """
+        Функция вернёт srcset уменьшенных копий image в JPEG, иначе None.
+
+        :param image: Optional[ImageFieldFile].
+        :return: srcset или None.
+        """
+        return get_file_srcset(image, "jpg")
+
+    @staticmethod
+    def get_srcset_webp(image: Optional[ImageFieldFile]) -> Optional[str]:
+        """
+        Функция вернёт srcset уменьшенных копий image в WebP, иначе None.
+
+        :param image: Optional[ImageFieldFile].
+        :return: srcset или None.
+        """
+        return get_file_srcset(image, "webp")
+
+    @staticmethod
+    def get_sizes(image: Optional[ImageFieldFile]) -> Optional[str]:
+        """
+        Функция вернёт sizes для srcset, если image существует, иначе None.
+
+        :param image: Optional[ImageFieldFile].
+        :return: sizes или None.
+        """
+        return get_file_sizes(image)
+
 
 class OutSubCategorySerializer(serializers.ModelSerializer[SubCategory]):
     """
@@ -6,6 +6,8 @@ from product_app.serializers.review import ReviewSerializer
 from product_app.serializers.tag import OutTagSerializer
 from rest_framework import serializers
 
+from shop_app.thumbnails import get_file_sizes, get_file_srcset
+
 
 class OutProductImageSerializer(serializers.ModelSerializer[ProductImage]):
     """
@@ -14,10 +16,15 @@ class OutProductImageSerializer(serializers.ModelSerializer[ProductImage]):
 
     src = serializers.SerializerMethodField(read_only=True)
     alt = serializers.CharField(read_only=True, source="title")
+    srcset = serializers.SerializerMethodField(read_only=True)
+    srcsetWebp = serializers.SerializerMethodField(
+        read_only=True, method_name="get_srcset_webp"
+    )
+    sizes = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = ProductImage
-        fields = ("src", "alt")
+        fields = ("src", "alt", "srcset", "srcsetWebp", "sizes")
 
     @staticmethod
     def get_src(obj: ProductImage) -> Optional[str]:
@@ -29,6 +36,36 @@ class OutProductImageSerializer(serializers.ModelSerializer[ProductImage]):
         """
         return obj.image.url if obj.image else None
 
+    @staticmethod
+    def get_srcset(obj: ProductImage) -> Optional[str]:
+        """
+        Функция вернёт srcset уменьшенных копий image в JPEG, иначе None.
+
+        :param obj: ProductImage.
+        :return: srcset или None.
+        """
+        return get_file_srcset(obj.image, "jpg")
+
+    @staticmethod
+    def get_srcset_webp(obj: ProductImage) -> Optional[str]:
+        """
+        Функция вернёт srcset уменьшенных копий image в WebP, иначе None.
+
+        :param obj: ProductImage.
+        :return: srcset или None.
+        """
+        return get_file_srcset(obj.image, "webp")
+
+    @staticmethod
+    def get_sizes(obj: ProductImage) -> Optional[str]:
+        """
+        Функция вернёт sizes для srcset, если image существует, иначе None.
+
+        :param obj: ProductImage.
+        :return: sizes или None.
+        """
+        return get_file_sizes(obj.image)
+
 
 class OutSpecificationSerializer(serializers.ModelSerializer[Specification]):
     """
@@ -107,7 +144,7 @@ class OutProductSerializer(serializers.ModelSerializer[Product]):
         :param obj: Product.
         :return: Id подкатегории.
         """
-        return int(obj.category.pk)
+        return int(obj.category_id)
 
 
 class OutCatalogProductSerializer(serializers.ModelSerializer[Product]):
@@ -150,7 +187,7 @@ class OutCatalogProductSerializer(serializers.ModelSerializer[Product]):
         :param obj: Product.
         :return: Id подкатегории.
         """
-        return int(obj.category.pk)
+        return int(obj.category_id)
 
     @staticmethod
     def get_price(obj: Product) -> Decimal:
@@ -166,11 +203,11 @@ class OutCatalogProductSerializer(serializers.ModelSerializer[Product]):
     @staticmethod
     def get_reviews(obj: Product) -> int:
         """
-        Определит количество отзывов.
+        Определит количество отзывов (хранимое значение).
 
         :return: Количество отзывов
         """
-        return int(obj.reviews.count())
+        return int(obj.reviews_count)
 
     @staticmethod
     def get_rating(obj: Product) -> float:
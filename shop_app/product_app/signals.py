@@ -1,102 +1,392 @@
-from typing import Any
+from typing import Any, FrozenSet, Optional, Set, Type, Union
 
-from django.db.models.signals import pre_delete, pre_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
-from product_app.models import Category, ProductImage, SubCategory
-from utils import delete_file
+from product_app.api_views.catalog.cache import (
+    invalidate_catalog_for_products,
+    invalidate_catalog_for_subcategories,
+    invalidate_catalog_for_tags,
+    invalidate_categories,
+)
+from product_app.models import (
+    Category,
+    Product,
+    ProductImage,
+    Review,
+    Sale,
+    Specification,
+    SubCategory,
+    SubCategoryTagCount,
+    Tag,
+)
+from product_app.models.product import review_popularity
 
+from shop_app.image_processing import (
+    delete_image_on_commit,
+    enqueue_image_processing,
+    mark_image_changes,
+    remember_loaded_image,
+)
 
-@receiver(pre_delete, sender=ProductImage)
-def delete_image_file_when_deleting_model_product_image(
-    instance: ProductImage, **kwargs: Any
+
+@receiver(post_init, sender=ProductImage)
+@receiver(post_init, sender=Category)
+@receiver(post_init, sender=SubCategory)
+def remember_image_file_when_init_model(
+    instance: Union[ProductImage, Category, SubCategory], **kwargs: Any
 ) -> None:
     """
-    Удаляем файл изображения, при удалении модели ProductImage.
+    Запоминаем имя загруженного файла изображения, чтобы при сохранении
+    сравнивать его без запроса к БД.
 
-    :param instance: ProductImage.
+    :param instance: ProductImage, Category или SubCategory.
     :param kwargs: Any.
     :return: None.
     """
-    if instance.image:
-        delete_file(instance.image.path)
+    remember_loaded_image(instance, "image")
 
 
 @receiver(pre_save, sender=ProductImage)
-def delete_image_file_when_saving_model_product_image(
-    instance: ProductImage, **kwargs: Any
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=SubCategory)
+def mark_image_file_when_saving_model(
+    instance: Union[ProductImage, Category, SubCategory],
+    update_fields: Optional[FrozenSet[str]] = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Если файл изображения при сохранении отличается, отмечаем его замену:
+    старый файл удалит фоновая задача обработки изображения.
+
+    :param instance: ProductImage, Category или SubCategory.
+    :param update_fields: Сохраняемые поля (None - все).
+    :param kwargs: Any.
+    :return: None.
+    """
+    mark_image_changes(instance, "image", update_fields)
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=SubCategory)
+def enqueue_image_processing_when_saving_model(
+    instance: Union[ProductImage, Category, SubCategory], **kwargs: Any
 ) -> None:
     """
-    Удаляем файл изображения, если при сохранении он отличается.
+    Ставим в очередь обработку нового изображения (проверка, удаление EXIF,
+    производные изображения, удаление заменённого файла), ответ не ждёт обработки.
 
-    :param instance: ProductImage.
+    :param instance: ProductImage, Category или SubCategory.
     :param kwargs: Any.
     :return: None.
     """
-    if instance.pk:
-        old_instance = ProductImage.objects.get(pk=instance.pk)
-        if old_instance.image and old_instance.image != instance.image:
-            delete_file(old_instance.image.path)
+    enqueue_image_processing(instance, "image")
 
 
+@receiver(pre_delete, sender=ProductImage)
 @receiver(pre_delete, sender=Category)
-def delete_image_file_when_deleting_model_category(
-    instance: Category, **kwargs: Any
+@receiver(pre_delete, sender=SubCategory)
+def delete_image_file_when_deleting_model(
+    instance: Union[ProductImage, Category, SubCategory], **kwargs: Any
 ) -> None:
     """
-    Удаляем файл изображения, при удалении модели Category.
+    Удаляем файл изображения и его производные при удалении модели
+    (после фиксации транзакции, пачкой).
 
-    :param instance: Category.
+    :param instance: ProductImage, Category или SubCategory.
     :param kwargs: Any.
     :return: None.
     """
-    if instance.image:
-        delete_file(instance.image.path)
+    delete_image_on_commit(instance.image)
 
 
-@receiver(pre_save, sender=Category)
-def delete_image_file_when_saving_model_category(
-    instance: Category, **kwargs: Any
+def refresh_cached_product_rating(instance: Review) -> None:
+    """
+    Если к отзыву подцеплен объект продукта, обновим у него хранимые поля рейтинга
+    и популярности, чтобы объект в памяти не расходился с БД.
+
+    :param instance: Review.
+    :return: None.
+    """
+    if Review.product.is_cached(instance):
+        instance.product.refresh_from_db(
+            fields=["reviews_count", "rate_sum", "rating", "popularity"]
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_product_rating_when_saving_model_review(
+    instance: Review, created: bool, **kwargs: Any
 ) -> None:
     """
-    Удаляем файл изображения, если при сохранении он отличается.
+    Обновляем количество отзывов и рейтинг продукта при создании/изменении отзыва.
 
-    :param instance: Category.
+    :param instance: Review.
+    :param created: Создан ли отзыв.
     :param kwargs: Any.
     :return: None.
     """
-    if instance.pk:
-        old_instance = Category.objects.get(pk=instance.pk)
-        if old_instance.image and old_instance.image != instance.image:
-            delete_file(old_instance.image.path)
+    popularity = review_popularity(instance.rate, instance.date)
+    if created:
+        Product.change_rating(instance.product_id, 1, instance.rate, popularity)
+    elif instance.loaded_rate is None or instance.loaded_product_id is None:
+        # Предыдущее состояние неизвестно, пересчитаем продукт целиком.
+        products = Product.objects.filter(pk=instance.product_id)
+        Product.rebuild_rating(products)
+        Product.rebuild_popularity(products)
+    elif instance.loaded_product_id != instance.product_id:
+        Product.change_rating(
+            instance.loaded_product_id,
+            -1,
+            -instance.loaded_rate,
+            -review_popularity(instance.loaded_rate, instance.date),
+        )
+        Product.change_rating(instance.product_id, 1, instance.rate, popularity)
+    elif instance.loaded_rate != instance.rate:
+        Product.change_rating(
+            instance.product_id,
+            0,
+            instance.rate - instance.loaded_rate,
+            popularity - review_popularity(instance.loaded_rate, instance.date),
+        )
+    else:
+        return
+    invalidate_catalog_for_products({instance.loaded_product_id, instance.product_id})
+    instance.loaded_rate = instance.rate
+    instance.loaded_product_id = instance.product_id
+    refresh_cached_product_rating(instance)
 
 
-@receiver(pre_delete, sender=SubCategory)
-def delete_image_file_when_deleting_model_subcategory(
-    instance: SubCategory, **kwargs: Any
+@receiver(post_delete, sender=Review)
+def update_product_rating_when_deleting_model_review(
+    instance: Review, **kwargs: Any
 ) -> None:
     """
-    Удаляем файл изображения, при удалении модели SubCategory.
+    Обновляем количество отзывов и рейтинг продукта при удалении отзыва.
 
-    :param instance: SubCategory.
+    :param instance: Review.
     :param kwargs: Any.
     :return: None.
     """
-    if instance.image:
-        delete_file(instance.image.path)
+    if instance.loaded_rate is not None and instance.loaded_product_id is not None:
+        Product.change_rating(
+            instance.loaded_product_id,
+            -1,
+            -instance.loaded_rate,
+            -review_popularity(instance.loaded_rate, instance.date),
+        )
+    else:
+        products = Product.objects.filter(pk=instance.product_id)
+        Product.rebuild_rating(products)
+        Product.rebuild_popularity(products)
+    invalidate_catalog_for_products([instance.product_id])
+    refresh_cached_product_rating(instance)
 
 
-@receiver(pre_save, sender=SubCategory)
-def delete_image_file_when_saving_model_subcategory(
-    instance: SubCategory, **kwargs: Any
+@receiver(post_save, sender=Sale)
+@receiver(post_delete, sender=Sale)
+def sync_product_sale_when_changing_model_sale(instance: Sale, **kwargs: Any) -> None:
+    """
+    Обновляем действующую акцию и актуальную цену продукта
+    при сохранении/удалении акции (и прежнего продукта, если акцию перенесли).
+
+    :param instance: Sale.
+    :param kwargs: Any.
+    :return: None.
+    """
+    product_ids = {instance.product_id}
+    if instance.loaded_product_id not in (None, instance.product_id):
+        product_ids.add(instance.loaded_product_id)
+        invalidate_catalog_for_products([instance.loaded_product_id])
+    Product.sync_sales(Product.objects.filter(pk__in=product_ids))
+    instance.loaded_product_id = instance.product_id
+    if Sale.product.is_cached(instance):
+        instance.product.refresh_from_db(
+            fields=["active_sale", "sale_price", "sale_price_before", "effective_price"]
+        )
+
+
+@receiver(post_save, sender=Sale)
+@receiver(post_delete, sender=Sale)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_save, sender=Specification)
+@receiver(post_delete, sender=Specification)
+def invalidate_catalog_when_changing_product_data(
+    instance: Union[Sale, ProductImage, Specification], **kwargs: Any
+) -> None:
+    """
+    Сбрасываем кэш страниц каталога с продуктом при изменении его акции,
+    изображения или характеристики.
+
+    :param instance: Sale, ProductImage или Specification.
+    :param kwargs: Any.
+    :return: None.
+    """
+    invalidate_catalog_for_products([instance.product_id])
+
+
+@receiver(post_save, sender=Product)
+def invalidate_catalog_when_saving_model_product(
+    instance: Product, created: bool, **kwargs: Any
+) -> None:
+    """
+    Сбрасываем кэш страниц каталога с продуктом при его сохранении
+    (в том числе страницы подкатегории, из которой продукт перенесли).
+    При переносе и архивации пересчитываем количество продуктов с тегами.
+
+    :param instance: Product.
+    :param created: Создан ли продукт.
+    :param kwargs: Any.
+    :return: None.
+    """
+    if instance.loaded_category_id != instance.category_id:
+        invalidate_catalog_for_subcategories([instance.loaded_category_id])
+    if not created and (
+        instance.loaded_category_id != instance.category_id
+        or instance.loaded_archived != instance.archived
+    ):
+        SubCategoryTagCount.refresh(
+            {instance.loaded_category_id, instance.category_id},
+            instance.tags.values_list("pk", flat=True),
+        )
+    invalidate_catalog_for_products([instance.pk])
+    instance.loaded_category_id = instance.category_id
+    instance.loaded_archived = instance.archived
+
+
+@receiver(post_delete, sender=Product)
+def refresh_tag_counts_when_deleting_model_product(
+    instance: Product, **kwargs: Any
+) -> None:
+    """
+    Пересчитываем количество продуктов с тегами в подкатегории удалённого продукта
+    (связи с тегами к этому моменту уже удалены, поэтому - по всем тегам подкатегории).
+
+    :param instance: Product.
+    :param kwargs: Any.
+    :return: None.
+    """
+    SubCategoryTagCount.refresh([instance.category_id], None)
+
+
+@receiver(pre_delete, sender=Product)
+def invalidate_catalog_when_deleting_model_product(
+    instance: Product, **kwargs: Any
+) -> None:
+    """
+    Сбрасываем кэш страниц каталога с продуктом при его удалении
+    (до удаления, пока связи с тегами ещё есть).
+
+    :param instance: Product.
+    :param kwargs: Any.
+    :return: None.
+    """
+    invalidate_catalog_for_products([instance.pk])
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def invalidate_catalog_when_changing_model_tag(instance: Tag, **kwargs: Any) -> None:
+    """
+    Сбрасываем кэш страниц каталога с тегом и продуктами тега при изменении/удалении тега.
+
+    :param instance: Tag.
+    :param kwargs: Any.
+    :return: None.
+    """
+    invalidate_catalog_for_products(instance.products.values_list("pk", flat=True))
+    invalidate_catalog_for_tags([instance.pk])
+
+
+@receiver(m2m_changed, sender=Product.tags.through)
+def invalidate_catalog_when_changing_product_tags(
+    instance: Union[Product, Tag],
+    action: str,
+    reverse: bool,
+    pk_set: Optional[Set[int]],
+    **kwargs: Any,
+) -> None:
+    """
+    Сбрасываем кэш страниц каталога при изменении тегов продукта
+    (с любой стороны связи: product.tags или tag.products).
+
+    :param instance: Product или Tag.
+    :param action: Действие.
+    :param reverse: True, если изменение со стороны тега.
+    :param pk_set: ID добавленных/удалённых объектов (None для clear).
+    :param kwargs: Any.
+    :return: None.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    related: Type[Union[Product, Tag]] = Product if reverse else Tag
+    if action == "pre_clear":
+        manager = instance.products if reverse else instance.tags
+        pk_set = set(manager.values_list("pk", flat=True))
+    product_ids = pk_set if related is Product else {instance.pk}
+    tag_ids = {instance.pk} if related is Product else pk_set
+    invalidate_catalog_for_products(product_ids or set())
+    invalidate_catalog_for_tags(tag_ids or set())
+
+
+@receiver(m2m_changed, sender=Product.tags.through)
+def refresh_tag_counts_when_changing_product_tags(
+    instance: Union[Product, Tag],
+    action: str,
+    reverse: bool,
+    pk_set: Optional[Set[int]],
+    **kwargs: Any,
+) -> None:
+    """
+    Пересчитываем количество продуктов с тегами при изменении тегов продукта
+    (с любой стороны связи: product.tags или tag.products).
+    После clear затронутые пары неизвестны: пересчитываем все теги подкатегории
+    продукта (или все подкатегории тега).
+
+    :param instance: Product или Tag.
+    :param action: Действие.
+    :param reverse: True, если изменение со стороны тега.
+    :param pk_set: ID добавленных/удалённых объектов (None для clear).
+    :param kwargs: Any.
+    :return: None.
+    """
+    if action not in ("post_add", "post_remove", "post_clear") or pk_set == set():
+        return
+    if reverse:
+        subcategory_ids = (
+            Product.objects.filter(pk__in=pk_set)
+            .values_list("category_id", flat=True)
+            .distinct()
+            if pk_set is not None
+            else None
+        )
+        SubCategoryTagCount.refresh(subcategory_ids, [instance.pk])
+        # Объект тега в памяти не должен расходиться с БД (иначе save() затрёт счётчик).
+        instance.refresh_from_db(fields=["products_count"])
+    else:
+        SubCategoryTagCount.refresh([instance.category_id], pk_set)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=SubCategory)
+@receiver(post_delete, sender=SubCategory)
+def invalidate_categories_when_changing_category(
+    instance: Union[Category, SubCategory], **kwargs: Any
 ) -> None:
     """
-    Удаляем файл изображения, если при сохранении он отличается.
+    Сменим версию дерева категорий при изменении/удалении категории или подкатегории.
 
-    :param instance: SubCategory.
+    :param instance: Category или SubCategory.
     :param kwargs: Any.
     :return: None.
     """
-    if instance.pk:
-        old_instance = SubCategory.objects.get(pk=instance.pk)
-        if old_instance.image and old_instance.image != instance.image:
-            delete_file(old_instance.image.path)
+    invalidate_categories()
@@ -0,0 +1,118 @@
+from django.db import transaction
+from django.test import TestCase
+from jobs_app.models import Job
+from product_app.models import Category, Product, ProductImage, SubCategory
+from product_app.tests.utils import (
+    get_category,
+    get_product_image,
+    get_simple_product,
+    get_sub_category,
+)
+from utils import FileDeletionBatch
+
+
+class ImageFileCleanupTests(TestCase):
+    """
+    Тест удаления файлов изображений: без лишних запросов при сохранении,
+    после фиксации транзакции и пачкой.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.product = get_simple_product(get_sub_category(get_category()))
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        self.product_images = [get_product_image(self.product) for _ in range(3)]
+        self.storage = self.product_images[0].image.storage
+
+    def test_save_without_query(self) -> None:
+        """
+        Проверяем: сохранение без замены файла не читает старую запись
+        и не ставит задачу (запросы: UPDATE, подкатегории/теги продукта
+        и смена версий кэша каталога), в том числе для объекта с отложенным полем.
+
+        :return: None.
+        """
+        product_image = ProductImage.objects.get(pk=self.product_images[0].pk)
+        product_image.title = "new title"
+        with self.assertNumQueries(3):
+            product_image.save()
+
+        product_image = ProductImage.objects.only("pk", "title", "product_id").get(
+            pk=self.product_images[0].pk
+        )
+        product_image.title = "other title"
+        with self.assertNumQueries(3):
+            product_image.save()
+
+        jobs = Job.objects.count()
+        self.product_images[1].save()
+        self.assertEqual(Job.objects.count(), jobs)
+
+    def test_delete_after_commit_in_batch(self) -> None:
+        """
+        Проверяем: файлы удаляются после фиксации транзакции одним колбэком.
+
+        :return: None.
+        """
+        names = [product_image.image.name for product_image in self.product_images]
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            ProductImage.objects.filter(product=self.product).delete()
+            for name in names:
+                self.assertTrue(self.storage.exists(name))
+        batches = [func for func in callbacks if isinstance(func, FileDeletionBatch)]
+        self.assertEqual(len(batches), 1)
+        for name in names:
+            self.assertFalse(self.storage.exists(name))
+
+    def test_rollback_keeps_files(self) -> None:
+        """
+        Проверяем: при откате удаления (точки сохранения) файлы остаются,
+        а удаления вне отката выполняются.
+
+        :return: None.
+        """
+        kept, deleted = self.product_images[0], self.product_images[1]
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    ProductImage.objects.get(pk=kept.pk).delete()
+                    raise RuntimeError("rollback")
+            except RuntimeError:
+                pass
+            ProductImage.objects.get(pk=deleted.pk).delete()
+        self.assertTrue(ProductImage.objects.filter(pk=kept.pk).exists())
+        self.assertTrue(self.storage.exists(kept.image.name))
+        self.assertFalse(self.storage.exists(deleted.image.name))
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет изображения продукта после каждого теста.
+
+        :return: None.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductImage.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
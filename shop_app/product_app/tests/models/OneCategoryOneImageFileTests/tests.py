@@ -6,6 +6,7 @@ from string import ascii_letters
 from auth_app.tests.utils import count_files_in_directory
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from jobs_app.tests.utils import run_jobs
 from product_app.models import Category
 
 from shop_app import settings
@@ -57,6 +58,7 @@ class OneCategoryOneImageFileTests(TestCase):
 
         self.category.image = self.image_file
         self.category.save()
+        run_jobs()
         self.assertEqual(count_files_in_directory(self.image_file_root), 1)
 
     def test_delete_image(self) -> None:
@@ -70,6 +72,7 @@ class OneCategoryOneImageFileTests(TestCase):
 
         self.category.image = None
         self.category.save()
+        run_jobs()
 
         self.assertEqual(count_files_in_directory(self.image_file_root), 0)
 
@@ -82,7 +85,8 @@ class OneCategoryOneImageFileTests(TestCase):
         # Убедимся, что файл есть.
         self.assertEqual(count_files_in_directory(self.image_file_root), 1)
 
-        self.category.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.delete()
 
         self.assertEqual(count_files_in_directory(self.image_file_root), 0)
 
@@ -93,7 +97,8 @@ class OneCategoryOneImageFileTests(TestCase):
         :return:
         """
         if self.category.pk:
-            self.category.delete()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.category.delete()
 
     @classmethod
     def tearDownClass(cls) -> None:
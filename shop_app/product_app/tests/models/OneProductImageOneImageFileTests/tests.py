@@ -6,6 +6,7 @@ from string import ascii_letters
 from auth_app.tests.utils import count_files_in_directory
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from jobs_app.tests.utils import run_jobs
 from product_app.models import Category, Product, ProductImage, SubCategory
 
 from shop_app import settings
@@ -73,6 +74,7 @@ class OneProductImageOneImageFileTests(TestCase):
 
         self.product_image.image = self.image_file
         self.product_image.save()
+        run_jobs()
         self.assertEqual(count_files_in_directory(self.image_file_root), 1)
 
     def test_delete_image(self) -> None:
@@ -86,6 +88,7 @@ class OneProductImageOneImageFileTests(TestCase):
 
         self.product_image.image = None
         self.product_image.save()
+        run_jobs()
 
         self.assertEqual(count_files_in_directory(self.image_file_root), 0)
 
@@ -98,7 +101,8 @@ class OneProductImageOneImageFileTests(TestCase):
         # Убедимся, что файл есть.
         self.assertEqual(count_files_in_directory(self.image_file_root), 1)
 
-        self.product_image.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product_image.delete()
 
         self.assertEqual(count_files_in_directory(self.image_file_root), 0)
 
@@ -109,7 +113,8 @@ class OneProductImageOneImageFileTests(TestCase):
         :return:
         """
         if self.product_image.pk:
-            self.product_image.delete()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.product_image.delete()
 
     @classmethod
     def tearDownClass(cls) -> None:
@@ -6,6 +6,7 @@ from string import ascii_letters
 from auth_app.tests.utils import count_files_in_directory
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from jobs_app.tests.utils import run_jobs
 from product_app.models import Category, SubCategory
 
 from shop_app import settings
@@ -65,6 +66,7 @@ class OneSubCategoryOneImageFileTests(TestCase):
 
         self.subcategory.image = self.image_file
         self.subcategory.save()
+        run_jobs()
         self.assertEqual(count_files_in_directory(self.image_file_root), 1)
 
     def test_delete_image(self) -> None:
@@ -78,6 +80,7 @@ class OneSubCategoryOneImageFileTests(TestCase):
 
         self.subcategory.image = None
         self.subcategory.save()
+        run_jobs()
 
         self.assertEqual(count_files_in_directory(self.image_file_root), 0)
 
@@ -90,7 +93,8 @@ class OneSubCategoryOneImageFileTests(TestCase):
         # Убедимся, что файл есть.
         self.assertEqual(count_files_in_directory(self.image_file_root), 1)
 
-        self.subcategory.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subcategory.delete()
 
         self.assertEqual(count_files_in_directory(self.image_file_root), 0)
 
@@ -101,7 +105,8 @@ class OneSubCategoryOneImageFileTests(TestCase):
         :return:
         """
         if self.subcategory.pk:
-            self.subcategory.delete()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.subcategory.delete()
 
     @classmethod
     def tearDownClass(cls) -> None:
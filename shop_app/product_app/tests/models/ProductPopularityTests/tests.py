@@ -0,0 +1,198 @@
+from io import StringIO
+from typing import Dict
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils.timezone import now
+from order_app.models import Basket, Order
+from product_app.models import Category, Product, Review, SubCategory
+from product_app.models.product import (
+    POPULARITY_HALF_LIFE,
+    popularity_decay,
+    purchase_popularity,
+)
+from product_app.tests.utils import (
+    get_category,
+    get_review,
+    get_simple_product,
+    get_sub_category,
+)
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class ProductPopularityTests(APITestCase):
+    """
+    Тест хранимой популярности продукта (popularity).
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.sub_category = get_sub_category(get_category())
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        self.products = [get_simple_product(self.sub_category) for _ in range(3)]
+
+    def assert_popularity_actual(self) -> None:
+        """
+        Сверяем хранимую популярность продуктов с полным пересчётом
+        (с точностью до погрешности float при вычитании вкладов).
+
+        :return: None.
+        """
+        stored = dict(Product.objects.values_list("pk", "popularity"))
+        Product.rebuild_popularity(Product.objects.all())
+        delta = popularity_decay(now()) * 1e-9
+        for pk, popularity in Product.objects.values_list("pk", "popularity"):
+            self.assertAlmostEqual(stored[pk], popularity, delta=delta)
+
+    def pay_order(self, counts: Dict[Product, int]) -> Order:
+        """
+        Создаёт и оплачивает заказ.
+
+        :param counts: Количество единиц по продуктам.
+        :return: Order.
+        """
+        order = Order.objects.create(full_name="Ivan Ivanov", city="Minsk")
+        Basket.objects.bulk_create(
+            Basket(product=product, count=count, order=order)
+            for product, count in counts.items()
+        )
+        response = self.client.post(
+            reverse("order_app:payment", kwargs={"order_id": order.pk}),
+            data={
+                "number": "1234567812345670",
+                "name": "Ivan Ivanov",
+                "month": "01",
+                "year": now().year + 1,
+                "code": "123",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        order.refresh_from_db()
+        return order
+
+    def test_decay(self) -> None:
+        """
+        Проверяем: вклад события вдвое больше вклада такого же события
+        на POPULARITY_HALF_LIFE раньше.
+
+        :return: None.
+        """
+        moment = now()
+        self.assertAlmostEqual(
+            popularity_decay(moment) / popularity_decay(moment - POPULARITY_HALF_LIFE),
+            2,
+        )
+
+    def test_reviews(self) -> None:
+        """
+        Проверяем обновление популярности при создании, изменении,
+        переносе и удалении отзывов.
+
+        :return: None.
+        """
+        reviews = [get_review(self.products[0]) for _ in range(3)]
+        self.assertGreater(Product.objects.get(pk=self.products[0].pk).popularity, 0)
+        self.assert_popularity_actual()
+
+        review = Review.objects.get(pk=reviews[0].pk)
+        review.rate = 5 if review.rate != 5 else 1
+        review.save()
+        self.assert_popularity_actual()
+
+        review.product = self.products[1]
+        review.save()
+        self.assert_popularity_actual()
+
+        review.delete()
+        Review.objects.get(pk=reviews[1].pk).delete()
+        self.assert_popularity_actual()
+
+    def test_payment(self) -> None:
+        """
+        Проверяем: оплата заказа прибавляет популярность купленным продуктам,
+        продукт без покупок не меняется.
+
+        :return: None.
+        """
+        order = self.pay_order({self.products[0]: 3, self.products[1]: 1})
+        self.assertIsNotNone(order.paid_at)
+        popularity = dict(Product.objects.values_list("pk", "popularity"))
+        self.assertAlmostEqual(
+            popularity[self.products[0].pk], purchase_popularity(3, order.paid_at)
+        )
+        self.assertAlmostEqual(
+            popularity[self.products[1].pk], purchase_popularity(1, order.paid_at)
+        )
+        self.assertEqual(popularity[self.products[2].pk], 0)
+        self.assert_popularity_actual()
+
+    def test_rebuild_command(self) -> None:
+        """
+        Проверяем, что команда исправляет расхождения, а популярный продукт
+        первым попадает в популярные и в каталог с сортировкой по популярности.
+
+        :return: None.
+        """
+        self.pay_order({self.products[0]: 1, self.products[2]: 10})
+        get_review(self.products[1])
+        expected = dict(Product.objects.values_list("pk", "popularity"))
+        # Массовые операции сигналы не вызывают - получаем расхождение.
+        Product.objects.update(popularity=0)
+        call_command("rebuild_product_popularity", batch_size=2, stdout=StringIO())
+        delta = popularity_decay(now()) * 1e-9
+        for pk, popularity in Product.objects.values_list("pk", "popularity"):
+            self.assertAlmostEqual(popularity, expected[pk], delta=delta)
+
+        response = self.client.get(reverse("product_app:product-popular"))
+        self.assertEqual(response.data[0]["id"], self.products[2].pk)
+        response = self.client.get(
+            reverse("product_app:catalog"),
+            data={
+                "filter[name]": "",
+                "filter[minPrice]": 0,
+                "filter[maxPrice]": 100000,
+                "filter[freeDelivery]": False,
+                "filter[available]": True,
+                "currentPage": 1,
+                "category": self.sub_category.pk,
+                "sort": "popularity",
+                "sortType": "inc",
+                "limit": 10,
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["items"][0]["id"], self.products[2].pk)
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет заказы и продукты после каждого теста.
+
+        :return: None.
+        """
+        Order.objects.all().delete()
+        Product.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -0,0 +1,134 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Avg, Count
+from django.test import TestCase
+from product_app.models import Category, Product, Review, SubCategory
+from product_app.tests.utils import (
+    get_category,
+    get_review,
+    get_simple_product,
+    get_sub_category,
+)
+
+
+class ProductRatingTests(TestCase):
+    """
+    Тест хранимых полей рейтинга продукта (reviews_count, rate_sum, rating).
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.sub_category = get_sub_category(get_category())
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        self.product = get_simple_product(self.sub_category)
+
+    def assert_rating_actual(self, product: Product) -> None:
+        """
+        Сверяем хранимые поля продукта с агрегацией по отзывам.
+
+        :param product: Product.
+        :return: None.
+        """
+        product.refresh_from_db()
+        aggregate = Review.objects.filter(product=product).aggregate(
+            count=Count("pk"), avg=Avg("rate")
+        )
+        self.assertEqual(product.reviews_count, aggregate["count"])
+        expected = (
+            Decimal(str(aggregate["avg"])).quantize(Decimal("0.01"))
+            if aggregate["avg"]
+            else Decimal("0")
+        )
+        self.assertEqual(product.rating, expected)
+
+    def test_create_review(self) -> None:
+        """
+        Проверяем обновление полей при создании отзывов.
+
+        :return: None.
+        """
+        for _ in range(7):
+            get_review(self.product)
+        self.assertEqual(self.product.reviews_count, 7)
+        self.assert_rating_actual(self.product)
+
+    def test_update_review(self) -> None:
+        """
+        Проверяем обновление полей при изменении оценки отзыва.
+
+        :return: None.
+        """
+        reviews = [get_review(self.product) for _ in range(3)]
+        review = Review.objects.get(pk=reviews[0].pk)
+        review.rate = 5 if review.rate != 5 else 1
+        review.save()
+        self.assert_rating_actual(self.product)
+
+    def test_delete_review(self) -> None:
+        """
+        Проверяем обновление полей при удалении отзывов.
+
+        :return: None.
+        """
+        reviews = [get_review(self.product) for _ in range(3)]
+        reviews[0].delete()
+        self.assert_rating_actual(self.product)
+        Review.objects.filter(product=self.product).delete()
+        self.assert_rating_actual(self.product)
+        self.assertEqual(self.product.get_rating(), 0)
+
+    def test_rebuild_command(self) -> None:
+        """
+        Проверяем, что команда исправляет расхождения.
+
+        :return: None.
+        """
+        products = [self.product] + [
+            get_simple_product(self.sub_category) for _ in range(4)
+        ]
+        for product in products:
+            for _ in range(3):
+                get_review(product)
+        # Массовые операции сигналы не вызывают - получаем расхождение.
+        Review.objects.filter(product__in=products).update(rate=5)
+        Product.objects.filter(pk__in=[p.pk for p in products]).update(
+            reviews_count=0, rate_sum=0, rating=0
+        )
+        call_command("rebuild_product_ratings", batch_size=2, stdout=StringIO())
+        for product in products:
+            self.assert_rating_actual(product)
+            self.assertEqual(product.get_rating(), 5.0)
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет продукты после каждого теста.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
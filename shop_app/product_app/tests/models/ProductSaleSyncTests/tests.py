@@ -0,0 +1,151 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.timezone import now
+from product_app.models import Category, Product, Sale, SubCategory
+from product_app.tests.utils import get_category, get_simple_product, get_sub_category
+
+
+class ProductSaleSyncTests(TestCase):
+    """
+    Тест хранимой действующей акции и актуальной цены продукта.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.sub_category = get_sub_category(get_category())
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        self.product = get_simple_product(self.sub_category)
+        self.today = now().date()
+
+    def create_sale(self, days_from: int, days_to: int) -> Sale:
+        """
+        Создаёт акцию на продукт относительно текущей даты.
+
+        :param days_from: Сдвиг даты начала в днях.
+        :param days_to: Сдвиг даты окончания в днях.
+        :return: Sale.
+        """
+        sale: Sale = Sale.objects.create(
+            product=self.product,
+            date_from=self.today + timedelta(days=days_from),
+            date_to=self.today + timedelta(days=days_to),
+            price=Decimal("150"),
+            sale_price=Decimal("50"),
+        )
+        return sale
+
+    def test_active_sale(self) -> None:
+        """
+        Действующая акция сразу меняет актуальную цену продукта.
+
+        :return: None.
+        """
+        sale = self.create_sale(0, 3)
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertEqual(product.active_sale_id, sale.pk)
+        self.assertEqual(product.effective_price, Decimal("50"))
+        self.assertEqual(product.get_actual_price(), Decimal("50"))
+        self.assertEqual(product.get_imaginary_price(), Decimal("150"))
+
+        sale.delete()
+        product.refresh_from_db()
+        self.assertIsNone(product.active_sale_id)
+        self.assertEqual(product.effective_price, product.price)
+        self.assertIsNone(product.get_imaginary_price())
+
+    def test_move_sale(self) -> None:
+        """
+        При переносе акции на другой продукт у прежнего продукта
+        акция и цены со скидкой сбрасываются.
+
+        :return: None.
+        """
+        sale = Sale.objects.get(pk=self.create_sale(0, 3).pk)
+        other = get_simple_product(self.sub_category)
+        sale.product = other
+        sale.save()
+
+        self.product.refresh_from_db()
+        self.assertIsNone(self.product.active_sale_id)
+        self.assertIsNone(self.product.sale_price)
+        self.assertIsNone(self.product.sale_price_before)
+        self.assertEqual(self.product.effective_price, self.product.price)
+        other.refresh_from_db()
+        self.assertEqual(other.active_sale_id, sale.pk)
+        self.assertEqual(other.effective_price, Decimal("50"))
+
+    def test_price_change_without_sale(self) -> None:
+        """
+        Без акции актуальная цена следует за ценой продукта (даже при bulk_update).
+
+        :return: None.
+        """
+        self.product.price = Decimal("321")
+        Product.objects.bulk_update([self.product], ["price"])
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertEqual(product.effective_price, Decimal("321"))
+
+    def test_sync_sales_command(self) -> None:
+        """
+        Команда включает начавшиеся и выключает закончившиеся акции.
+
+        :return: None.
+        """
+        future_sale = self.create_sale(1, 3)
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertIsNone(product.active_sale_id)
+
+        # Наступил день начала акции.
+        Sale.objects.filter(pk=future_sale.pk).update(
+            date_from=self.today, date_to=self.today + timedelta(days=2)
+        )
+        call_command("sync_sales", stdout=StringIO())
+        product.refresh_from_db()
+        self.assertEqual(product.active_sale_id, future_sale.pk)
+        self.assertEqual(product.effective_price, Decimal("50"))
+
+        # Акция закончилась.
+        Sale.objects.filter(pk=future_sale.pk).update(
+            date_from=self.today - timedelta(days=3),
+            date_to=self.today - timedelta(days=1),
+        )
+        call_command("sync_sales", stdout=StringIO())
+        product.refresh_from_db()
+        self.assertIsNone(product.active_sale_id)
+        self.assertEqual(product.effective_price, product.price)
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет продукты после каждого теста.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -0,0 +1,143 @@
+from io import StringIO
+from typing import Dict, Tuple
+
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase
+from product_app.models import Category, Product, SubCategory, SubCategoryTagCount, Tag
+from product_app.tests.utils import (
+    get_category,
+    get_simple_product,
+    get_sub_category,
+    get_tag,
+)
+
+
+class SubCategoryTagCountTests(TestCase):
+    """
+    Тест счётчиков продуктов с тегами (SubCategoryTagCount и Tag.products_count).
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        category = get_category()
+        cls.sub_categories = [get_sub_category(category) for _ in range(2)]
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        self.tags = [get_tag() for _ in range(3)]
+        self.products = [
+            get_simple_product(self.sub_categories[i % 2]) for i in range(6)
+        ]
+
+    def assert_counts_actual(self) -> None:
+        """
+        Сверяем счётчики с агрегацией по связям продуктов с тегами.
+
+        :return: None.
+        """
+        expected: Dict[Tuple[int, int], int] = {
+            (row["category_id"], row["tags"]): row["count"]
+            for row in Product.objects.filter(archived=False, tags__isnull=False)
+            .values("category_id", "tags")
+            .annotate(count=Count("pk"))
+        }
+        stored = {
+            (row.subcategory_id, row.tag_id): row.products_count
+            for row in SubCategoryTagCount.objects.filter(products_count__gt=0)
+        }
+        self.assertEqual(stored, expected)
+        for tag in Tag.objects.all():
+            total = sum(c for (_, tag_id), c in expected.items() if tag_id == tag.pk)
+            self.assertEqual(tag.products_count, total)
+
+    def test_add_and_remove(self) -> None:
+        """
+        Проверяем добавление и удаление тегов с обеих сторон связи.
+
+        :return: None.
+        """
+        self.products[0].tags.add(*self.tags)
+        self.tags[0].products.add(*self.products[1:4])
+        self.assert_counts_actual()
+
+        self.products[0].tags.remove(self.tags[1])
+        self.tags[0].products.remove(self.products[1], self.products[5])
+        self.assert_counts_actual()
+
+        self.products[0].tags.clear()
+        self.assert_counts_actual()
+        self.tags[0].products.clear()
+        self.assert_counts_actual()
+        self.assertEqual(Tag.objects.get(pk=self.tags[0].pk).products_count, 0)
+
+    def test_product_changes(self) -> None:
+        """
+        Проверяем архивацию, перенос в другую подкатегорию и удаление продукта.
+
+        :return: None.
+        """
+        for product in self.products:
+            product.tags.add(*self.tags[:2])
+        self.assert_counts_actual()
+
+        product = Product.objects.get(pk=self.products[0].pk)
+        product.archived = True
+        product.save()
+        self.assert_counts_actual()
+
+        product = Product.objects.get(pk=self.products[1].pk)
+        product.category = self.sub_categories[0]
+        product.save()
+        self.assert_counts_actual()
+
+        Product.objects.get(pk=self.products[2].pk).delete()
+        self.assert_counts_actual()
+
+    def test_rebuild_command(self) -> None:
+        """
+        Проверяем, что команда исправляет расхождения.
+
+        :return: None.
+        """
+        for product in self.products:
+            product.tags.add(*self.tags)
+        # Массовые операции сигналы не вызывают - получаем расхождение.
+        Product.objects.filter(pk__in=[p.pk for p in self.products[:3]]).update(
+            archived=True
+        )
+        SubCategoryTagCount.objects.update(products_count=100)
+        call_command("rebuild_tag_counts", stdout=StringIO())
+        self.assert_counts_actual()
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет продукты и теги после каждого теста.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+        Tag.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Tag.objects.all().delete()
+        Product.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -0,0 +1,264 @@
+import os
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from jobs_app.tests.utils import run_jobs
+from PIL import Image
+from product_app.models import Category, Product, ProductImage, SubCategory
+from product_app.tests.utils import (
+    get_category,
+    get_product_image,
+    get_simple_product,
+    get_sub_category,
+)
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from shop_app.thumbnails import (
+    THUMBNAIL_WIDTHS,
+    ImageStatus,
+    delete_thumbnails,
+    thumbnail_names,
+)
+
+
+class ThumbnailsTests(APITestCase):
+    """
+    Тест производных изображений (уменьшенных копий) и srcset в ответах API.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.product = get_simple_product(get_sub_category(get_category()))
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        self.product_image = get_product_image(self.product)
+        run_jobs()
+        self.storage = self.product_image.image.storage
+        self.name = self.product_image.image.name
+
+    def assert_thumbnails_exist(self, name: str, exist: bool = True) -> None:
+        """
+        Проверяем наличие (отсутствие) всех производных изображений файла.
+
+        :param name: Имя оригинала в хранилище.
+        :param exist: Ожидаемое наличие.
+        :return: None.
+        """
+        for thumb_name in thumbnail_names(name):
+            self.assertEqual(self.storage.exists(thumb_name), exist, thumb_name)
+
+    def test_create_on_upload(self) -> None:
+        """
+        Проверяем: производные изображения созданы при загрузке, изображение
+        меньше ширины не увеличивается, а srcset ответа указывает на них.
+
+        :return: None.
+        """
+        self.assert_thumbnails_exist(self.name)
+        with self.storage.open(thumbnail_names(self.name)[-1], "rb") as file:
+            self.assertEqual(Image.open(file).size, (10, 10))
+
+        response = self.client.get(
+            reverse("product_app:product", kwargs={"product_id": self.product.pk})
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        image = response.data["images"][0]
+        self.assertIsNotNone(image["sizes"])
+        for key, ext in (("srcset", "jpg"), ("srcsetWebp", "webp")):
+            candidates = image[key].split(", ")
+            self.assertEqual(len(candidates), len(THUMBNAIL_WIDTHS))
+            for candidate, width in zip(candidates, THUMBNAIL_WIDTHS):
+                url, descriptor = candidate.split(" ")
+                self.assertEqual(descriptor, f"{width}w")
+                self.assertTrue(url.endswith(f"_{width}.{ext}"))
+
+    def test_pending_falls_back_to_original(self) -> None:
+        """
+        Проверяем: пока фоновая задача не выполнена, в ответе только оригинал,
+        после выполнения - srcset.
+
+        :return: None.
+        """
+        product_image = get_product_image(self.product)
+        self.assertEqual(product_image.image_status, ImageStatus.PENDING)
+        url = reverse("product_app:product", kwargs={"product_id": self.product.pk})
+        image = self.client.get(url).data["images"][-1]
+        self.assertIsNotNone(image["src"])
+        self.assertIsNone(image["srcset"])
+        self.assertIsNone(image["sizes"])
+
+        run_jobs()
+        product_image.refresh_from_db()
+        self.assertEqual(product_image.image_status, ImageStatus.READY)
+        image = self.client.get(url).data["images"][-1]
+        self.assertIsNotNone(image["srcset"])
+
+    def test_downscale(self) -> None:
+        """
+        Проверяем размеры уменьшенных копий большого изображения.
+
+        :return: None.
+        """
+        buffer = BytesIO()
+        Image.new("RGB", (2000, 1000), (200, 10, 10)).save(buffer, "PNG")
+        product_image = ProductImage.objects.get(pk=self.product_image.pk)
+        product_image.image = SimpleUploadedFile(
+            name="big.png", content=buffer.getvalue(), content_type="image/png"
+        )
+        product_image.save()
+        run_jobs()
+        name = product_image.image.name
+        self.assert_thumbnails_exist(name)
+        for width, thumb_name in zip(
+            (w for w in THUMBNAIL_WIDTHS for _ in range(2)), thumbnail_names(name)
+        ):
+            with self.storage.open(thumb_name, "rb") as file:
+                self.assertEqual(Image.open(file).size, (width, width // 2))
+
+    def test_strip_exif(self) -> None:
+        """
+        Проверяем: из оригинала удаляется EXIF, а ориентация из EXIF применяется,
+        имя файла не меняется.
+
+        :return: None.
+        """
+        exif = Image.Exif()
+        exif[0x0110] = "Camera"  # Model
+        exif[0x0112] = 6  # Orientation: поворот на 90 градусов
+        buffer = BytesIO()
+        Image.new("RGB", (40, 20), (10, 200, 10)).save(buffer, "JPEG", exif=exif)
+        product_image = ProductImage.objects.get(pk=self.product_image.pk)
+        product_image.image = SimpleUploadedFile(
+            name="photo.jpg", content=buffer.getvalue(), content_type="image/jpeg"
+        )
+        product_image.save()
+        name = product_image.image.name
+        run_jobs()
+        product_image.refresh_from_db()
+        self.assertEqual(product_image.image_status, ImageStatus.READY)
+        # Локальное хранилище: содержимое заменено под тем же именем.
+        self.assertEqual(product_image.image.name, name)
+        with self.storage.open(name, "rb") as file:
+            image = Image.open(file)
+            self.assertEqual(len(image.getexif()), 0)
+            self.assertEqual(image.size, (20, 40))
+
+    def test_strip_exif_keeps_original_on_error(self) -> None:
+        """
+        Проверяем: если новое содержимое не удалось записать, оригинал
+        остаётся на месте без изменений, временный файл удаляется.
+
+        :return: None.
+        """
+        exif = Image.Exif()
+        exif[0x0110] = "Camera"  # Model
+        buffer = BytesIO()
+        Image.new("RGB", (40, 20), (10, 200, 10)).save(buffer, "JPEG", exif=exif)
+        product_image = ProductImage.objects.get(pk=self.product_image.pk)
+        product_image.image = SimpleUploadedFile(
+            name="photo.jpg", content=buffer.getvalue(), content_type="image/jpeg"
+        )
+        product_image.save()
+        name = product_image.image.name
+        with mock.patch(
+            "shop_app.image_processing.os.replace", side_effect=OSError("disk full")
+        ):
+            run_jobs()
+        product_image.refresh_from_db()
+        self.assertEqual(product_image.image.name, name)
+        self.assertEqual(product_image.image_status, ImageStatus.FAILED)
+        with self.storage.open(name, "rb") as file:
+            self.assertEqual(file.read(), buffer.getvalue())
+        directory = os.path.dirname(self.storage.path(name))
+        self.assertFalse([f for f in os.listdir(directory) if f.endswith(".tmp")])
+
+    def test_invalid_image(self) -> None:
+        """
+        Проверяем: файл, который не декодируется, получает статус FAILED
+        и отдаётся без srcset.
+
+        :return: None.
+        """
+        product_image = ProductImage.objects.get(pk=self.product_image.pk)
+        product_image.image = SimpleUploadedFile(
+            name="broken.png", content=b"not an image", content_type="image/png"
+        )
+        product_image.save()
+        run_jobs()
+        product_image.refresh_from_db()
+        self.assertEqual(product_image.image_status, ImageStatus.FAILED)
+        response = self.client.get(
+            reverse("product_app:product", kwargs={"product_id": self.product.pk})
+        )
+        self.assertIsNone(response.data["images"][0]["srcset"])
+
+    def test_delete_with_original(self) -> None:
+        """
+        Проверяем: производные изображения удаляются при замене и удалении оригинала.
+
+        :return: None.
+        """
+        product_image = ProductImage.objects.get(pk=self.product_image.pk)
+        product_image.image = SimpleUploadedFile(
+            name="other.png",
+            content=self.storage.open(self.name).read(),
+            content_type="image/png",
+        )
+        product_image.save()
+        run_jobs()
+        self.assert_thumbnails_exist(self.name, exist=False)
+        self.assert_thumbnails_exist(product_image.image.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product_image.delete()
+        self.assert_thumbnails_exist(product_image.image.name, exist=False)
+
+    def test_backfill_command(self) -> None:
+        """
+        Проверяем: команда создаёт отсутствующие производные изображения.
+
+        :return: None.
+        """
+        delete_thumbnails(self.storage, self.name)
+        self.assert_thumbnails_exist(self.name, exist=False)
+        stdout = StringIO()
+        call_command("backfill_thumbnails", workers=2, stdout=stdout)
+        self.assert_thumbnails_exist(self.name)
+        self.assertIn("ошибок: 0", stdout.getvalue())
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет изображения продукта после каждого теста.
+
+        :return: None.
+        """
+        for product_image in ProductImage.objects.all():
+            with self.captureOnCommitCallbacks(execute=True):
+                product_image.delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -52,7 +52,7 @@ class OutCatalogProductSerializerTests(TestCase):
         }
         self.assertEqual(set_keys, set(data.keys()))
 
-        set_images_keys = {"src", "alt"}
+        set_images_keys = {"src", "alt", "srcset", "srcsetWebp", "sizes"}
         self.assertEqual(set_images_keys, set(data["images"][0].keys()))
 
         set_tags_keys = {"id", "name"}
@@ -59,7 +59,9 @@ class OutCategorySerializerTests(TestCase):
         serializer = self.category_serializer(instance=self.category)
         data = serializer.data
         self.assertEqual({"id", "title", "image", "subcategories"}, set(data.keys()))
-        self.assertEqual({"src", "alt"}, set(data["image"].keys()))
+        self.assertEqual(
+            {"src", "alt", "srcset", "srcsetWebp", "sizes"}, set(data["image"].keys())
+        )
         self.assertTrue(
             data["image"]["src"].endswith(
                 str(
@@ -69,7 +71,10 @@ class OutCategorySerializerTests(TestCase):
         )
         self.assertEqual(len(data["subcategories"]), self.count_subcategory)
         self.assertEqual({"id", "title", "image"}, set(data["subcategories"][0].keys()))
-        self.assertEqual({"src", "alt"}, set(data["subcategories"][0]["image"].keys()))
+        self.assertEqual(
+            {"src", "alt", "srcset", "srcsetWebp", "sizes"},
+            set(data["subcategories"][0]["image"].keys()),
+        )
         self.assertTrue(
             data["subcategories"][0]["image"]["src"].endswith(
                 str(os.path.join("images", self.file_name))
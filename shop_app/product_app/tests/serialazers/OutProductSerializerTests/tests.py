@@ -53,7 +53,7 @@ class OutProductSerializerTests(TestCase):
         }
         self.assertEqual(set_keys, set(data.keys()))
 
-        set_images_keys = {"src", "alt"}
+        set_images_keys = {"src", "alt", "srcset", "srcsetWebp", "sizes"}
         self.assertEqual(set_images_keys, set(data["images"][0].keys()))
 
         set_specifications_keys = {"name", "value"}
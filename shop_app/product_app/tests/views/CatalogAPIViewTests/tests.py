@@ -2,8 +2,10 @@ import random
 from datetime import timedelta
 from typing import Any, Dict
 
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils.timezone import now
+from product_app.api_views.catalog.search import trigram_available
 from product_app.models import Category, Product, Sale, SubCategory, Tag
 from product_app.tests.utils import (
     get_category,
@@ -42,6 +44,7 @@ class CatalogAPIViewTests(APITestCase):
 
         :return: None.
         """
+        cache.clear()
         self.list_products_cat_1 = [
             get_simple_product(self.sub_category_1) for _ in range(20)
         ]
@@ -270,6 +273,34 @@ class CatalogAPIViewTests(APITestCase):
             response_id_set = {product["id"] for product in response.data["items"]}
             self.assertEqual(response_id_set, product_id_set)
 
+    def test_get_products_all_tags(self) -> None:
+        """
+        Проверяем выдачу продуктов, у которых есть все выбранные теги (tagsMode=all).
+
+        :return: None.
+        """
+        tags_list = [get_tag() for _ in range(3)]
+        for product in self.list_products_cat_1:
+            product.tags.add(*random.sample(tags_list, k=random.randint(1, 3)))
+
+        self.valid_data["limit"] = len(self.list_products_cat_1)
+        self.valid_data["tagsMode"] = "all"
+        for tag_items in ([tags_list[0].pk], [tags_list[0].pk, tags_list[1].pk]):
+            self.valid_data["tags[]"] = tag_items
+
+            response: Response = self.client.get(self.url, data=self.valid_data)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            product_id_set = {
+                product.pk
+                for product in self.list_products_cat_1
+                if set(tag_items) <= set(product.tags.values_list("pk", flat=True))
+            }
+            response_id_set = {product["id"] for product in response.data["items"]}
+            self.assertEqual(response_id_set, product_id_set)
+            # Каждый продукт в выдаче ровно один раз.
+            self.assertEqual(len(response.data["items"]), len(product_id_set))
+
     def test_filter_name(self) -> None:
         """
         Тестируем фильтр имени.
@@ -296,6 +327,91 @@ class CatalogAPIViewTests(APITestCase):
             response_set_ids = {product["id"] for product in response.data["items"]}
             self.assertEqual(response_set_ids, ids_set)
 
+    def test_filter_name_misspelled(self) -> None:
+        """
+        Тестируем нечёткий поиск по названию (pg_trgm): слова с опечатками
+        находят продукт.
+
+        :return: None.
+        """
+        if not trigram_available():
+            self.skipTest("Расширение pg_trgm не установлено.")
+        product_1 = self.list_products_cat_1[0]
+        product_1.title = "Nokia Lumia 820"
+        product_2 = self.list_products_cat_1[1]
+        product_2.title = "Nokia 3310"
+        Product.objects.bulk_update([product_1, product_2], ["title"])
+
+        names_and_ids = {
+            "lumiaa": {product_1.pk},
+            "nokia lumiaa": {product_1.pk},
+            "nokiaa 3310": {product_2.pk},
+        }
+        for name, ids_set in names_and_ids.items():
+            self.valid_data["filter[name]"] = name
+            response: Response = self.client.get(self.url, data=self.valid_data)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response_set_ids = {product["id"] for product in response.data["items"]}
+            self.assertEqual(response_set_ids, ids_set)
+
+    def test_filter_name_prefix_and_description(self) -> None:
+        """
+        Тестируем полнотекстовый поиск: неполные слова ищутся как префиксы,
+        поиск идёт и по описанию.
+
+        :return: None.
+        """
+        product_1 = self.list_products_cat_1[0]
+        product_1.title = "Nokia Lumia 820"
+        product_2 = self.list_products_cat_1[1]
+        product_2.title = "Телефон"
+        product_2.description = "Кнопочный телефон Nokia с фонариком"
+        Product.objects.bulk_update([product_1, product_2], ["title", "description"])
+
+        names_and_ids = {
+            "nok": {product_1.pk, product_2.pk},
+            "nok lum": {product_1.pk},
+            "фонарик": {product_2.pk},
+            "lumia!": {product_1.pk},
+        }
+        for name, ids_set in names_and_ids.items():
+            self.valid_data["filter[name]"] = name
+
+            response: Response = self.client.get(self.url, data=self.valid_data)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            response_set_ids = {product["id"] for product in response.data["items"]}
+            self.assertEqual(response_set_ids, ids_set)
+
+    def test_sort_relevance(self) -> None:
+        """
+        Тестируем сортировку по релевантности: совпадение в названии важнее,
+        чем совпадение в описании.
+
+        :return: None.
+        """
+        product_1 = self.list_products_cat_1[0]
+        product_1.title = "Чехол"
+        product_1.description = "Чехол для Nokia"
+        product_2 = self.list_products_cat_1[1]
+        product_2.title = "Nokia 3310"
+        Product.objects.bulk_update([product_1, product_2], ["title", "description"])
+
+        self.valid_data["filter[name]"] = "nokia"
+        self.valid_data["sort"] = "relevance"
+        for cursor in (None, ""):
+            if cursor is not None:
+                self.valid_data["cursor"] = cursor
+            response: Response = self.client.get(self.url, data=self.valid_data)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids = [product["id"] for product in response.data["items"]]
+            self.assertEqual(ids, [product_2.pk, product_1.pk])
+
+        # Без строки поиска сортировка по релевантности тоже допустима.
+        self.valid_data["filter[name]"] = ""
+        response = self.client.get(self.url, data=self.valid_data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_filter_min_price(self) -> None:
         """
         Тестируем фильтр минимальной цены.
@@ -449,6 +565,101 @@ class CatalogAPIViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["items"]), 0)
 
+    def test_cursor_pagination(self) -> None:
+        """
+        Проверяем курсорную пагинацию: обход всех страниц по каждой сортировке
+        даёт все продукты категории ровно один раз и в нужном порядке.
+
+        :return: None.
+        """
+        for i, product in enumerate(self.list_products_cat_1):
+            product.price = 100 * (i % 4 + 1)
+        Product.objects.bulk_update(self.list_products_cat_1, ["price"])
+        for product in self.list_products_cat_1[:10]:
+            for _ in range(random.randint(1, 3)):
+                get_review(product)
+
+        keys = {"price": "price", "rating": "rating", "reviews": "reviews"}
+        self.valid_data["limit"] = 3
+        for sort in ("price", "rating", "reviews", "date"):
+            for sort_type in ("inc", "dec"):
+                self.valid_data["sort"] = sort
+                self.valid_data["sortType"] = sort_type
+                self.valid_data["cursor"] = ""
+                items = []
+                while True:
+                    response: Response = self.client.get(self.url, data=self.valid_data)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    self.assertTrue(len(response.data["items"]) <= 3)
+                    items.extend(response.data["items"])
+                    if response.data["nextCursor"] is None:
+                        self.assertEqual(
+                            response.data["lastPage"], response.data["currentPage"]
+                        )
+                        break
+                    self.valid_data["cursor"] = response.data["nextCursor"]
+
+                ids = [item["id"] for item in items]
+                self.assertEqual(len(ids), len(set(ids)))
+                self.assertEqual(
+                    set(ids), {product.pk for product in self.list_products_cat_1}
+                )
+                if sort in keys:
+                    values = [item[keys[sort]] for item in items]
+                    self.assertEqual(values, sorted(values, reverse=sort_type == "inc"))
+
+    def test_cursor_pagination_relevance(self) -> None:
+        """
+        Проверяем курсорную пагинацию по релевантности: ранги с одинаковыми
+        значениями и значениями, неточными в float4, не теряются и не повторяются
+        при обходе страниц (в том числе по одному продукту).
+
+        :return: None.
+        """
+        for i, product in enumerate(self.list_products_cat_1):
+            product.title = "Nokia" if i % 3 else f"Nokia {'x ' * i}"
+            product.description = "Nokia " * (i % 4)
+        Product.objects.bulk_update(self.list_products_cat_1, ["title", "description"])
+        self.valid_data["filter[name]"] = "nokia"
+        self.valid_data["sort"] = "relevance"
+        for limit in (1, 3):
+            for sort_type in ("inc", "dec"):
+                self.valid_data["limit"] = limit
+                self.valid_data["sortType"] = sort_type
+                self.valid_data["cursor"] = ""
+                ids = []
+                for _ in range(len(self.list_products_cat_1)):
+                    response: Response = self.client.get(self.url, data=self.valid_data)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    ids.extend(item["id"] for item in response.data["items"])
+                    if response.data["nextCursor"] is None:
+                        break
+                    self.valid_data["cursor"] = response.data["nextCursor"]
+                self.assertEqual(
+                    sorted(ids),
+                    sorted(product.pk for product in self.list_products_cat_1),
+                )
+
+    def test_cursor_pagination_bad_cursor(self) -> None:
+        """
+        Проверяем, что повреждённый курсор или курсор другой сортировки дают 400.
+
+        :return: None.
+        """
+        self.valid_data["cursor"] = ""
+        response: Response = self.client.get(self.url, data=self.valid_data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cursor = response.data["nextCursor"]
+
+        self.valid_data["cursor"] = "not-a-cursor"
+        response = self.client.get(self.url, data=self.valid_data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.valid_data["cursor"] = cursor
+        self.valid_data["sort"] = "date"
+        response = self.client.get(self.url, data=self.valid_data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def tearDown(self) -> None:
         """
         Функция удаляет продукты после каждого теста.
@@ -0,0 +1,275 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from typing import Any, Dict
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+from product_app.api_views.catalog.cache import (
+    get_catalog_cache_stats,
+    reset_catalog_cache_stats,
+    subcategory_version_key,
+)
+from product_app.models import (
+    CatalogCacheStats,
+    CatalogVersion,
+    Category,
+    Product,
+    Sale,
+    SubCategory,
+    Tag,
+)
+from product_app.tests.utils import (
+    get_category,
+    get_review,
+    get_simple_product,
+    get_sub_category,
+    get_tag,
+)
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+
+class CatalogCacheTests(APITestCase):
+    """
+    Тест кэша страниц CatalogAPIView.
+    """
+
+    url = reverse("product_app:catalog")
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.category = get_category()
+        cls.sub_category_1 = get_sub_category(cls.category)
+        cls.sub_category_2 = get_sub_category(cls.category)
+        cls.tag = get_tag()
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        cache.clear()
+        reset_catalog_cache_stats()
+        self.product_1 = get_simple_product(self.sub_category_1)
+        self.product_2 = get_simple_product(self.sub_category_2)
+        self.valid_data: Dict[str, Any] = {
+            "filter[name]": "",
+            "filter[minPrice]": 1,
+            "filter[maxPrice]": 10000,
+            "filter[freeDelivery]": False,
+            "filter[available]": True,
+            "currentPage": 1,
+            "category": self.sub_category_1.pk,
+            "sort": "price",
+            "sortType": "inc",
+            "limit": 10,
+        }
+
+    def get_catalog(self) -> Response:
+        """
+        Запрос страницы каталога с текущими параметрами.
+
+        :return: Response.
+        """
+        response: Response = self.client.get(self.url, data=self.valid_data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_hit_without_queries(self) -> None:
+        """
+        Повторный одинаковый запрос отдаётся из кэша: запросы к БД - только
+        чтение версий (до и после ответа).
+
+        :return: None.
+        """
+        first = self.get_catalog()
+        with self.assertNumQueries(2):
+            second = self.get_catalog()
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(get_catalog_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_invalidation(self) -> None:
+        """
+        Изменения продукта, отзыва, акции и тега сбрасывают страницу подкатегории.
+
+        :return: None.
+        """
+        self.product_1.tags.add(self.tag)
+        self.get_catalog()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product_1.price = Decimal("123.00")
+            self.product_1.save()
+        self.assertEqual(self.get_catalog().data["items"][0]["price"], 123)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            get_review(self.product_1)
+        self.assertEqual(self.get_catalog().data["items"][0]["reviews"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Sale.objects.create(
+                product=self.product_1,
+                price=Decimal("200.00"),
+                sale_price=Decimal("100.00"),
+                date_from=now().date() - timedelta(days=1),
+                date_to=now().date() + timedelta(days=1),
+            )
+        self.assertEqual(self.get_catalog().data["items"][0]["price"], 100)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.name = "new tag name"
+            self.tag.save()
+        tags = self.get_catalog().data["items"][0]["tags"]
+        self.assertEqual(tags[0]["name"], "new tag name")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product_1.tags.clear()
+        self.assertEqual(self.get_catalog().data["items"][0]["tags"], [])
+
+    def test_invalidation_in_transaction(self) -> None:
+        """
+        Версии меняются в пишущей транзакции: внутри неё страница уже
+        строится заново по новым строкам и под новым ключом.
+
+        :return: None.
+        """
+        self.get_catalog()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.product_1.price = Decimal("123.00")
+            self.product_1.save()
+            self.assertEqual(self.get_catalog().data["items"][0]["price"], 123)
+        self.assertFalse(callbacks)
+
+    def test_invalidation_from_other_process(self) -> None:
+        """
+        Версии общие для всех процессов: смена версии в БД (другим процессом,
+        мимо кэша этого процесса) сбрасывает страницу.
+
+        :return: None.
+        """
+        self.get_catalog()
+        Product.objects.filter(pk=self.product_1.pk).update(price=Decimal("123.00"))
+        CatalogVersion.bump(subcategory_version_key(self.sub_category_1.pk))
+        self.assertEqual(self.get_catalog().data["items"][0]["price"], 123)
+        self.assertEqual(get_catalog_cache_stats(), {"hits": 0, "misses": 2})
+
+    def test_other_subcategory_not_invalidated(self) -> None:
+        """
+        Изменение продукта другой подкатегории не сбрасывает страницу.
+
+        :return: None.
+        """
+        self.get_catalog()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product_2.price = Decimal("321.00")
+            self.product_2.save()
+        with self.assertNumQueries(2):
+            self.get_catalog()
+
+    def test_move_product_to_other_subcategory(self) -> None:
+        """
+        Перенос продукта в другую подкатегорию сбрасывает страницы обеих подкатегорий.
+
+        :return: None.
+        """
+        self.get_catalog()
+        product = Product.objects.get(pk=self.product_2.pk)
+        product.category = self.sub_category_1
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+        ids = {item["id"] for item in self.get_catalog().data["items"]}
+        self.assertEqual(ids, {self.product_1.pk, self.product_2.pk})
+
+    def test_tags_filter(self) -> None:
+        """
+        Страница, отфильтрованная по тегу без категории, сбрасывается при привязке тега.
+
+        :return: None.
+        """
+        del self.valid_data["category"]
+        self.valid_data["tags[]"] = [self.tag.pk]
+        self.assertEqual(self.get_catalog().data["items"], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.products.add(self.product_2)
+        ids = {item["id"] for item in self.get_catalog().data["items"]}
+        self.assertEqual(ids, {self.product_2.pk})
+
+    @override_settings(CATALOG_CACHE_TIMEOUT=0)
+    def test_disabled(self) -> None:
+        """
+        При CATALOG_CACHE_TIMEOUT=0 кэш не используется.
+
+        :return: None.
+        """
+        self.get_catalog()
+        self.get_catalog()
+        self.assertEqual(get_catalog_cache_stats(), {"hits": 0, "misses": 0})
+
+    def test_stats_command(self) -> None:
+        """
+        Команда выводит и обнуляет счётчики.
+
+        :return: None.
+        """
+        self.get_catalog()
+        self.get_catalog()
+        out = StringIO()
+        call_command("catalog_cache_stats", "--reset", stdout=out)
+        self.assertIn("Попаданий: 1, промахов: 1", out.getvalue())
+        self.assertEqual(get_catalog_cache_stats(), {"hits": 0, "misses": 0})
+
+    def test_stats_from_other_processes(self) -> None:
+        """
+        Счётчики общие для всех процессов: команда видит счётчики других
+        процессов и обнуляет их.
+
+        :return: None.
+        """
+        CatalogCacheStats.add("other:1", 2, 3)
+        self.get_catalog()
+        self.assertEqual(get_catalog_cache_stats(), {"hits": 2, "misses": 4})
+        call_command("catalog_cache_stats", "--reset", stdout=StringIO())
+        self.assertFalse(CatalogCacheStats.objects.exists())
+
+    @override_settings(CATALOG_CACHE_STATS_INTERVAL=0)
+    def test_stats_flush(self) -> None:
+        """
+        Процесс сохраняет свои счётчики в БД, не дожидаясь команды.
+
+        :return: None.
+        """
+        self.get_catalog()
+        self.get_catalog()
+        self.assertEqual(CatalogCacheStats.totals(), {"hits": 1, "misses": 1})
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет продукты после каждого теста.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Tag.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -0,0 +1,179 @@
+from decimal import Decimal
+from typing import Any, Dict
+
+from django.core.cache import cache
+from django.urls import reverse
+from product_app.api_views.catalog.cache import reset_catalog_cache_stats
+from product_app.models import Category, Product, SubCategory, Tag
+from product_app.tests.utils import (
+    get_category,
+    get_simple_product,
+    get_sub_category,
+    get_tag,
+)
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+
+class CatalogFacetsAPIViewTests(APITestCase):
+    """
+    Тест CatalogFacetsAPIView.
+    """
+
+    url = reverse("product_app:catalog-facets")
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.category = get_category()
+        cls.sub_category_1 = get_sub_category(cls.category)
+        cls.sub_category_2 = get_sub_category(cls.category)
+        cls.tag_1 = get_tag()
+        cls.tag_2 = get_tag()
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+        Цены продуктов подкатегории 1: 100, 200, ..., 1000.
+        Чётные (по порядку) продукты - с бесплатной доставкой и тегом 1,
+        первые три - не в наличии, последние два - с тегом 2.
+
+        :return: None.
+        """
+        cache.clear()
+        reset_catalog_cache_stats()
+        self.products = [get_simple_product(self.sub_category_1) for _ in range(10)]
+        for i, product in enumerate(self.products):
+            product.price = Decimal(100 * (i + 1))
+            product.free_delivery = i % 2 == 0
+            product.count = 0 if i < 3 else 10
+            product.save()
+            if i % 2 == 0:
+                product.tags.add(self.tag_1)
+            if i >= 8:
+                product.tags.add(self.tag_2)
+        get_simple_product(self.sub_category_2)
+        self.valid_data: Dict[str, Any] = {
+            "filter[name]": "",
+            "filter[minPrice]": 1,
+            "filter[maxPrice]": 10000,
+            "filter[freeDelivery]": False,
+            "filter[available]": True,
+            "currentPage": 1,
+            "category": self.sub_category_1.pk,
+            "sort": "price",
+            "sortType": "inc",
+            "limit": 10,
+        }
+
+    def get_facets(self) -> Dict[str, Any]:
+        """
+        Запрос фасетов с текущими параметрами.
+
+        :return: Фасеты.
+        """
+        response: Response = self.client.get(self.url, data=self.valid_data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_facets(self) -> None:
+        """
+        Каждый фасет считается без собственного фильтра.
+
+        :return: None.
+        """
+        with self.assertNumQueries(3):
+            facets = self.get_facets()
+        # Не бесплатная доставка (нечётные) и в наличии: 4, 6, 8, 10-й продукты.
+        self.assertEqual(facets["total"], 4)
+        # В наличии (без учёта фильтра доставки) с бесплатной доставкой: 5, 7, 9-й.
+        self.assertEqual(facets["freeDelivery"], 3)
+        # Не бесплатная доставка (без учёта фильтра наличия) в наличии: 4, 6, 8, 10-й.
+        self.assertEqual(facets["available"], 4)
+        self.assertEqual(facets["minPrice"], "400.00")
+        self.assertEqual(facets["maxPrice"], "1000.00")
+        self.assertEqual(
+            facets["tags"], [{"id": self.tag_2.pk, "name": self.tag_2.name, "count": 1}]
+        )
+        self.assertEqual(sum(bucket["count"] for bucket in facets["histogram"]), 4)
+        self.assertEqual(facets["histogram"][0]["min"], "400.00")
+        self.assertEqual(facets["histogram"][-1]["max"], "1000.00")
+        self.assertEqual(facets["histogram"][-1]["count"], 1)
+
+    def test_facets_with_tags(self) -> None:
+        """
+        Фильтр тегов не влияет на фасет тегов, но влияет на остальные.
+
+        :return: None.
+        """
+        self.valid_data["filter[freeDelivery]"] = True
+        self.valid_data["tags[]"] = [self.tag_2.pk]
+        facets = self.get_facets()
+        # Бесплатная доставка, в наличии и тег 2: 9-й продукт.
+        self.assertEqual(facets["total"], 1)
+        tags = {tag["id"]: tag["count"] for tag in facets["tags"]}
+        # Бесплатная доставка и в наличии: 5, 7, 9-й продукты (все с тегом 1).
+        self.assertEqual(tags, {self.tag_1.pk: 3, self.tag_2.pk: 1})
+
+    def test_empty(self) -> None:
+        """
+        Фасеты для пустой выдачи.
+
+        :return: None.
+        """
+        self.valid_data["filter[name]"] = "nothing"
+        facets = self.get_facets()
+        self.assertEqual(facets["total"], 0)
+        self.assertIsNone(facets["minPrice"])
+        self.assertEqual(facets["tags"], [])
+        self.assertEqual(facets["histogram"], [])
+
+    def test_cached(self) -> None:
+        """
+        Фасеты кэшируются и сбрасываются вместе со страницами каталога.
+
+        :return: None.
+        """
+        self.get_facets()
+        with self.assertNumQueries(2):
+            self.get_facets()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products[3].price = Decimal("50")
+            self.products[3].save()
+        self.assertEqual(self.get_facets()["minPrice"], "50.00")
+
+    def test_bad_request(self) -> None:
+        """
+        Неверные параметры - 400.
+
+        :return: None.
+        """
+        del self.valid_data["filter[minPrice]"]
+        response: Response = self.client.get(self.url, data=self.valid_data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def tearDown(self) -> None:
+        """
+        Функция удаляет продукты после каждого теста.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Tag.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -54,18 +54,20 @@ class CatalogPopularAPIViewTests(APITestCase):
 
     def test_get_popular_products(self) -> None:
         """
-        Проверяем, что нам возвращаются продукты, которые имеют максимальную оценку.
+        Проверяем, что нам возвращаются продукты с максимальной популярностью.
 
         :return: None.
         """
         response: Response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        products_top_rating = sorted(
-            [product.get_rating() for product in self.products], reverse=True
+        products_top_popularity = list(
+            Product.objects.order_by("-popularity").values_list("pk", flat=True)
+        )
+        response_top_popularity = [product["id"] for product in response.data]
+        self.assertEqual(
+            products_top_popularity[: self.limit_in_page], response_top_popularity
         )
-        response_top_rating = [product["rating"] for product in response.data]
-        self.assertEqual(products_top_rating[: self.limit_in_page], response_top_rating)
 
     def test_archived_products(self) -> None:
         """
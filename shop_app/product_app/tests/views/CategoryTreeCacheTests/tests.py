@@ -0,0 +1,130 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+from product_app.api_views.catalog.category_tree import category_tree
+from product_app.models import CatalogVersion, Category, SubCategory
+from product_app.serializers.category import OutCategorySerializer
+from product_app.tests.utils import get_category, get_sub_category
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+
+class CategoryTreeCacheTests(APITestCase):
+    """
+    Тест кэша дерева категорий в памяти процесса (CategoryTreeCache).
+    """
+
+    url = reverse("product_app:categories")
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.category = get_category()
+        cls.sub_category = get_sub_category(cls.category)
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        cache.clear()
+        category_tree.clear()
+
+    def get_tree(self) -> Response:
+        """
+        Запрос дерева категорий с проверкой ответа.
+
+        :return: Response.
+        """
+        response: Response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_no_queries_when_cached(self) -> None:
+        """
+        Проверяем: повторный запрос читает из БД только версию дерева (до и после
+        ответа) и отдаёт то же дерево, что и сериализатор.
+
+        :return: None.
+        """
+        first = self.get_tree()
+        with self.assertNumQueries(2):
+            second = self.get_tree()
+        self.assertEqual(first.content, second.content)
+        categories = Category.objects.prefetch_related("subcategories").all()
+        self.assertEqual(second.data, OutCategorySerializer(categories, many=True).data)
+
+    def test_rebuild_after_change(self) -> None:
+        """
+        Проверяем: после изменения подкатегории дерево перестраивается.
+
+        :return: None.
+        """
+        self.get_tree()
+        sub_category = get_sub_category(self.category)
+        titles = [
+            subcategory["title"]
+            for category in self.get_tree().data
+            for subcategory in category["subcategories"]
+        ]
+        self.assertIn(sub_category.name, titles)
+
+        sub_category.name = "Новое название"
+        sub_category.save()
+        self.assertIn("Новое название", self.get_tree().content.decode())
+        sub_category.delete()
+
+    def test_version_in_transaction(self) -> None:
+        """
+        Проверяем: версия дерева общая (в БД) и меняется вместе с категориями -
+        при откате изменения версия остаётся прежней, и дерево не перестраивается.
+
+        :return: None.
+        """
+        self.get_tree()
+        version = CatalogVersion.get(CatalogVersion.CATEGORIES)
+        try:
+            with transaction.atomic():
+                get_sub_category(self.category)
+                self.assertGreater(
+                    CatalogVersion.get(CatalogVersion.CATEGORIES), version
+                )
+                raise RuntimeError("rollback")
+        except RuntimeError:
+            pass
+        self.assertEqual(CatalogVersion.get(CatalogVersion.CATEGORIES), version)
+        with self.assertNumQueries(2):
+            self.get_tree()
+
+    def test_prewarm_command(self) -> None:
+        """
+        Проверяем: после команды дерево отдаётся без построения
+        (запросы - только версия дерева, до и после ответа).
+
+        :return: None.
+        """
+        call_command("prewarm_category_tree", stdout=StringIO())
+        with self.assertNumQueries(2):
+            self.get_tree()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        category_tree.clear()
+        super().tearDownClass()
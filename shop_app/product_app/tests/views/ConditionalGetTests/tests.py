@@ -0,0 +1,196 @@
+from typing import Any, Dict
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.urls import reverse
+from product_app.api_views.catalog.cache import product_version_key
+from product_app.api_views.product.product import ProductView
+from product_app.models import CatalogVersion, Category, Product, SubCategory, Tag
+from product_app.tests.utils import (
+    get_category,
+    get_review,
+    get_simple_product,
+    get_specification,
+    get_sub_category,
+)
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+
+class ConditionalGetTests(APITestCase):
+    """
+    Тест условных запросов (ETag / Last-Modified, ответ 304).
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.category = get_category()
+        cls.sub_category = get_sub_category(cls.category)
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        cache.clear()
+        self.product = get_simple_product(self.sub_category)
+        self.catalog_data: Dict[str, Any] = {
+            "filter[name]": "",
+            "filter[minPrice]": 1,
+            "filter[maxPrice]": 10000,
+            "filter[freeDelivery]": False,
+            "filter[available]": True,
+            "currentPage": 1,
+            "category": self.sub_category.pk,
+            "sort": "price",
+            "sortType": "inc",
+            "limit": 10,
+        }
+
+    def get_ok(self, url: str, data: Any = None) -> Response:
+        """
+        Запрос с проверкой ответа 200 и валидаторов.
+
+        :param url: URL.
+        :param data: Query параметры.
+        :return: Response.
+        """
+        response: Response = self.client.get(url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+        return response
+
+    def assert_not_modified(
+        self, url: str, data: Any = None, queries: int = 1, **headers: str
+    ) -> None:
+        """
+        Проверка: ответ 304 без запросов к БД, кроме queries запросов версий.
+
+        :param url: URL.
+        :param data: Query параметры.
+        :param queries: Допустимое количество запросов.
+        :param headers: Заголовки запроса.
+        :return: None.
+        """
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, data=data, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_product(self) -> None:
+        """
+        Страница продукта: 304 по ETag, новый ETag после нового отзыва
+        и новой характеристики.
+
+        :return: None.
+        """
+        url = reverse("product_app:product", args=(self.product.pk,))
+        etag = self.get_ok(url)["ETag"]
+        self.assert_not_modified(url, if_none_match=etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            get_review(self.product)
+        new_etag = self.get_ok(url)["ETag"]
+        self.assertNotEqual(etag, new_etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            get_specification(self.product)
+        response = self.client.get(url, headers={"if-none-match": new_etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_changed_while_building(self) -> None:
+        """
+        Данные изменились, пока строился ответ: ответ без валидаторов
+        (новые данные не уходят под старым ETag).
+
+        :return: None.
+        """
+        url = reverse("product_app:product", args=(self.product.pk,))
+        get_response = ProductView.get_response
+
+        def get_changed_response(view: ProductView, product_id: int) -> Response:
+            CatalogVersion.bump(product_version_key(product_id))
+            return get_response(view, product_id)
+
+        with patch.object(ProductView, "get_response", get_changed_response):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+        self.get_ok(url)
+
+    def test_catalog(self) -> None:
+        """
+        Каталог и фасеты: 304 по ETag, после изменения продукта - новый ответ.
+
+        :return: None.
+        """
+        for name in ("catalog", "catalog-facets"):
+            url = reverse(f"product_app:{name}")
+            etag = self.get_ok(url, self.catalog_data)["ETag"]
+            self.assert_not_modified(url, self.catalog_data, if_none_match=etag)
+
+        self.product.count += 1
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+        url = reverse("product_app:catalog")
+        response = self.client.get(
+            url, data=self.catalog_data, headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_modified_since(self) -> None:
+        """
+        Популярные продукты: 304 по If-Modified-Since.
+
+        :return: None.
+        """
+        url = reverse("product_app:product-popular")
+        last_modified = self.get_ok(url)["Last-Modified"]
+        self.assert_not_modified(url, if_modified_since=last_modified)
+
+    def test_categories(self) -> None:
+        """
+        Категории: 304 по ETag (один запрос - версия дерева из БД),
+        после новой подкатегории - новый ответ.
+
+        :return: None.
+        """
+        url = reverse("product_app:categories")
+        etag = self.get_ok(url)["ETag"]
+        self.assert_not_modified(url, if_none_match=etag)
+
+        get_sub_category(self.category)
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def tearDown(self) -> None:
+        """
+        Удаление продуктов после каждого теста.
+
+        :return: None.
+        """
+        Product.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Tag.objects.all().delete()
+        Product.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -0,0 +1,169 @@
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.utils.http import http_date
+
+from shop_app import settings
+from shop_app.thumbnails import thumbnail_name
+
+
+class MediaServingTests(TestCase):
+    """
+    Тест отдачи загруженных файлов (shop_app.media.serve_media).
+    """
+
+    content = bytes(range(256)) * 4
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.name = default_storage.save(
+            "media_tests/image.png", ContentFile(cls.content)
+        )
+        cls.variant_name = default_storage.save(
+            thumbnail_name(cls.name, 160, "webp"), ContentFile(cls.content)
+        )
+        cls.url = settings.MEDIA_URL + cls.name
+
+    def get_content(self, response) -> bytes:  # type: ignore[no-untyped-def]
+        """
+        Функция вернёт тело ответа (в том числе потокового).
+
+        :param response: Ответ.
+        :return: Тело ответа.
+        """
+        if response.streaming:
+            return b"".join(response.streaming_content)
+        return bytes(response.content)
+
+    def test_get(self) -> None:
+        """
+        Проверяем: файл отдаётся целиком с валидаторами и Cache-Control,
+        производное изображение не immutable (его имя повторяется при замене
+        оригинала с тем же именем файла).
+
+        :return: None.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_content(response), self.content)
+        self.assertEqual(response.headers["Content-Type"], "image/png")
+        self.assertEqual(response.headers["Content-Length"], str(len(self.content)))
+        self.assertEqual(response.headers["Accept-Ranges"], "bytes")
+        self.assertIn("ETag", response.headers)
+        self.assertIn("Last-Modified", response.headers)
+        self.assertNotIn("immutable", response.headers["Cache-Control"])
+
+        response = self.client.get(settings.MEDIA_URL + self.variant_name)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers["Cache-Control"],
+            f"public, max-age={settings.MEDIA_MAX_AGE}",
+        )
+        self.get_content(response)
+
+        response = self.client.head(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Length"], str(len(self.content)))
+
+        self.assertEqual(self.client.post(self.url).status_code, 405)
+        self.assertEqual(self.client.get(self.url + "x").status_code, 404)
+        self.assertEqual(
+            self.client.get(settings.MEDIA_URL + "media_tests").status_code, 404
+        )
+
+    def test_conditional_get(self) -> None:
+        """
+        Проверяем: If-None-Match и If-Modified-Since дают 304 без тела.
+
+        :return: None.
+        """
+        response = self.client.get(self.url)
+        self.get_content(response)
+        etag = response.headers["ETag"]
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+        response = self.client.get(
+            self.url,
+            headers={"If-Modified-Since": response.headers["Last-Modified"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(self.url, headers={"If-None-Match": '"other"'})
+        self.assertEqual(response.status_code, 200)
+        self.get_content(response)
+
+    def test_range(self) -> None:
+        """
+        Проверяем диапазоны: ограниченный, до конца файла, последние N байт,
+        недопустимый (416) и устаревший If-Range (весь файл).
+
+        :return: None.
+        """
+        size = len(self.content)
+        for header, start, end in (
+            ("bytes=10-19", 10, 19),
+            ("bytes=1000-", 1000, size - 1),
+            ("bytes=-24", size - 24, size - 1),
+            ("bytes=1020-5000", 1020, size - 1),
+        ):
+            response = self.client.get(self.url, headers={"Range": header})
+            self.assertEqual(response.status_code, 206, header)
+            self.assertEqual(
+                response.headers["Content-Range"], f"bytes {start}-{end}/{size}"
+            )
+            self.assertEqual(response.headers["Content-Length"], str(end - start + 1))
+            self.assertEqual(self.get_content(response), self.content[start : end + 1])
+
+        response = self.client.get(self.url, headers={"Range": f"bytes={size}-"})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers["Content-Range"], f"bytes */{size}")
+
+        response = self.client.get(
+            self.url, headers={"Range": "bytes=0-9", "If-Range": '"other"'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_content(response), self.content)
+
+        response = self.client.get(
+            self.url, headers={"Range": "bytes=0-9", "If-Range": http_date(0)}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.get_content(response)
+
+    @override_settings(
+        MEDIA_SENDFILE_BACKEND="x-accel-redirect",
+        MEDIA_X_ACCEL_PREFIX="/protected-media/",
+    )
+    def test_x_accel_redirect(self) -> None:
+        """
+        Проверяем: при X-Accel-Redirect тело отдаёт фронт-сервер.
+
+        :return: None.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers["X-Accel-Redirect"], "/protected-media/" + self.name
+        )
+        self.assertEqual(response.content, b"")
+        self.assertIn("ETag", response.headers)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция удаляет файлы после всех тестов.
+
+        :return: None.
+        """
+        default_storage.delete(cls.name)
+        default_storage.delete(cls.variant_name)
+        super().tearDownClass()
@@ -0,0 +1,99 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+from product_app.models import Category, Product, SubCategory, Tag
+from product_app.tests.utils import get_product
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from shop_app.parsers import OrjsonParser
+from shop_app.renderers import OrjsonRenderer
+
+
+class OrjsonRendererTests(APITestCase):
+    """
+    Тест OrjsonRenderer, OrjsonParser и JSONOnlyContentNegotiation.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.products = [get_product() for _ in range(3)]
+
+    def test_same_bytes_as_drf(self) -> None:
+        """
+        Проверяем: JSON совпадает побайтно с JSONRenderer DRF.
+
+        :return: None.
+        """
+        data = {
+            "price": Decimal("141.32"),
+            "rating": 4.333333333333333,
+            "created": datetime(2024, 5, 1, 10, 30, 15, 123456, tzinfo=timezone.utc),
+            "naive": datetime(2024, 5, 1, 10, 30),
+            "date": date(2024, 5, 1),
+            "lazy": _("title"),
+            "text": 'Кириллица \u2028\u2029 "кавычки"',
+            "items": [None, True, 0, [], {}],
+        }
+        self.assertEqual(JSONRenderer().render(data), OrjsonRenderer().render(data))
+
+    def test_popular_response(self) -> None:
+        """
+        Проверяем: ответ каталога (карточки продуктов) отрисован OrjsonRenderer
+        так же, как JSONRenderer.
+
+        :return: None.
+        """
+        response = self.client.get(reverse("product_app:product-popular"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_json_only(self) -> None:
+        """
+        Проверяем: на Accept: text/html API всё равно отдаёт JSON (без 406).
+
+        :return: None.
+        """
+        response = self.client.get(
+            reverse("product_app:product-popular"), HTTP_ACCEPT="text/html"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_parser(self) -> None:
+        """
+        Проверяем разбор JSON и ошибку на неверном JSON.
+
+        :return: None.
+        """
+        parser = OrjsonParser()
+        self.assertEqual(
+            parser.parse(BytesIO('{"id": 1, "name": "тег"}'.encode())),
+            {"id": 1, "name": "тег"},
+        )
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b"{"))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Tag.objects.all().delete()
+        Product.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
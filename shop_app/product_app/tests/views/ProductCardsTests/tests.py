@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.db.models import Prefetch
+from django.urls import reverse
+from django.utils import timezone
+from product_app.api_views.catalog.cards import get_product_cards
+from product_app.models import Category, Product, ProductImage, Sale, SubCategory, Tag
+from product_app.serializers.product import OutCatalogProductSerializer
+from product_app.tests.utils import (
+    get_category,
+    get_product,
+    get_product_image,
+    get_review,
+    get_simple_product,
+    get_sub_category,
+    get_tag,
+)
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+
+class ProductCardsTests(APITestCase):
+    """
+    Тест карточек продуктов из values() (get_product_cards).
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам.
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.products = [get_product() for _ in range(3)]
+        # Продукт с несколькими тегами, изображениями и отзывами.
+        product = cls.products[0]
+        product.tags.add(get_tag(), get_tag())
+        get_product_image(product)
+        get_review(product)
+        # Продукт с действующей акцией.
+        Sale.objects.create(
+            product=cls.products[1],
+            date_from=timezone.now().date() - timedelta(days=1),
+            date_to=timezone.now().date() + timedelta(days=1),
+            price=cls.products[1].price,
+            sale_price=cls.products[1].price - 10,
+        )
+        # Продукт без тегов, изображений и отзывов.
+        cls.products.append(get_simple_product(get_sub_category(get_category())))
+
+    def test_same_json_as_serializer(self) -> None:
+        """
+        Проверяем: JSON карточек совпадает побайтно с OutCatalogProductSerializer.
+
+        :return: None.
+        """
+        products = Product.objects.order_by("pk")
+        serializer_products = products.prefetch_related(
+            Prefetch("tags", queryset=Tag.objects.order_by("pk")),
+            Prefetch("images", queryset=ProductImage.objects.order_by("pk")),
+        )
+        renderer = JSONRenderer()
+        expected = renderer.render(
+            OutCatalogProductSerializer(serializer_products, many=True).data
+        )
+        with self.assertNumQueries(1):
+            cards = get_product_cards(products)
+        self.assertEqual(expected, renderer.render(cards))
+        self.assertEqual(len(self.products), len(cards))
+
+    def test_popular_view(self) -> None:
+        """
+        Проверяем: популярные продукты отдаются карточками одним запросом
+        (и запросами версий каталога до и после ответа).
+
+        :return: None.
+        """
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("product_app:product-popular"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        product = Product.objects.get(pk=self.products[0].pk)
+        card = next(item for item in response.json() if item["id"] == product.pk)
+        self.assertEqual(len(card["tags"]), 3)
+        self.assertEqual(len(card["images"]), 2)
+        self.assertEqual(card["rating"], product.get_rating())
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Функция очищает всё после всех тестов.
+
+        :return: None.
+        """
+        Tag.objects.all().delete()
+        Product.objects.all().delete()
+        SubCategory.objects.all().delete()
+        Category.objects.all().delete()
+        super().tearDownClass()
@@ -0,0 +1,168 @@
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from product_app.management.bench import get_plan_nodes, seed_catalog
+from product_app.models import Product, SubCategoryTagCount
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+
+class QueryPlanTests(APITestCase):
+    """
+    Тест планов запросов эндпоинтов каталога на заполненной БД:
+    ни один запрос не должен читать product_app_product последовательным сканированием.
+    """
+
+    products_count = 30000
+    table = Product._meta.db_table
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Подготовка к тестам: заполняем каталог и собираем статистику (ANALYZE).
+        Данные создаются внутри транзакции класса и откатываются вместе с ней
+        (удаление 30000 продуктов через ORM с сигналами заняло бы минуту).
+
+        :return: None.
+        """
+        super().setUpClass()
+        cls.seeded = seed_catalog(
+            cls.products_count, tags=20, subcategories=30, sales_share=0.2
+        )
+
+    def setUp(self) -> None:
+        """
+        Подготовка к каждому тесту.
+
+        :return: None.
+        """
+        cache.clear()
+        self.catalog_data: Dict[str, Any] = {
+            "filter[name]": "",
+            "filter[minPrice]": 0,
+            "filter[maxPrice]": 100000,
+            "filter[freeDelivery]": False,
+            "filter[available]": True,
+            "currentPage": 1,
+            "category": self.seeded["subcategories"][0],
+            "sort": "price",
+            "sortType": "dec",
+            "limit": 20,
+        }
+
+    def get_seq_scans(self, sql: str, table: str) -> Iterator[Dict[str, Any]]:
+        """
+        Выполнит EXPLAIN запроса и вернёт узлы последовательного сканирования таблицы.
+
+        :param sql: SQL запроса (с подставленными параметрами).
+        :param table: Имя таблицы.
+        :return: Узлы плана.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cursor.fetchone()[0]
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        for node in get_plan_nodes(plan[0]["Plan"]):
+            if node["Node Type"] == "Seq Scan" and node["Relation Name"] == table:
+                yield node
+
+    def assert_no_seq_scan(
+        self, url: str, data: Dict[str, Any], table: Optional[str] = None
+    ) -> None:
+        """
+        Выполнит запрос к эндпоинту и проверит планы всех его запросов к таблице.
+
+        :param url: URL эндпоинта.
+        :param data: Параметры запроса.
+        :param table: Имя таблицы (по умолчанию - продукты).
+        :return: None.
+        """
+        table = table or self.table
+        with CaptureQueriesContext(connection) as queries:
+            response: Response = self.client.get(url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        product_queries: List[str] = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].lstrip().startswith(("SELECT", "WITH"))
+            and f'"{table}"' in query["sql"]
+        ]
+        self.assertTrue(product_queries)
+        for sql in product_queries:
+            with self.subTest(url=url, data=data, sql=sql):
+                self.assertEqual(list(self.get_seq_scans(sql, table)), [])
+
+    def test_catalog(self) -> None:
+        """
+        Каталог: подкатегория с разными сортировками, фильтрами и тегами.
+
+        :return: None.
+        """
+        url = reverse("product_app:catalog")
+        variants = (
+            {},
+            {"sort": "rating"},
+            {"sort": "popularity", "cursor": ""},
+            {"sort": "date", "filter[freeDelivery]": True},
+            {"filter[available]": False},
+            {"tags[]": self.seeded["tags"][:2]},
+            {"cursor": ""},
+        )
+        for variant in variants:
+            self.assert_no_seq_scan(url, {**self.catalog_data, **variant})
+
+    def test_catalog_facets(self) -> None:
+        """
+        Фасеты каталога подкатегории.
+
+        :return: None.
+        """
+        self.assert_no_seq_scan(
+            reverse("product_app:catalog-facets"), self.catalog_data
+        )
+
+    def test_home_page(self) -> None:
+        """
+        Популярные продукты, заканчивающиеся продукты, продукты с акцией и баннеры.
+
+        :return: None.
+        """
+        self.assert_no_seq_scan(reverse("product_app:banners"), {})
+        self.assert_no_seq_scan(reverse("product_app:product-popular"), {})
+        self.assert_no_seq_scan(reverse("product_app:product-limited"), {})
+        self.assert_no_seq_scan(reverse("product_app:sales"), {"currentPage": 1})
+
+    def test_tags(self) -> None:
+        """
+        Популярные теги подкатегории и всего каталога: счётчики читаются
+        из SubCategoryTagCount/Tag, продукты не затрагиваются.
+
+        :return: None.
+        """
+        url = reverse("product_app:tags")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {"category": self.seeded["subcategories"][0]})
+            self.client.get(url, {})
+        for query in queries.captured_queries:
+            self.assertNotIn(f'"{self.table}"', query["sql"])
+        self.assert_no_seq_scan(
+            url,
+            {"category": self.seeded["subcategories"][0]},
+            SubCategoryTagCount._meta.db_table,
+        )
+
+    def test_product(self) -> None:
+        """
+        Страница продукта.
+
+        :return: None.
+        """
+        product_id = self.seeded["products"][0]
+        self.assert_no_seq_scan(
+            reverse("product_app:product", kwargs={"product_id": product_id}), {}
+        )
@@ -63,6 +63,35 @@ class TagAPIViewTests(APITestCase):
         response_tags_id_list = [tag["id"] for tag in response.data]
         self.assertEqual(tags_id_list, response_tags_id_list)
 
+    def test_get_tags_without_category(self) -> None:
+        """
+        Проверим, что без категории возвращаются популярные теги всего каталога,
+        а продукты в архиве не учитываются.
+
+        :return: None.
+        """
+        other_product = get_simple_product(get_sub_category(self.category))
+        self.tags_list[19].products.add(other_product)
+        response: Response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [tag.pk for tag in self.tags_list[:10]],
+            [tag["id"] for tag in response.data],
+        )
+
+        product = Product.objects.get(pk=self.list_products[0].pk)
+        product.archived = True
+        product.save()
+        response = self.client.get(self.url, data={"category": self.sub_category.pk})
+        # Первые два тега теперь у 19 продуктов: порядок между ними - по id.
+        self.assertEqual(
+            [tag["id"] for tag in response.data[:2]],
+            sorted([self.tags_list[0].pk, self.tags_list[1].pk]),
+        )
+        product.archived = False
+        product.save()
+        other_product.delete()
+
     @classmethod
     def tearDownClass(cls) -> None:
         """
@@ -2,6 +2,7 @@ from django.urls import path
 from product_app.api_views.catalog.banners import CatalogBannersAPIView
 from product_app.api_views.catalog.catalog import CatalogAPIView
 from product_app.api_views.catalog.categories import CategoryListAPIView
+from product_app.api_views.catalog.facets import CatalogFacetsAPIView
 from product_app.api_views.catalog.limited import CatalogLimitedAPIView
 from product_app.api_views.catalog.popular import CatalogPopularAPIView
 from product_app.api_views.catalog.sales import CatalogSalesAPIView
@@ -14,6 +15,7 @@ app_name = "product_app"
 urlpatterns = [
     path("categories", CategoryListAPIView.as_view(), name="categories"),
     path("catalog", CatalogAPIView.as_view(), name="catalog"),
+    path("catalog/facets", CatalogFacetsAPIView.as_view(), name="catalog-facets"),
     path("tags", TagAPIView.as_view(), name="tags"),
     path("products/popular", CatalogPopularAPIView.as_view(), name="product-popular"),
     path("products/limited", CatalogLimitedAPIView.as_view(), name="product-limited"),
@@ -0,0 +1,251 @@
+import os
+import tempfile
+from io import BytesIO
+from typing import Iterable, Optional
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.db import models
+from django.db.models import DEFERRED
+from django.db.models.fields.files import FieldFile
+from jobs_app.models import Job
+from PIL import Image, ImageOps
+from utils import delete_files_on_commit
+
+from shop_app.thumbnails import (
+    THUMBNAIL_FORMATS,
+    ImageStatus,
+    delete_thumbnails,
+    make_thumbnails,
+    thumbnail_names,
+)
+
+# Фоновая задача обработки загруженного изображения (Job.task).
+PROCESS_IMAGE_TASK = "shop_app.image_processing.process_image"
+# Форматы, из которых удаляются метаданные (EXIF).
+STRIP_METADATA_FORMATS = ("JPEG", "PNG", "WEBP")
+
+
+def verify_image(storage: Storage, name: str) -> None:
+    """
+    Функция проверит, что файл - целое изображение (полностью декодируется).
+
+    :param storage: Хранилище.
+    :param name: Имя файла в хранилище.
+    :return: None.
+    :raises OSError: Если файл не является изображением или повреждён.
+    """
+    with storage.open(name, "rb") as file:
+        with Image.open(file) as image:
+            image.verify()
+    with storage.open(name, "rb") as file:
+        with Image.open(file) as image:
+            image.load()
+
+
+def strip_metadata(storage: Storage, name: str) -> str:
+    """
+    Функция перезапишет изображение без EXIF (геометка, модель камеры и т.п.),
+    предварительно повернув его по ориентации из EXIF.
+    Файлы без EXIF и других форматов не меняются.
+
+    :param storage: Хранилище.
+    :param name: Имя файла в хранилище.
+    :return: Имя файла в хранилище (может измениться, см. replace_file).
+    """
+    with storage.open(name, "rb") as file:
+        image = Image.open(file)
+        if image.format not in STRIP_METADATA_FORMATS or not (
+            image.getexif() or "exif" in image.info
+        ):
+            return name
+        fmt = image.format
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    image.info.pop("exif", None)
+    options = dict(THUMBNAIL_FORMATS["jpg" if fmt == "JPEG" else "webp"][1])
+    if fmt == "PNG":
+        options = {"optimize": True}
+    if fmt == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, fmt, **options)
+    return replace_file(storage, name, buffer.getvalue())
+
+
+def replace_file(storage: Storage, name: str, content: bytes) -> str:
+    """
+    Функция заменит содержимое файла так, что оригинал не теряется при ошибке.
+    Локальное хранилище: новое содержимое пишется во временный файл рядом
+    и подменяет оригинал атомарно (os.replace), имя не меняется, файл
+    всё время доступен. Другие хранилища: новый файл сохраняется под новым
+    именем, а старый удалит задача обработки после сохранения нового имени
+    в модели (см. process_image).
+
+    :param storage: Хранилище.
+    :param name: Имя файла в хранилище.
+    :param content: Новое содержимое.
+    :return: Имя файла с новым содержимым.
+    """
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        saved: str = storage.save(name, ContentFile(content))
+        return saved
+    descriptor, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(content)
+        os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return name
+
+
+def process_image(
+    model: str, pk: int, field: str, name: Optional[str], old_name: Optional[str]
+) -> None:
+    """
+    Фоновая задача обработки загруженного изображения:
+    удаление заменённого файла и его производных, проверка декодирования,
+    удаление EXIF, создание производных изображений и запись статуса в модель.
+    Если изображение модели уже заменено (задача устарела), обрабатывается
+    только удаление старого файла - новое изображение обработает своя задача.
+
+    :param model: Модель ('app_label.ModelName').
+    :param pk: ID экземпляра модели.
+    :param field: Имя поля изображения.
+    :param name: Имя нового файла в хранилище (None - изображение удалено).
+    :param old_name: Имя заменённого файла в хранилище (None - не было).
+    :return: None.
+    """
+    model_class = apps.get_model(model)
+    storage = model_class._meta.get_field(field).storage
+    if old_name and old_name != name:
+        storage.delete(old_name)
+        delete_thumbnails(storage, old_name)
+    if not name:
+        return
+    instance = model_class.objects.filter(pk=pk).first()
+    if instance is None or getattr(instance, field).name != name:
+        return
+    update_fields = [f"{field}_status"]
+    status = ImageStatus.READY
+    try:
+        verify_image(storage, name)
+        stripped_name = strip_metadata(storage, name)
+        if stripped_name != name:
+            # Файл сохранён под новым именем: сохраним его (pre_save поставит
+            # новое имя в очередь, а старый файл удалит эта задача).
+            getattr(instance, field).name = stripped_name
+            update_fields.append(field)
+        make_thumbnails(storage, stripped_name)
+    except (OSError, SyntaxError, ValueError):
+        status = ImageStatus.FAILED
+    setattr(instance, f"{field}_status", status)
+    # save() (а не update()), чтобы сработали сигналы сброса кэшей модели.
+    instance.save(update_fields=update_fields)
+
+
+def remember_loaded_image(instance: models.Model, field: str) -> None:
+    """
+    Функция для post_init: запомнит имя файла, с которым экземпляр создан
+    или загружен из БД (атрибут loaded_<поле>), чтобы pre_save сравнивал файл
+    без запроса к БД. Отложенное (defer/only) поле не загружается.
+
+    :param instance: Экземпляр модели.
+    :param field: Имя поля изображения.
+    :return: None.
+    """
+    value = instance.__dict__.get(field, DEFERRED)
+    if isinstance(value, FieldFile):
+        value = value.name
+    setattr(instance, f"loaded_{field}", value or None)
+
+
+def mark_image_changes(
+    instance: models.Model,
+    field: str,
+    update_fields: Optional[Iterable[str]] = None,
+) -> None:
+    """
+    Функция для pre_save: сравнит файл с загруженным (remember_loaded_image) и,
+    если он изменился, переведёт статус в PENDING и запомнит заменённый файл
+    для post_save (атрибут <поле>_replaced). Файлы здесь не удаляются: старый файл
+    нужен, пока транзакция не зафиксирована, его удалит фоновая задача.
+
+    :param instance: Экземпляр модели.
+    :param field: Имя поля изображения.
+    :param update_fields: Сохраняемые поля (None - все).
+    :return: None.
+    """
+    if update_fields is not None and field not in update_fields:
+        return
+    if field not in instance.__dict__:
+        # Отложенное поле, которое не загружалось и не менялось, не сохраняется.
+        return
+    file = getattr(instance, field)
+    old_name = getattr(instance, f"loaded_{field}", DEFERRED)
+    if instance._state.adding and instance.pk is None:
+        old_name = None
+    elif old_name is DEFERRED or instance._state.adding:
+        # Имя из БД неизвестно (поле было отложено или pk задан вручную).
+        old_name = (
+            type(instance)
+            .objects.filter(pk=instance.pk)
+            .values_list(field, flat=True)
+            .first()
+        ) or None
+    if old_name == (file.name or None):
+        return
+    setattr(instance, f"{field}_replaced", old_name)
+    setattr(
+        instance,
+        f"{field}_status",
+        ImageStatus.PENDING if file else ImageStatus.READY,
+    )
+
+
+def enqueue_image_processing(instance: models.Model, field: str) -> None:
+    """
+    Функция для post_save: если файл изменился (mark_image_changes),
+    поставит в очередь задачу process_image. Задача создаётся в той же транзакции,
+    что и сохранение модели: при откате не будет ни новой записи, ни удаления файла.
+
+    :param instance: Экземпляр модели.
+    :param field: Имя поля изображения.
+    :return: None.
+    """
+    attribute = f"{field}_replaced"
+    if attribute not in instance.__dict__:
+        return
+    old_name = instance.__dict__.pop(attribute)
+    name = getattr(instance, field).name or None
+    setattr(instance, f"loaded_{field}", name)
+    Job.enqueue(
+        PROCESS_IMAGE_TASK,
+        {
+            "model": instance._meta.label,
+            "pk": instance.pk,
+            "field": field,
+            "name": name,
+            "old_name": old_name,
+        },
+    )
+
+
+def delete_image_on_commit(file: Optional[FieldFile]) -> None:
+    """
+    Функция для pre_delete: удалит файл и его производные изображения
+    после фиксации транзакции (пачкой с остальными файлами транзакции).
+
+    :param file: Файл поля модели.
+    :return: None.
+    """
+    if file:
+        delete_files_on_commit(file.storage, [file.name, *thumbnail_names(file.name)])
@@ -0,0 +1,238 @@
+import mimetypes
+import os
+import posixpath
+import re
+from stat import S_ISREG
+from typing import BinaryIO, Optional, Tuple
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBase,
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.encoding import filepath_to_uri
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+# Один диапазон байтов: "bytes=0-99", "bytes=100-", "bytes=-100".
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class FileRange:
+    """
+    Часть файла для FileResponse: читает не больше length байт с текущей позиции.
+    У объекта нет fileno(), поэтому сервер отдаёт его блоками, а не через sendfile.
+    """
+
+    def __init__(self, file: BinaryIO, length: int) -> None:
+        """
+        Часть файла.
+
+        :param file: Открытый файл (позиция - начало диапазона).
+        :param length: Длина диапазона.
+        :return: None.
+        """
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Прочитает следующий блок диапазона.
+
+        :param size: Максимальный размер блока (-1 - весь остаток).
+        :return: Блок (пустой - конец диапазона).
+        """
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        """
+        Закроет файл.
+
+        :return: None.
+        """
+        self.file.close()
+
+
+def get_media_etag(stat: os.stat_result) -> str:
+    """
+    Функция вернёт ETag файла по времени изменения и размеру (без чтения файла).
+
+    :param stat: Результат os.stat файла.
+    :return: ETag (без кавычек).
+    """
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Функция разберёт заголовок Range с одним диапазоном.
+
+    :param header: Значение Range.
+    :param size: Размер файла.
+    :return: (начало, конец включительно); None, если заголовок не поддерживается
+        (несколько диапазонов, другие единицы) - тогда отдаётся весь файл.
+    :raises ValueError: Если диапазон не пересекается с файлом (416).
+    """
+    match = RANGE_RE.match(header.strip())
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+    start, end = match.group(1), match.group(2)
+    if start == "":
+        # Последние N байт.
+        length = int(end)
+        if length == 0:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    first = int(start)
+    last = min(int(end), size - 1) if end else size - 1
+    if first >= size or first > last:
+        raise ValueError(header)
+    return first, last
+
+
+def is_range_allowed(request: HttpRequest, etag: str, mtime: float) -> bool:
+    """
+    Функция проверит If-Range: диапазон отдаётся, только если файл не изменился.
+
+    :param request: HttpRequest.
+    :param etag: ETag файла (без кавычек).
+    :param mtime: Время изменения файла.
+    :return: True, если диапазон можно отдать.
+    """
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range == quote_etag(etag)
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) <= since
+
+
+def set_media_headers(
+    response: HttpResponseBase, etag: str, mtime: float
+) -> HttpResponseBase:
+    """
+    Функция проставит валидаторы и Cache-Control файла.
+
+    :param response: Ответ.
+    :param etag: ETag (без кавычек).
+    :param mtime: Время изменения файла.
+    :return: Ответ.
+    """
+    response.headers["ETag"] = quote_etag(etag)
+    response.headers["Last-Modified"] = http_date(mtime)
+    response.headers["Accept-Ranges"] = "bytes"
+    # Не immutable: имена оригиналов (и их производных изображений) повторяются
+    # при замене файла, после max-age клиент проверяет файл условным запросом.
+    response.headers["Cache-Control"] = f"public, max-age={settings.MEDIA_MAX_AGE}"
+    return response
+
+
+def get_offload_response(path: str, content_type: str) -> Optional[HttpResponse]:
+    """
+    Функция вернёт пустой ответ с заголовком передачи файла фронт-серверу
+    (MEDIA_SENDFILE_BACKEND): X-Accel-Redirect (nginx) или X-Sendfile (Apache,
+    lighttpd). Диапазоны в этом случае отдаёт фронт-сервер.
+
+    :param path: Путь файла относительно MEDIA_ROOT.
+    :param content_type: Content-Type файла.
+    :return: Ответ или None, если передача не настроена.
+    """
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    if not backend:
+        return None
+    response = HttpResponse(content_type=content_type)
+    if backend == "x-accel-redirect":
+        response.headers["X-Accel-Redirect"] = settings.MEDIA_X_ACCEL_PREFIX + (
+            filepath_to_uri(path)
+        )
+    elif backend == "x-sendfile":
+        response.headers["X-Sendfile"] = safe_join(settings.MEDIA_ROOT, path)
+    else:
+        raise ValueError(f"Unknown MEDIA_SENDFILE_BACKEND: {backend}")
+    return response
+
+
+@require_safe
+def serve_media(request: HttpRequest, path: str) -> HttpResponseBase:
+    """
+    Отдача загруженных файлов (MEDIA_URL) без чтения файла в Python:
+    - условные запросы (If-None-Match/If-Modified-Since) по времени изменения
+      и размеру файла - 304 без открытия файла;
+    - Cache-Control: MEDIA_MAX_AGE, затем повторная проверка по ETag;
+    - Range (один диапазон) - 206/416;
+    - при MEDIA_SENDFILE_BACKEND файл отдаёт фронт-сервер (X-Accel-Redirect/
+      X-Sendfile), иначе - FileResponse: WSGI-сервер с wsgi.file_wrapper
+      (gunicorn, uWSGI) передаёт открытый файл через os.sendfile без копирования.
+
+    :param request: HttpRequest.
+    :param path: Путь файла относительно MEDIA_ROOT.
+    :return: Ответ.
+    """
+    path = posixpath.normpath(path).lstrip("/")
+    full_path = safe_join(settings.MEDIA_ROOT, path)
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404("File not found.")
+    if not S_ISREG(stat.st_mode):
+        raise Http404("File not found.")
+    etag = get_media_etag(stat)
+    mtime = stat.st_mtime
+    not_modified = get_conditional_response(
+        request,
+        etag=quote_etag(etag),
+        last_modified=int(mtime),
+        response=HttpResponse(),
+    )
+    if not_modified.status_code in (304, 412):
+        return set_media_headers(not_modified, etag, mtime)
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or "application/octet-stream"
+    response = get_offload_response(path, content_type)
+    if response is not None:
+        return set_media_headers(response, etag, mtime)
+
+    size = stat.st_size
+    byte_range: Optional[Tuple[int, int]] = None
+    range_header = request.headers.get("Range")
+    if range_header and is_range_allowed(request, etag, mtime):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response.headers["Content-Range"] = f"bytes */{size}"
+            return set_media_headers(response, etag, mtime)
+
+    if request.method == "HEAD":
+        response = HttpResponse(content_type=content_type)
+        response.headers["Content-Length"] = str(size)
+    elif byte_range is None:
+        response = FileResponse(open(full_path, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        file = open(full_path, "rb")
+        file.seek(start)
+        if end == size - 1:
+            # Диапазон до конца файла: сам файл (с позиции start) - через sendfile.
+            response = FileResponse(file, content_type=content_type)
+        else:
+            response = FileResponse(
+                FileRange(file, end - start + 1), content_type=content_type
+            )
+        response.status_code = 206
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response.headers["Content-Length"] = str(end - start + 1)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return set_media_headers(response, etag, mtime)
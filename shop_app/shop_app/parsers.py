@@ -0,0 +1,30 @@
+from typing import IO, Any, Mapping, Optional
+
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+class OrjsonParser(JSONParser):
+    """
+    JSONParser на orjson (C-расширение). Тело запроса должно быть в UTF-8.
+    """
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: Optional[str] = None,
+        parser_context: Optional[Mapping[str, Any]] = None,
+    ) -> Any:
+        """
+        Разбор тела запроса.
+
+        :param stream: Тело запроса.
+        :param media_type: Тип содержимого.
+        :param parser_context: Контекст.
+        :return: Данные.
+        """
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
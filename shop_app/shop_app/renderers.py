@@ -0,0 +1,72 @@
+from typing import Any, List, Mapping, Optional, Tuple
+
+import orjson
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+# Всё, что orjson не сериализует сам (Decimal, ленивые строки, QuerySet, ...),
+# и даты со временем кодируются так же, как в DRF.
+DRF_DEFAULT = JSONEncoder().default
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson (C-расширение).
+    Результат побайтно совпадает с JSONRenderer DRF (компактный JSON, UTF-8,
+    экранированные \\u2028 и \\u2029) для чисел от 1e-4 до 1e16 - это все цены
+    и рейтинги (за пределами orjson пишет 1e16 вместо 1e+16).
+    Ответы с отступом (indent в Accept) отдаёт стандартный JSONRenderer.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        """
+        Сериализация данных в JSON.
+
+        :param data: Данные.
+        :param accepted_media_type: Выбранный тип ответа.
+        :param renderer_context: Контекст.
+        :return: JSON.
+        """
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=DRF_DEFAULT, option=ORJSON_OPTIONS)
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class JSONOnlyContentNegotiation(DefaultContentNegotiation):
+    """
+    Выбор рендерера без разбора заголовка Accept: всегда первый рендерер view
+    (для API - JSON), ответ 406 не возвращается.
+    Явный формат (?format=... или суффикс) обрабатывается как обычно
+    (например, схема drf-spectacular).
+    """
+
+    def select_renderer(
+        self,
+        request: Request,
+        renderers: List[BaseRenderer],
+        format_suffix: Optional[str] = None,
+    ) -> Tuple[BaseRenderer, str]:
+        """
+        Выбор рендерера.
+
+        :param request: Request.
+        :param renderers: Рендереры view.
+        :param format_suffix: Суффикс формата.
+        :return: Рендерер и тип ответа.
+        """
+        if format_suffix or request.query_params.get(self.settings.URL_FORMAT_OVERRIDE):
+            return super().select_renderer(request, renderers, format_suffix)
+        return renderers[0], renderers[0].media_type
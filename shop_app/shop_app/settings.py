@@ -40,12 +40,14 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "frontend",
     "rest_framework",
     "drf_spectacular",
     "auth_app.apps.AuthAppConfig",
     "product_app.apps.ProductAppConfig",
     "order_app.apps.OrderAppConfig",
+    "jobs_app.apps.JobsAppConfig",
 ]
 
 MIDDLEWARE = [
@@ -141,14 +143,32 @@ MEDIA_ROOT: Path | str = (
     tempfile.mkdtemp() if "test" in sys.argv else BASE_DIR / "uploads"
 )
 MEDIA_URL = "/media/"
+# Отдача MEDIA_URL приложением (shop_app.media.serve_media).
+SERVE_MEDIA = True
+# Cache-Control max-age (секунды) загруженных файлов и производных изображений.
+MEDIA_MAX_AGE = 60 * 60
+# Передача файлов фронт-серверу: None, "x-accel-redirect" (nginx) или "x-sendfile".
+# Для nginx: location MEDIA_X_ACCEL_PREFIX { internal; alias <MEDIA_ROOT>/; }
+MEDIA_SENDFILE_BACKEND: str | None = None
+MEDIA_X_ACCEL_PREFIX = "/protected-media/"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# API отдаёт только JSON (orjson); BrowsableAPIRenderer не подключается.
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": ["shop_app.renderers.OrjsonRenderer"],
+    "DEFAULT_PARSER_CLASSES": [
+        "shop_app.parsers.OrjsonParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_CONTENT_NEGOTIATION_CLASS": (
+        "shop_app.renderers.JSONOnlyContentNegotiation"
+    ),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -159,6 +179,20 @@ SPECTACULAR_SETTINGS = {
 
 FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
 
+# Время жизни закэшированных страниц /api/catalog (секунды), 0 - кэш отключён.
+# Версии данных хранятся в БД (общие для всех процессов), поэтому страницы
+# актуальны и в локальном кэше процесса; общий кэш в CACHES (например, Redis)
+# лишь повышает долю попаданий.
+CATALOG_CACHE_TIMEOUT = 60
+
+# Как часто (секунды) процесс прибавляет свои счётчики попаданий/промахов
+# кэша каталога к общим (БД, команда catalog_cache_stats).
+CATALOG_CACHE_STATS_INTERVAL = 10
+
+# Время резерва единиц продукта в корзине без заказа (секунды). Срок продлевается
+# при изменении корзины, просроченные корзины удаляет release_expired_baskets.
+BASKET_RESERVATION_TTL = 24 * 60 * 60
+
 # LOGGING = {
 #     "version": 1,
 #     "formatters": {
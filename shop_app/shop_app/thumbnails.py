@@ -0,0 +1,232 @@
+import posixpath
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, Storage
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from django.utils.encoding import filepath_to_uri
+from django.utils.translation import gettext_lazy as _
+from PIL import Image, ImageOps
+
+# Ширины производных изображений (px). Изображение только уменьшается:
+# если оригинал уже ширины, файл этой ширины - копия оригинала в нужном формате.
+THUMBNAIL_WIDTHS = (160, 320, 640, 1280)
+# Расширение файла -> формат Pillow и параметры сохранения.
+THUMBNAIL_FORMATS: Dict[str, Tuple[str, Dict[str, object]]] = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+# Производные лежат рядом с оригиналом, в подпапке.
+THUMBNAIL_DIR = "thumbs"
+# Значение sizes по умолчанию: карточки каталога и превью ~ 320px.
+THUMBNAIL_SIZES = "(max-width: 640px) 50vw, 320px"
+
+
+class ImageStatus(models.TextChoices):
+    """
+    Статус обработки изображения (поле <поле изображения>_status модели).
+    Пока производные изображения не готовы, в ответах API отдаётся только оригинал.
+    """
+
+    PENDING = "pending", _("pending")
+    READY = "ready", _("ready")
+    FAILED = "failed", _("failed")
+
+
+def thumbnail_name(name: str, width: int, ext: str) -> str:
+    """
+    Функция вернёт имя производного изображения:
+    'product_image/1/images/a.png' -> 'product_image/1/images/thumbs/a_320.webp'.
+
+    :param name: Имя оригинала в хранилище.
+    :param width: Ширина.
+    :param ext: Расширение (формат).
+    :return: Имя производного изображения.
+    """
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, THUMBNAIL_DIR, f"{stem}_{width}.{ext}")
+
+
+def thumbnail_names(name: str) -> List[str]:
+    """
+    Функция вернёт имена всех производных изображений оригинала.
+
+    :param name: Имя оригинала в хранилище.
+    :return: Имена производных изображений.
+    """
+    return [
+        thumbnail_name(name, width, ext)
+        for width in THUMBNAIL_WIDTHS
+        for ext in THUMBNAIL_FORMATS
+    ]
+
+
+def has_thumbnails(storage: Storage, name: str) -> bool:
+    """
+    Функция проверит, созданы ли производные изображения
+    (по последнему создаваемому файлу).
+
+    :param storage: Хранилище.
+    :param name: Имя оригинала в хранилище.
+    :return: True, если созданы.
+    """
+    return bool(storage.exists(thumbnail_names(name)[-1]))
+
+
+def encode_thumbnail(image: Image.Image, fmt: str, options: Dict[str, object]) -> bytes:
+    """
+    Функция закодирует изображение в формат (для JPEG прозрачность - на белом фоне).
+
+    :param image: Изображение.
+    :param fmt: Формат Pillow.
+    :param options: Параметры сохранения.
+    :return: Содержимое файла.
+    """
+    if fmt == "JPEG" and image.mode != "RGB":
+        rgba = image.convert("RGBA")
+        image = Image.new("RGB", rgba.size, (255, 255, 255))
+        image.paste(rgba, mask=rgba.getchannel("A"))
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    buffer = BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def make_thumbnails(storage: Storage, name: str) -> List[str]:
+    """
+    Функция создаст производные изображения всех ширин и форматов
+    (существующие файлы перезаписываются). Каждая ширина уменьшается
+    из предыдущей (большей), а не из оригинала.
+
+    :param storage: Хранилище.
+    :param name: Имя оригинала в хранилище.
+    :return: Имена созданных файлов.
+    :raises OSError: Если файл не является изображением.
+    """
+    with storage.open(name, "rb") as file:
+        image = Image.open(file)
+        # JPEG декодируется сразу в уменьшенном масштабе (если оригинал большой).
+        image.draft("RGB", (max(THUMBNAIL_WIDTHS), max(THUMBNAIL_WIDTHS)))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    created: List[str] = []
+    for width in sorted(THUMBNAIL_WIDTHS, reverse=True):
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+        for ext, (fmt, options) in THUMBNAIL_FORMATS.items():
+            thumb_name = thumbnail_name(name, width, ext)
+            storage.delete(thumb_name)
+            created.append(
+                storage.save(
+                    thumb_name, ContentFile(encode_thumbnail(image, fmt, options))
+                )
+            )
+    return created
+
+
+def delete_thumbnails(storage: Storage, name: str) -> None:
+    """
+    Функция удалит производные изображения оригинала (если есть).
+
+    :param storage: Хранилище.
+    :param name: Имя оригинала в хранилище.
+    :return: None.
+    """
+    for thumb_name in thumbnail_names(name):
+        storage.delete(thumb_name)
+
+
+def get_url_builder(storage: Storage) -> Callable[[str], str]:
+    """
+    Функция вернёт функцию построения url файла по имени.
+    Для локального хранилища url - это base_url + путь (без urljoin на каждый файл),
+    для остальных хранилищ - storage.url().
+
+    :param storage: Хранилище.
+    :return: Функция: имя файла -> url.
+    """
+    base_url = getattr(storage, "base_url", None)
+    if isinstance(storage, FileSystemStorage) and base_url is not None:
+        return lambda name: base_url + filepath_to_uri(name).lstrip("/")
+    return storage.url
+
+
+def get_srcset(
+    name: Optional[str], ext: str, to_url: Callable[[str], str]
+) -> Optional[str]:
+    """
+    Функция вернёт srcset изображения в формате ext для тега img/picture.
+    Файлы не проверяются: производные создаются при загрузке,
+    для старых файлов - командой backfill_thumbnails.
+
+    :param name: Имя оригинала в хранилище (None/пусто - изображения нет).
+    :param ext: Расширение (формат) производных изображений.
+    :param to_url: Функция построения url (get_url_builder).
+    :return: srcset или None.
+    """
+    if not name:
+        return None
+    return ", ".join(
+        f"{to_url(thumbnail_name(name, width, ext))} {width}w"
+        for width in THUMBNAIL_WIDTHS
+    )
+
+
+def get_image_variants(
+    name: Optional[str], to_url: Callable[[str], str]
+) -> Dict[str, Optional[str]]:
+    """
+    Функция вернёт поля производных изображений для ответа API:
+    srcset (JPEG), srcsetWebp (WebP) и sizes.
+
+    :param name: Имя оригинала в хранилище (None/пусто - изображения нет).
+    :param to_url: Функция построения url (get_url_builder).
+    :return: {"srcset": ..., "srcsetWebp": ..., "sizes": ...}.
+    """
+    return {
+        "srcset": get_srcset(name, "jpg", to_url),
+        "srcsetWebp": get_srcset(name, "webp", to_url),
+        "sizes": THUMBNAIL_SIZES if name else None,
+    }
+
+
+def is_file_ready(file: Optional[FieldFile]) -> bool:
+    """
+    Функция проверит, что файл поля модели есть и его производные изображения готовы
+    (по полю статуса <поле>_status экземпляра модели).
+
+    :param file: Файл поля модели.
+    :return: True, если производные изображения готовы.
+    """
+    if not file:
+        return False
+    status = getattr(file.instance, f"{file.field.name}_status", ImageStatus.READY)
+    return bool(status == ImageStatus.READY)
+
+
+def get_file_srcset(file: Optional[FieldFile], ext: str) -> Optional[str]:
+    """
+    Функция вернёт srcset файла поля модели (для сериализаторов).
+
+    :param file: Файл поля модели.
+    :param ext: Расширение (формат) производных изображений.
+    :return: srcset или None, если файла нет или производные изображения не готовы.
+    """
+    if file is None or not is_file_ready(file):
+        return None
+    return get_srcset(file.name, ext, get_url_builder(file.storage))
+
+
+def get_file_sizes(file: Optional[FieldFile]) -> Optional[str]:
+    """
+    Функция вернёт sizes файла поля модели (для сериализаторов).
+
+    :param file: Файл поля модели.
+    :return: sizes или None, если файла нет или производные изображения не готовы.
+    """
+    return THUMBNAIL_SIZES if is_file_ready(file) else None
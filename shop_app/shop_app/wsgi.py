@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "shop_app.settings")
 
 application = get_wsgi_application()
+
+# Дерево категорий кэшируется в памяти процесса - строим его до первого запроса.
+from product_app.api_views.catalog.category_tree import (  # noqa: E402
+    prewarm_category_tree,
+)
+
+prewarm_category_tree()
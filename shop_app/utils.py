@@ -1,16 +1,19 @@
 import itertools
 import json
-import os
 import re
 import uuid
 from json import JSONDecodeError
-from typing import Any, Dict, Optional, TypeVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.files.storage import Storage
 from django.core.validators import RegexValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models import QuerySet
-from django.http import QueryDict
+from django.http import HttpResponse, QueryDict
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from drf_spectacular.drainage import warn
 from drf_spectacular.openapi import AutoSchema
 from drf_spectacular.plumbing import build_media_type_object
@@ -48,15 +51,79 @@ class PhoneValidator(RegexValidator):
         super().__init__(regex=regex, message=message)
 
 
-def delete_file(path: str) -> None:
+class FileDeletionBatch:
     """
-    Функция удаляет файл.
+    Пачка файлов, которые удалятся одним колбэком после фиксации транзакции.
+    """
+
+    def __init__(self, batches: Dict[Tuple[str, ...], "FileDeletionBatch"]) -> None:
+        """
+        Пустая пачка.
+
+        :param batches: Пачки соединения с БД (пачка удалит себя после выполнения).
+        :return: None.
+        """
+        self.batches = batches
+        self.files: List[Tuple[Storage, str]] = []
+
+    def add(self, storage: Storage, names: Iterable[str]) -> None:
+        """
+        Добавит файлы в пачку.
+
+        :param storage: Хранилище.
+        :param names: Имена файлов в хранилище.
+        :return: None.
+        """
+        self.files.extend((storage, name) for name in names)
+
+    def __call__(self) -> None:
+        """
+        Удалит файлы пачки (ошибки удаления отдельных файлов не прерывают удаление).
 
-    :param path: Путь к файлу.
+        :return: None.
+        """
+        for key, batch in list(self.batches.items()):
+            if batch is self:
+                del self.batches[key]
+        for storage, name in self.files:
+            try:
+                storage.delete(name)
+            except OSError:
+                pass
+
+
+def delete_files_on_commit(
+    storage: Storage, names: Iterable[str], using: Optional[str] = None
+) -> None:
+    """
+    Функция удалит файлы после фиксации текущей транзакции (вне транзакции - сразу).
+    Файлы одной транзакции (и одной точки сохранения) удаляются пачкой, одним
+    колбэком on_commit. При откате транзакции или точки сохранения колбэк
+    отбрасывается, и файлы, на которые ещё ссылаются записи в БД, не удаляются.
+
+    :param storage: Хранилище.
+    :param names: Имена файлов в хранилище.
+    :param using: Псевдоним БД.
     :return: None.
     """
-    if os.path.isfile(path):
-        os.remove(path)
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        batch = FileDeletionBatch({})
+        batch.add(storage, names)
+        batch()
+        return
+    batches: Dict[Tuple[str, ...], FileDeletionBatch] = connection.__dict__.setdefault(
+        "file_deletion_batches", {}
+    )
+    key = tuple(connection.savepoint_ids)
+    batch = batches.get(key)
+    # Колбэк пачки мог быть отброшен откатом или уже выполнен.
+    if batch is None or not any(
+        func is batch for _, func, _ in connection.run_on_commit
+    ):
+        batch = batches[key] = FileDeletionBatch(batches)
+        transaction.on_commit(batch, using=using, robust=True)
+    batch.add(storage, names)
 
 
 class PasswordValidator:
@@ -153,6 +220,67 @@ def get_or_create_anonymous_user_id(request: Request) -> Optional[str]:
     return session_id
 
 
+def set_validators(
+    response: HttpResponseBase, etag: str, last_modified: float
+) -> HttpResponseBase:
+    """
+    Функция добавит ответу валидаторы (ETag, Last-Modified).
+    Cache-Control: no-cache - браузер хранит ответ, но каждый раз проверяет его
+    условным запросом.
+
+    :param response: Ответ.
+    :param etag: ETag (без кавычек).
+    :param last_modified: Время последнего изменения (timestamp).
+    :return: Тот же ответ.
+    """
+    response["ETag"] = quote_etag(etag)
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def conditional_response(
+    request: Request,
+    etag: str,
+    last_modified: float,
+    get_response: Callable[[], HttpResponseBase],
+    get_etag: Callable[[], str],
+) -> HttpResponseBase:
+    """
+    Функция ответит 304 Not Modified, если данные клиента актуальны
+    (If-None-Match / If-Modified-Since), иначе вызовет get_response.
+    Валидаторы должны считаться без тяжёлых запросов: тогда повторный запрос
+    не выполняет ни запросов к БД, ни сериализации.
+    Данные могут измениться, пока строится ответ (он увидит уже новые строки),
+    поэтому после него ETag считается заново: если он изменился, ответ
+    отдаётся без валидаторов, иначе новые данные ушли бы под старым ETag.
+
+    :param request: Request.
+    :param etag: ETag (без кавычек).
+    :param last_modified: Время последнего изменения (timestamp).
+    :param get_response: Функция, создающая полный ответ.
+    :param get_etag: Функция, заново считающая ETag.
+    :return: Ответ.
+    """
+    headers = set_validators(HttpResponse(), etag, last_modified)
+    not_modified = get_conditional_response(
+        request,
+        etag=quote_etag(etag),
+        last_modified=int(last_modified),
+        response=headers,
+    )
+    if not_modified is not headers:
+        return not_modified
+    response = get_response()
+    if response.status_code != 200:
+        return response
+    if get_etag() == etag:
+        set_validators(response, etag, last_modified)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
 class CustomAutoSchema(AutoSchema):
     """
     Так как фронт требует метод delete с request body,